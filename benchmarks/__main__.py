@@ -0,0 +1,124 @@
+"""Run or compare acquisition benchmarks.
+
+python -m benchmarks run -o results.json
+python -m benchmarks compare baseline.json results.json --threshold 0.1
+python -m benchmarks soak --days 30 -o soak.json
+"""
+
+import argparse
+import json
+import os
+import sys
+
+from .soak import soak
+from .suite import benchmarks, compare, run
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(prog="benchmarks", description="Acquisition benchmarks against simulated instruments.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="run benchmarks")
+    run_parser.add_argument("-o", "--output", metavar="<file>", help="write results to JSON file")
+    run_parser.add_argument("-r", "--repeat", type=int, default=3, help="repeats per benchmark, best is taken (default: 3)")
+    run_parser.add_argument("-k", "--select", metavar="<name>", action="append", help="run only selected benchmark (repeatable)")
+    run_parser.add_argument("-l", "--list", action="store_true", help="list available benchmarks and exit")
+
+    compare_parser = subparsers.add_parser("compare", help="compare two result files")
+    compare_parser.add_argument("old", help="baseline results JSON file")
+    compare_parser.add_argument("new", help="new results JSON file")
+    compare_parser.add_argument("-t", "--threshold", type=float, default=0.1, help="relative slowdown flagged as regression (default: 0.1)")
+
+    soak_parser = subparsers.add_parser("soak", help="run accelerated soak test on a virtual clock")
+    soak_parser.add_argument("--days", type=float, default=30.0, help="virtual It duration in days (default: 30)")
+    soak_parser.add_argument("--interval", type=float, default=60.0, help="It interval in seconds (default: 60)")
+    soak_parser.add_argument("--sensors", type=int, default=10, help="number of enabled sensors (default: 10)")
+    soak_parser.add_argument("--seed", type=int, default=0, help="simulation seed (default: 0)")
+    soak_parser.add_argument("--latency", type=float, default=0.0, help="fixed virtual instrument latency in seconds (default: 0)")
+    soak_parser.add_argument("--path", metavar="<dir>", help="keep output files in directory (default: temporary)")
+    soak_parser.add_argument("--no-charts", dest="charts", action="store_false", help="do not feed readings into charts")
+    soak_parser.add_argument("-o", "--output", metavar="<file>", help="write soak report to JSON file")
+
+    return parser.parse_args()
+
+
+def run_command(args) -> int:
+    if args.list:
+        for name in benchmarks:
+            print(name)
+        return 0
+    results = run(args.select, args.repeat)
+    for name, result in results["results"].items():
+        print(f"{name:<24} {result['seconds']:10.4f} s {result['rate']:14.1f} ops/s")
+    for name, reason in results["skipped"].items():
+        print(f"{name:<24} skipped: {reason}")
+    for name, error in results["errors"].items():
+        print(f"{name:<24} failed: {error}")
+    if args.output:
+        with open(args.output, "w") as fp:
+            json.dump(results, fp, indent=2)
+    if results["errors"]:
+        print(f"{len(results['errors'])} benchmark(s) failed", file=sys.stderr)
+        return 1
+    return 0
+
+
+def compare_command(args) -> int:
+    with open(args.old) as fp:
+        old = json.load(fp)
+    with open(args.new) as fp:
+        new = json.load(fp)
+    if old.get("machine") != new.get("machine"):
+        print("warning: results were recorded on different machines", file=sys.stderr)
+    comparisons = compare(old, new, args.threshold)
+    regressions = 0
+    for item in comparisons:
+        flag = "REGRESSION" if item["regression"] else ""
+        if item["new"] is None:
+            print(f"{item['name']:<24} {item['old']:10.4f} s {'missing':>12} {'':>8} {flag}")
+        else:
+            print(f"{item['name']:<24} {item['old']:10.4f} s {item['new']:10.4f} s {item['change']:+8.1%} {flag}")
+        if item["regression"]:
+            regressions += 1
+    if regressions:
+        print(f"{regressions} regression(s) above {args.threshold:.0%}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def soak_command(args) -> int:
+    if args.path:
+        os.makedirs(args.path, exist_ok=True)
+    report = soak(
+        days=args.days,
+        interval=args.interval,
+        sensors=args.sensors,
+        seed=args.seed,
+        latency=args.latency,
+        path=args.path,
+        charts=args.charts,
+    )
+    print(f"virtual {report['virtual_duration'] / 86400:.2f} days in {report['real_duration']:.1f} s (x{report['speedup']:.0f})")
+    print(f"readings: {report['readings']}")
+    print(f"memory: start {report['memory']['start'] / 1024 ** 2:.1f} MiB, peak {report['memory']['peak'] / 1024 ** 2:.1f} MiB")
+    for item in report["files"]:
+        print(f"{item['name']:<48} {item['size']:12d} bytes {item['lines']:10d} lines")
+    for item in report["checks"]:
+        print(f"{'PASS' if item['passed'] else 'FAIL'} {item['name']}: {item['detail']}")
+    if args.output:
+        with open(args.output, "w") as fp:
+            json.dump(report, fp, indent=2)
+    return 0 if report["passed"] else 1
+
+
+def main() -> int:
+    args = parse_args()
+    if args.command == "run":
+        return run_command(args)
+    if args.command == "soak":
+        return soak_command(args)
+    return compare_command(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
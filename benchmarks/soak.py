@@ -0,0 +1,254 @@
+"""Accelerated soak test of long It runs.
+
+Runs the measurement and environment workers against simulated instruments
+on a virtual clock, so that a month long run completes in minutes, and
+checks memory growth, output file sizes, chart point counts and timing
+invariants.
+"""
+
+import contextlib
+import math
+import os
+import queue
+import tempfile
+import threading
+import time
+from datetime import datetime
+from typing import Optional
+
+from .suite import application, create_sensors, machine_info
+
+__all__ = ["soak"]
+
+IndexEvery: int = 100
+"""Rows per sidecar index entry, as written by the measurement worker."""
+
+
+def header_lines(sensors: int) -> int:
+    """Returns number of meta data lines (including empty line) and header
+    line of combined It run files."""
+    return 6 + 3 * sensors + 2
+
+
+def check(name: str, passed: bool, detail: str) -> dict:
+    return {"name": name, "passed": bool(passed), "detail": detail}
+
+
+def soak(
+    days: float = 30.0,
+    interval: float = 60.0,
+    sensors: int = 10,
+    seed: Optional[int] = 0,
+    latency: float = 0.0,
+    path: Optional[str] = None,
+    charts: bool = True,
+    memory_interval: float = 3600.0,
+    max_growth_per_day: float = 10 * 1024 ** 2,
+) -> dict:
+    """Run soak test, returns report dictionary."""
+    with contextlib.ExitStack() as stack:
+        if path is None:
+            path = stack.enter_context(tempfile.TemporaryDirectory())
+        return run_soak(days, interval, sensors, seed, latency, path, charts, memory_interval, max_growth_per_day)
+
+
+def run_soak(days, interval, sensor_count, seed, latency, path, charts, memory_interval, max_growth_per_day) -> dict:
+    from PyQt5 import QtCore
+
+    from longterm_it.clock import VirtualClock
+    from longterm_it.metrics import resident_memory
+    from longterm_it.simulators import LatencyModel, SimulatedSetup, create_resources
+    from longterm_it.timeindex import IndexSuffix, read_index
+    from longterm_it.workers import EnvironWorker, MeasureWorker
+
+    clock = VirtualClock()
+    setup = SimulatedSetup(seed=seed, clock=clock.monotonic, wall_clock=clock.time)
+    model = LatencyModel.fixed(latency) if latency else LatencyModel.zero()
+    resources = create_resources(setup, model, sleep=clock.sleep)
+
+    sensors = create_sensors(sensor_count)
+    duration = days * 86400.0
+
+    meas = MeasureWorker(resources)
+    meas.setClock(clock)
+    meas.setSensors(sensors)
+    meas.setUseShuntBox(True)
+    meas.setIvEndVoltage(-600.0)
+    meas.setIvStep(10.0)
+    meas.setIvDelay(1.0)
+    meas.setBiasVoltage(-600.0)
+    meas.setTotalCompliance(1e-3)
+    meas.setSingleCompliance(1e-3)
+    meas.setContinueInCompliance(False)
+    meas.setItDuration(duration)
+    meas.setItInterval(interval)
+    meas.setPath(path)
+    meas.setOperator("soak")
+
+    environ = EnvironWorker(resources)
+    environ.setClock(clock)
+    environ.setEnabled(True)
+
+    readings: queue.Queue = queue.Queue()
+    failures: list[str] = []
+    counts = {"iv": 0, "it": 0, "cts": 0}
+    it_times: list[float] = []
+    memory: list[tuple[float, int]] = [(0.0, resident_memory())]
+
+    meas.setEnvironSnapshot(environ.snapshot)
+
+    def on_environ(reading: dict) -> None:
+        counts["cts"] += 1
+
+    def on_iv(reading: dict) -> None:
+        counts["iv"] += 1
+
+    def on_it(reading: dict) -> None:
+        counts["it"] += 1
+        it_times.append(reading.get("time", 0.0))
+        elapsed = clock.elapsed()
+        if elapsed - memory[-1][0] >= memory_interval:
+            memory.append((elapsed, resident_memory()))
+        if charts:
+            readings.put(reading)
+
+    direct = QtCore.Qt.DirectConnection
+    environ.reading.connect(on_environ, type=direct)
+    meas.ivReading.connect(on_iv, type=direct)
+    meas.itReading.connect(on_it, type=direct)
+    meas.failed.connect(lambda exc: failures.append(format(exc)), type=direct)
+
+    chart = None
+    if charts:
+        from longterm_it.gui.charts import ItChart
+        application()
+        chart = ItChart(sensors)
+
+    environ_thread = threading.Thread(target=environ, name="environ")
+    meas_thread = threading.Thread(target=meas, name="measure")
+    clock.attach(environ_thread)
+    clock.attach(meas_thread)
+
+    t0 = time.monotonic()
+    environ_thread.start()
+    meas_thread.start()
+
+    # Drain readings into chart on the main thread, fit chart once per
+    # virtual hour (a full fit per reading is covered by the benchmarks).
+    last_fit = 0.0
+    while meas_thread.is_alive() or not readings.empty():
+        try:
+            reading = readings.get(timeout=0.1)
+        except queue.Empty:
+            continue
+        if chart is not None:
+            ts = reading.get("time", 0)
+            for channel in reading.get("channels", {}).values():
+                series = chart.itSeries.get(channel.get("index"))
+                if series is not None:
+                    series.data().append(ts, channel.get("I", 0) * 1e6)
+            if ts - last_fit >= 3600.0:
+                chart.fit()
+                last_fit = ts
+
+    meas_thread.join()
+    real_duration = time.monotonic() - t0
+    virtual_duration = clock.elapsed()
+    environ.abort()
+    environ_thread.join()
+    memory.append((virtual_duration, resident_memory()))
+
+    # Output files
+    files = []
+    for filename in sorted(os.listdir(path)):
+        fullname = os.path.join(path, filename)
+        with open(fullname, "rb") as fp:
+            lines = sum(1 for _ in fp)
+        files.append({"name": filename, "size": os.path.getsize(fullname), "lines": lines})
+
+    # Memory growth after first virtual day (warm up)
+    steady = [value for elapsed, value in memory if elapsed >= 86400.0] or [value for _, value in memory]
+    growth = steady[-1] - steady[0]
+    steady_days = max(1.0, (virtual_duration - 86400.0) / 86400.0)
+
+    checks = []
+    checks.append(check(
+        "memory growth",
+        growth / steady_days <= max_growth_per_day,
+        f"{growth / steady_days / 1024 ** 2:.2f} MiB/day, limit {max_growth_per_day / 1024 ** 2:.2f} MiB/day",
+    ))
+    checks.append(check("no failures", not failures, "; ".join(failures) or "ok"))
+    expected = int(duration // interval)
+    checks.append(check(
+        "it reading count",
+        expected * 0.95 <= counts["it"] <= expected + 1,
+        f"{counts['it']} readings, expected about {expected}",
+    ))
+    deltas = [b - a for a, b in zip(it_times, it_times[1:])]
+    checks.append(check("it timestamps monotonic", all(delta > 0 for delta in deltas), "ok" if deltas else "no readings"))
+    if deltas:
+        checks.append(check(
+            "it interval",
+            min(deltas) >= interval and max(deltas) <= interval * 1.1 + 5.0,
+            f"min {min(deltas):.3f} s, max {max(deltas):.3f} s, configured {interval:.3f} s",
+        ))
+    checks.append(check(
+        "virtual duration",
+        virtual_duration >= duration,
+        f"{virtual_duration:.0f} s, configured {duration:.0f} s",
+    ))
+    checks.append(check(
+        "environ reading count",
+        counts["cts"] >= virtual_duration / (environ.interval * 1.1),
+        f"{counts['cts']} readings, interval {environ.interval} s",
+    ))
+    it_files = [item for item in files if item["name"].startswith("it-") and not item["name"].endswith(IndexSuffix)]
+    offset = header_lines(sensor_count)
+    checks.append(check(
+        "it file rows",
+        len(it_files) == 1 and all(item["lines"] - offset == counts["it"] for item in it_files),
+        ", ".join(f"{item['name']}: {item['lines'] - offset}" for item in it_files) or "no files",
+    ))
+    for item in it_files:
+        entries = read_index(os.path.join(path, item["name"]))
+        expected = math.ceil(counts["it"] / IndexEvery)
+        checks.append(check(
+            "it index entries",
+            len(entries) == expected and all(a < b for a, b in zip(entries, entries[1:])),
+            f"{item['name']}{IndexSuffix}: {len(entries)} entries, expected {expected}",
+        ))
+    if chart is not None:
+        points = {index: len(series.data()) for index, series in chart.itSeries.items()}
+        checks.append(check(
+            "chart point count",
+            all(count == counts["it"] for count in points.values()),
+            ", ".join(f"{index}: {count}" for index, count in points.items()),
+        ))
+
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "machine": machine_info(),
+        "parameters": {
+            "days": days,
+            "interval": interval,
+            "sensors": sensor_count,
+            "seed": seed,
+            "latency": latency,
+            "charts": charts,
+        },
+        "virtual_duration": virtual_duration,
+        "real_duration": real_duration,
+        "speedup": virtual_duration / real_duration if real_duration else 0.0,
+        "readings": counts,
+        "memory": {
+            "samples": memory,
+            "start": memory[0][1],
+            "end": memory[-1][1],
+            "peak": max(value for _, value in memory),
+            "growth": growth,
+            "growth_per_day": growth / steady_days,
+        },
+        "files": files,
+        "checks": checks,
+        "passed": all(item["passed"] for item in checks),
+    }
@@ -0,0 +1,314 @@
+"""Acquisition benchmarks against simulated instruments.
+
+Every benchmark returns the number of operations performed per call, the
+runner takes the best wall time of several repeats.
+"""
+
+import logging
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Optional
+
+__all__ = ["benchmark", "benchmarks", "machine_info", "run", "compare"]
+
+ChartSizes: tuple[int, ...] = (10_000, 100_000, 1_000_000)
+
+benchmarks: dict[str, Callable[[], Callable[[], int]]] = {}
+"""Registered benchmark factories by name, a factory does the setup and
+returns the function to be timed."""
+
+
+def benchmark(name: str) -> Callable:
+    def register(factory: Callable[[], Callable[[], int]]) -> Callable[[], Callable[[], int]]:
+        benchmarks[name] = factory
+        return factory
+    return register
+
+
+_application = None
+
+
+def application():
+    """Returns Qt application, creates an (offscreen) instance if required."""
+    global _application
+    from PyQt5 import QtWidgets
+    app = QtWidgets.QApplication.instance()
+    if app is None:
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        app = QtWidgets.QApplication(sys.argv[:1])
+    _application = app
+    return app
+
+
+def create_sensors(count: int = 10) -> list:
+    from longterm_it.sensor import Sensor
+    sensors = []
+    for index in range(1, count + 1):
+        sensor = Sensor(index)
+        sensor.enabled = True
+        sensor.resistivity = 470e3
+        sensors.append(sensor)
+    return sensors
+
+
+def create_reading(ts: float, sensors: list) -> dict:
+    return {
+        "time": ts,
+        "I": 1e-6,
+        "U": 600.0,
+        "channels": {sensor.index: {"index": sensor.index, "I": 50e-9, "U": 0.0235, "R": 470e3, "temp": 21.5} for sensor in sensors},
+    }
+
+
+@benchmark("parse_reading")
+def bench_parse_reading() -> Callable[[], int]:
+    from longterm_it.workers import parse_reading
+    s = ",".join(f"{-4.32962079e-05 * index:+.8E}VDC,+0.000SECS,+0.0000RDNG#" for index in range(10))
+
+    def func() -> int:
+        for _ in range(1000):
+            parse_reading(s)
+        return 1000
+    return func
+
+
+@benchmark("scan")
+def bench_scan() -> Callable[[], int]:
+    from longterm_it.simulators import SimulatedSetup, create_resources
+    from longterm_it.workers import MeasureWorker, get_driver
+    resources = create_resources(SimulatedSetup(seed=0))
+    worker = MeasureWorker(resources)
+    worker.setSensors(create_sensors())
+    worker.setTotalCompliance(1e-3)
+    worker.setSingleCompliance(1e-3)
+    worker.setContinueInCompliance(False)
+    logging.getLogger("longterm_it.workers").setLevel(logging.WARNING)
+
+    def func() -> int:
+        with resources["smu"] as smu_res, resources["multi"] as multi_res:
+            smu = get_driver("smu")(smu_res)
+            multi = get_driver("dmm")(multi_res)
+            multi.resource.write("ROUTE:SCAN (@101:110)")
+            for _ in range(100):
+                worker.scan(smu, multi)
+        return 100
+    return func
+
+
+@benchmark("write_row")
+def bench_write_row() -> Callable[[], int]:
+    from longterm_it.writers import ItWriter
+
+    def func() -> int:
+        with tempfile.TemporaryFile("w+", newline="") as fp:
+            writer = ItWriter(fp)
+            writer.write_header()
+            for index in range(10_000):
+                writer.write_row(
+                    timestamp=1.7e9 + index,
+                    voltage=-600.0,
+                    current=50e-9,
+                    smu_current=1e-6,
+                    pt100=21.5,
+                    cts_temperature=20.0,
+                    cts_humidity=30.0,
+                    cts_status=1,
+                    cts_program=0,
+                    hv_status=True,
+                )
+        return 10_000
+    return func
+
+
+@benchmark("run_write_row")
+def bench_run_write_row() -> Callable[[], int]:
+    from longterm_it.writers import RunWriter
+    sensors = create_sensors()
+
+    def func() -> int:
+        with tempfile.TemporaryFile("w+", newline="") as fp:
+            writer = RunWriter(fp, sensors)
+            writer.write_header()
+            channels = {sensor.index: {"I": 50e-9, "U": 0.0235, "temp": 21.5, "hv": True} for sensor in sensors}
+            for index in range(10_000):
+                writer.write_row(
+                    timestamp=1.7e9 + index,
+                    voltage=-600.0,
+                    smu_current=1e-6,
+                    cts_temperature=20.0,
+                    cts_humidity=30.0,
+                    cts_status=1,
+                    cts_program=0,
+                    channels=channels,
+                )
+        return 10_000
+    return func
+
+
+def chart_append_factory(size: int) -> Callable[[], Callable[[], int]]:
+    def factory() -> Callable[[], int]:
+        from longterm_it.gui.charts import ItChart
+        application()
+        sensors = create_sensors()
+        chart = ItChart(sensors)
+        t0 = 1.7e9
+        for series in chart.itSeries.values():
+            series.data().replace([(t0 + index, 0.05) for index in range(size)])
+
+        def func() -> int:
+            for index in range(100):
+                chart.append(create_reading(t0 + size + index, sensors))
+            return 100
+        return func
+    return factory
+
+
+def chart_repaint_factory(size: int) -> Callable[[], Callable[[], int]]:
+    def factory() -> Callable[[], int]:
+        from QCharted import ChartView
+        from longterm_it.gui.charts import ItChart
+        application()
+        sensors = create_sensors()
+        chart = ItChart(sensors)
+        t0 = 1.7e9
+        for series in chart.itSeries.values():
+            series.data().replace([(t0 + index, 0.05) for index in range(size)])
+        chart.fit()
+        view = ChartView()
+        view.setChart(chart)
+        view.resize(1280, 720)
+
+        def func() -> int:
+            for index in range(10):
+                chart.append(create_reading(t0 + size + index, sensors))
+                view.grab()
+            return 10
+        func.view = view  # type: ignore[attr-defined]  # keep view alive
+        return func
+    return factory
+
+
+for size in ChartSizes:
+    benchmark(f"chart_append_{size}")(chart_append_factory(size))
+    benchmark(f"chart_repaint_{size}")(chart_repaint_factory(size))
+
+
+@benchmark("log_window")
+def bench_log_window() -> Callable[[], int]:
+    from longterm_it.gui.logwindow import LogWindow
+    application()
+    window = LogWindow()
+    window.updateTimer.stop()
+    logger = logging.getLogger("benchmarks.logwindow")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    window.addLogger(logger)
+
+    def func() -> int:
+        for index in range(5000):
+            logger.info("SMU current: %G A", 1e-6 * index)
+            if index % 250 == 0:
+                window.updateMessages()
+        window.updateMessages()
+        return 5000
+    func.window = window  # type: ignore[attr-defined]  # keep window alive
+    return func
+
+
+def machine_info() -> dict:
+    info = {
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+    }
+    try:
+        from PyQt5 import QtCore
+        info["qt"] = QtCore.QT_VERSION_STR
+    except ImportError:
+        pass
+    try:
+        from longterm_it import __version__
+        info["longterm_it"] = __version__
+    except ImportError:
+        pass
+    return info
+
+
+def measure(func: Callable[[], int], repeat: int) -> dict:
+    timings = []
+    ops = 0
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        ops = func()
+        timings.append(time.perf_counter() - t0)
+    best = min(timings)
+    return {
+        "seconds": best,
+        "ops": ops,
+        "rate": ops / best if best else 0.0,
+        "timings": timings,
+    }
+
+
+def run(names: Optional[list[str]] = None, repeat: int = 3) -> dict:
+    """Run selected (or all) benchmarks, returns results dictionary."""
+    results: dict = {}
+    skipped: dict = {}
+    errors: dict = {}
+    for name, factory in benchmarks.items():
+        if names and name not in names:
+            continue
+        try:
+            func = factory()
+            results[name] = measure(func, repeat)
+        except ImportError as exc:
+            # e.g. instrument drivers (comet) not available
+            skipped[name] = format(exc)
+        except Exception as exc:
+            errors[name] = f"{type(exc).__name__}: {exc}"
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "machine": machine_info(),
+        "repeat": repeat,
+        "results": results,
+        "skipped": skipped,
+        "errors": errors,
+    }
+
+
+def compare(old: dict, new: dict, threshold: float = 0.1) -> list[dict]:
+    """Compare two result dictionaries, returns list of comparisons.
+
+    A benchmark regressed if its best time increased by more than `threshold`
+    (relative), or if it is missing from the new results.
+    """
+    comparisons = []
+    for name, reference in old.get("results", {}).items():
+        if name not in new.get("results", {}):
+            comparisons.append({
+                "name": name,
+                "old": reference["seconds"],
+                "new": None,
+                "change": None,
+                "regression": True,
+            })
+    for name, result in new.get("results", {}).items():
+        reference = old.get("results", {}).get(name)
+        if reference is None or not reference.get("seconds"):
+            continue
+        change = (result["seconds"] - reference["seconds"]) / reference["seconds"]
+        comparisons.append({
+            "name": name,
+            "old": reference["seconds"],
+            "new": result["seconds"],
+            "change": change,
+            "regression": change > threshold,
+        })
+    return comparisons
@@ -9,6 +9,9 @@ from PyQt5 import QtCore, QtGui, QtWidgets
 from . import __version__
 from .controller import Controller
 from .gui.mainwindow import MainWindow
+from .memprofile import MemoryProfiler
+from .simulators import create_resources
+from .tracing import tracer
 
 logger = logging.getLogger(__name__)
 
@@ -16,6 +19,9 @@ logger = logging.getLogger(__name__)
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser()
     parser.add_argument("-v", dest="verbose", action="store_true", help="show verbose information")
+    parser.add_argument("--simulate", action="store_true", help="use in-process simulated instruments")
+    parser.add_argument("--trace", action="store_true", help="write Chrome trace event file for every run")
+    parser.add_argument("--memory-profile", metavar="<seconds>", type=float, nargs="?", const=600.0, help="record memory profile every n seconds during measurements (default: 600)")
     parser.add_argument("--version", action="version", version=f"%(prog)s {__version__}")
     return parser.parse_args()
 
@@ -38,6 +44,9 @@ def main() -> None:
 
     logger.info("Longterm It version %s", __version__)
 
+    if args.trace:
+        tracer.enable()
+
     # Set the locale to EN-US
     locale = QtCore.QLocale(QtCore.QLocale.English, QtCore.QLocale.UnitedStates)
     QtCore.QLocale.setDefault(locale)
@@ -75,9 +84,15 @@ def main() -> None:
     window.logWindow.setLevel(level)
     controller = Controller(window)
     controller.readSettings()
+    if args.memory_profile:
+        controller.setMemoryProfiler(MemoryProfiler(args.memory_profile))
+    if args.simulate:
+        logger.warning("Using simulated instruments!")
+        window.resources.update(create_resources())
     window.show()
 
     app.aboutToQuit.connect(controller.writeSettings)
+    app.aboutToQuit.connect(controller.stopServices)
     app.exec()
 
 
@@ -0,0 +1,161 @@
+"""Streaming anomaly detection on It channel currents.
+
+Each sample is scored with a robust z-score against the rolling median
+and median absolute deviation (MAD) of the preceding samples. Samples
+exceeding the spike threshold are reported as spikes. A two-sided CUSUM
+on the clipped z-scores detects sustained level shifts (steps), after
+which the baseline is rebuilt from the new level. The work per sample
+is bounded by the fixed window size.
+"""
+
+import bisect
+import collections
+import json
+import math
+from typing import Iterable, Optional
+
+from .sensor import Sensor
+
+__all__ = ["RollingMedian", "AnomalyDetector", "AnomalyMonitor", "write_event"]
+
+MadScale: float = 1.4826
+"""Scale of MAD to standard deviation for normal distributed noise."""
+
+
+class RollingMedian:
+    """Median and MAD over a sliding window of the last `size` values."""
+
+    def __init__(self, size: int = 31) -> None:
+        self.values: collections.deque = collections.deque(maxlen=size)
+        self.ordered: list[float] = []
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def clear(self) -> None:
+        self.values.clear()
+        self.ordered.clear()
+
+    def add(self, value: float) -> None:
+        if len(self.values) == self.values.maxlen:
+            del self.ordered[bisect.bisect_left(self.ordered, self.values[0])]
+        self.values.append(value)
+        bisect.insort(self.ordered, value)
+
+    def median(self) -> float:
+        return median(self.ordered)
+
+    def mad(self) -> float:
+        center = self.median()
+        return median(sorted(abs(value - center) for value in self.ordered))
+
+
+def median(ordered: list[float]) -> float:
+    count = len(ordered)
+    if not count:
+        return math.nan
+    middle = count // 2
+    if count % 2:
+        return ordered[middle]
+    return (ordered[middle - 1] + ordered[middle]) / 2
+
+
+class AnomalyDetector:
+    """Spike and step detector for a single channel.
+
+    >>> detector = AnomalyDetector()
+    >>> for t, current in samples:
+    ...     event = detector.add(t, current)
+    ...     if event:
+    ...         print(event["kind"], event["time"])
+    """
+
+    DefaultWindow: int = 31
+    DefaultSpikeThreshold: float = 8.0
+    DefaultStepThreshold: float = 12.0
+    DefaultDrift: float = 1.0
+    MinSamples: int = 10
+    CusumClip: float = 4.0
+    """Robust z-scores are clipped for the CUSUM, single spikes do not
+    accumulate into steps."""
+
+    def __init__(
+        self,
+        window: int = DefaultWindow,
+        spike_threshold: float = DefaultSpikeThreshold,
+        step_threshold: float = DefaultStepThreshold,
+        drift: float = DefaultDrift,
+        min_scale: float = 1e-12,
+        relative_scale: float = 1e-3,
+    ) -> None:
+        self.window: RollingMedian = RollingMedian(window)
+        self.spike_threshold: float = spike_threshold
+        self.step_threshold: float = step_threshold
+        self.drift: float = drift
+        self.min_scale: float = min_scale
+        self.relative_scale: float = relative_scale
+        self.score: float = math.nan
+        self.upper: float = 0.0
+        self.lower: float = 0.0
+
+    def add(self, t: float, value: float) -> Optional[dict]:
+        """Add sample, returns event dictionary with `kind` (spike, step),
+        `time`, `value`, `median` and `score`, else None."""
+        if value is None or math.isnan(value):
+            return None
+        event = None
+        if len(self.window) >= self.MinSamples:
+            center = self.window.median()
+            scale = max(MadScale * self.window.mad(), self.relative_scale * abs(center), self.min_scale)
+            self.score = (value - center) / scale
+            clipped = max(-self.CusumClip, min(self.CusumClip, self.score))
+            self.upper = max(0.0, self.upper + clipped - self.drift)
+            self.lower = max(0.0, self.lower - clipped - self.drift)
+            if abs(self.score) > self.spike_threshold:
+                event = {"kind": "spike", "time": t, "value": value, "median": center, "score": self.score}
+            elif max(self.upper, self.lower) > self.step_threshold:
+                score = self.upper if self.upper > self.lower else -self.lower
+                event = {"kind": "step", "time": t, "value": value, "median": center, "score": score}
+                self.reset()
+        self.window.add(value)
+        return event
+
+    def reset(self) -> None:
+        """Start over building the baseline, e.g. after a level shift."""
+        self.window.clear()
+        self.upper = 0.0
+        self.lower = 0.0
+
+
+class AnomalyMonitor:
+    """Runs an anomaly detector per sensor on It scans."""
+
+    def __init__(self, sensors: Iterable[Sensor], **options) -> None:
+        self.sensors: list[Sensor] = list(sensors)
+        self.detectors: dict[int, AnomalyDetector] = {
+            sensor.index: AnomalyDetector(**options) for sensor in self.sensors
+        }
+
+    def add(self, t: float, channels: dict) -> list[dict]:
+        """Add scan, `channels` maps sensor index to channel reading with
+        current `I` and HV status `hv`. Returns list of events including
+        sensor `index` and `name`. Channels with HV switched off are
+        skipped and their baseline is rebuilt."""
+        events = []
+        for sensor in self.sensors:
+            detector = self.detectors[sensor.index]
+            channel = channels.get(sensor.index, {})
+            if channel.get("hv") is False:
+                detector.reset()
+                continue
+            event = detector.add(t, channel.get("I", math.nan))
+            if event:
+                events.append({"index": sensor.index, "name": sensor.name, **event})
+        return events
+
+
+def write_event(fp, event: dict) -> None:
+    """Write event as JSON line."""
+    fp.write(json.dumps(event))
+    fp.write("\n")
+    fp.flush()
@@ -0,0 +1,344 @@
+"""Streaming compressed output with chunk sync points and file rotation.
+
+Text is buffered and written as independently compressed chunks (gzip
+members or zstd frames), so a crash loses at most the current chunk and
+readers can start decompressing at every chunk boundary. Compressed files
+remain readable by standard tools (e.g. `zcat`). Offsets of chunks are
+recorded in a `.chunks` sidecar file.
+"""
+
+import gzip
+import io
+import json
+import logging
+import os
+import queue
+import threading
+import time
+import zlib
+from typing import Callable, Iterator, Optional, TextIO
+
+try:
+    import zstandard  # type: ignore
+except ImportError:
+    zstandard = None
+
+__all__ = [
+    "Compressions",
+    "ArchiveWriter",
+    "ArchiveReader",
+    "archive_filename",
+    "is_archive",
+    "open_text",
+]
+
+logger = logging.getLogger(__name__)
+
+Compressions: dict[str, str] = {
+    "gzip": ".gz",
+    "zstd": ".zst",
+}
+"""Supported compressions and their file extensions."""
+
+ChunksSuffix: str = ".chunks"
+
+
+def check_compression(compression: str) -> None:
+    if compression not in Compressions:
+        raise ValueError(f"invalid compression: {compression!r}")
+    if compression == "zstd" and zstandard is None:
+        raise RuntimeError("zstd compression requires package 'zstandard'")
+
+
+def archive_filename(filename: str, compression: str, part: int = 0) -> str:
+    """Returns archive filename for base filename, compression and rotation
+    part.
+
+    >>> archive_filename("it-2024-01-01T00-00-00.txt", "gzip", 2)
+    'it-2024-01-01T00-00-00-002.txt.gz'
+    """
+    if part:
+        root, ext = os.path.splitext(filename)
+        filename = f"{root}-{part:03d}{ext}"
+    return filename + Compressions[compression]
+
+
+def next_part(filename: str, compression: str) -> int:
+    """Returns first rotation part not yet written."""
+    part = 0
+    while os.path.exists(archive_filename(filename, compression, part)):
+        part += 1
+    return part
+
+
+def is_archive(filename: str) -> bool:
+    return os.path.splitext(filename)[1] in Compressions.values()
+
+
+def compression_for(filename: str) -> str:
+    extension = os.path.splitext(filename)[1]
+    for compression, value in Compressions.items():
+        if value == extension:
+            return compression
+    raise ValueError(f"not a compressed archive: {filename!r}")
+
+
+def compress(data: bytes, compression: str, level: Optional[int] = None) -> bytes:
+    """Returns data compressed as single gzip member or zstd frame."""
+    if compression == "zstd":
+        return zstandard.ZstdCompressor(level=level or 3, write_content_size=True).compress(data)
+    return gzip.compress(data, compresslevel=6 if level is None else level, mtime=0)
+
+
+def decompressor(compression: str):
+    if compression == "zstd":
+        return zstandard.ZstdDecompressor().decompressobj()
+    return zlib.decompressobj(wbits=31)
+
+
+def open_text(filename: str) -> TextIO:
+    """Open plain or compressed text file for reading."""
+    if not is_archive(filename):
+        return open(filename, newline="")
+    compression = compression_for(filename)
+    check_compression(compression)
+    if compression == "zstd":
+        fp = open(filename, "rb")
+        reader = zstandard.ZstdDecompressor().stream_reader(fp, read_across_frames=True, closefd=True)
+        return io.TextIOWrapper(reader, encoding="utf-8", newline="")
+    return io.TextIOWrapper(gzip.open(filename, "rb"), encoding="utf-8", newline="")
+
+
+class ArchiveWriter:
+    """Text file object writing compressed chunks.
+
+    A chunk is completed on `flush` once it exceeds `chunk_size` bytes or
+    `chunk_interval` seconds. Compression, writing and rotation run in a
+    background thread so writing never blocks on disk I/O. Files are
+    rotated after `rotate_size` compressed bytes or `rotate_interval`
+    seconds (zero disables rotation); the text marked as header using
+    `mark_header` is repeated at the start of every rotated file. Writing
+    starts with rotation `part`, e.g. to continue a resumed run.
+    """
+
+    MaximumHeaderSize: int = 1024 * 1024
+
+    DefaultChunkInterval: float = 3600.0
+    """Much longer than typical It intervals, so chunks span many rows."""
+
+    def __init__(
+        self,
+        filename: str,
+        compression: str = "gzip",
+        chunk_size: int = 1024 * 1024,
+        chunk_interval: float = DefaultChunkInterval,
+        rotate_size: int = 0,
+        rotate_interval: float = 0.0,
+        level: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic,
+        part: int = 0,
+    ) -> None:
+        check_compression(compression)
+        self.filename: str = filename
+        self.compression: str = compression
+        self.chunk_size: int = chunk_size
+        self.chunk_interval: float = chunk_interval
+        self.rotate_size: int = rotate_size
+        self.rotate_interval: float = rotate_interval
+        self.level: Optional[int] = level
+        self.clock: Callable[[], float] = clock
+        self.closed: bool = False
+        self._buffer: list[str] = []
+        self._buffer_size: int = 0
+        self._chunk_started: float = clock()
+        self._header: str = ""
+        self._preamble: Optional[list[str]] = []
+        self._error: Optional[BaseException] = None
+        self._filenames: list[str] = []
+        self._queue: queue.Queue = queue.Queue()
+        self._part: int = part
+        self._fp = None
+        self._chunks_fp = None
+        self._file_started: float = 0.0
+        self._line: int = 0
+        self._lock = threading.Lock()
+        self._open_part(self._chunk_started)
+        self._thread = threading.Thread(target=self._run, name="archive", daemon=True)
+        self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        self.close()
+        return False
+
+    def filenames(self) -> list[str]:
+        """Returns list of written files."""
+        with self._lock:
+            return list(self._filenames)
+
+    def write(self, s: str) -> int:
+        self._check()
+        self._buffer.append(s)
+        self._buffer_size += len(s)
+        if self._preamble is not None:
+            self._preamble.append(s)
+            if sum(map(len, self._preamble)) > self.MaximumHeaderSize:
+                self._preamble = None  # too large for a header
+        return len(s)
+
+    def mark_header(self) -> None:
+        """Mark text written so far as header, repeated in rotated files."""
+        if self._preamble is not None:
+            self._header = "".join(self._preamble)
+            self._preamble = None
+        self.sync()
+
+    def flush(self) -> None:
+        """Complete current chunk if it exceeds size or age limit."""
+        self._check()
+        if self._buffer_size >= self.chunk_size or self.clock() - self._chunk_started >= self.chunk_interval:
+            self.sync()
+
+    def sync(self) -> None:
+        """Complete current chunk, creating a sync point."""
+        self._check()
+        now = self.clock()
+        if self._buffer:
+            self._queue.put(("".join(self._buffer), now))
+            self._buffer.clear()
+            self._buffer_size = 0
+        self._chunk_started = now
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        if self._buffer:
+            self._queue.put(("".join(self._buffer), self.clock()))
+            self._buffer.clear()
+        self._queue.put(None)
+        self._thread.join()
+        self._close_part()
+        if self._error is not None:
+            raise RuntimeError(f"failed to write archive {self.filename!r}: {self._error}") from self._error
+
+    def _check(self) -> None:
+        if self.closed:
+            raise ValueError("I/O operation on closed archive")
+        if self._error is not None:
+            raise RuntimeError(f"failed to write archive {self.filename!r}: {self._error}") from self._error
+
+    def _open_part(self, timestamp: float) -> None:
+        filename = archive_filename(self.filename, self.compression, self._part)
+        self._fp = open(filename, "wb")
+        self._chunks_fp = open(filename + ChunksSuffix, "w")
+        self._file_started = timestamp
+        self._line = 0
+        with self._lock:
+            self._filenames.append(filename)
+
+    def _close_part(self) -> None:
+        if self._fp is not None:
+            self._fp.close()
+            self._fp = None
+        if self._chunks_fp is not None:
+            self._chunks_fp.close()
+            self._chunks_fp = None
+
+    def _rotate(self, timestamp: float) -> None:
+        self._close_part()
+        self._part += 1
+        self._open_part(timestamp)
+        if self._header:
+            self._write_chunk(self._header)
+
+    def _write_chunk(self, text: str) -> None:
+        data = compress(text.encode("utf-8"), self.compression, self.level)
+        offset = self._fp.tell()
+        self._fp.write(data)
+        self._fp.flush()
+        os.fsync(self._fp.fileno())
+        self._chunks_fp.write(json.dumps({"offset": offset, "size": len(data), "line": self._line}))
+        self._chunks_fp.write("\n")
+        self._chunks_fp.flush()
+        self._line += text.count("\n")
+
+    def _rotation_due(self, timestamp: float) -> bool:
+        if self.rotate_size and self._fp.tell() >= self.rotate_size:
+            return True
+        if self.rotate_interval and timestamp - self._file_started >= self.rotate_interval:
+            return True
+        return False
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            if self._error is not None:
+                continue
+            text, timestamp = item
+            try:
+                if self._rotation_due(timestamp):
+                    self._rotate(timestamp)
+                self._write_chunk(text)
+            except Exception as exc:
+                logger.exception(exc)
+                self._error = exc
+
+
+class ArchiveReader:
+    """Random access reader for chunked compressed archives.
+
+    Chunk boundaries are read from the `.chunks` sidecar file or, if not
+    available, by decompressing the archive once.
+    """
+
+    def __init__(self, filename: str) -> None:
+        self.filename: str = filename
+        self.compression: str = compression_for(filename)
+        check_compression(self.compression)
+        self._chunks: Optional[list[dict]] = None
+
+    def chunks(self) -> list[dict]:
+        """Returns list of chunks containing byte `offset`, compressed `size`
+        and number of first `line`."""
+        if self._chunks is None:
+            try:
+                with open(self.filename + ChunksSuffix) as fp:
+                    self._chunks = [json.loads(line) for line in fp if line.strip()]
+            except FileNotFoundError:
+                self._chunks = self._scan()
+        return self._chunks
+
+    def _scan(self) -> list[dict]:
+        chunks = []
+        offset = 0
+        line = 0
+        with open(self.filename, "rb") as fp:
+            data = fp.read()
+        while offset < len(data):
+            obj = decompressor(self.compression)
+            text = obj.decompress(data[offset:])
+            if not obj.eof:
+                break  # truncated chunk
+            size = len(data) - offset - len(obj.unused_data)
+            chunks.append({"offset": offset, "size": size, "line": line})
+            line += text.count(b"\n")
+            offset += size
+        return chunks
+
+    def read_chunk(self, index: int) -> str:
+        """Returns decompressed text of chunk."""
+        chunk = self.chunks()[index]
+        with open(self.filename, "rb") as fp:
+            fp.seek(chunk["offset"])
+            data = fp.read(chunk["size"])
+        return decompressor(self.compression).decompress(data).decode("utf-8")
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over lines of all complete chunks."""
+        for index in range(len(self.chunks())):
+            yield from self.read_chunk(index).splitlines(keepends=True)
@@ -0,0 +1,90 @@
+"""Streaming breakdown onset detection for IV ramps.
+
+Each channel is fed one (voltage, current) point per ramp step. Onset of
+breakdown is flagged if either
+
+- the current jumps by more than `jump` relative to the previous step,
+  beyond what proportional (ohmic) scaling with the voltage explains, or
+- the log-log slope d ln|I| / d ln|U| exceeds `slope` and is still
+  increasing by more than `curvature` between steps, for `confirm`
+  consecutive steps.
+
+A bulk generation current grows with about the square root of the voltage
+(slope 0.5), an ohmic current with slope 1, avalanche breakdown shows a
+steep and accelerating rise. Currents below `min_current` are ignored.
+"""
+
+import math
+from typing import Optional
+
+__all__ = ["BreakdownDetector"]
+
+
+class BreakdownDetector:
+    """Breakdown onset detector for a single channel.
+
+    >>> detector = BreakdownDetector()
+    >>> for voltage, current in ramp:
+    ...     reason = detector.add(voltage, current)
+    ...     if reason:
+    ...         print(f"breakdown at {voltage} V: {reason}")
+    """
+
+    DefaultSlope: float = 10.0
+    DefaultCurvature: float = 0.0
+    DefaultJump: float = 1.0
+    DefaultMinCurrent: float = 1e-9
+    DefaultConfirm: int = 2
+
+    def __init__(
+        self,
+        slope: float = DefaultSlope,
+        curvature: float = DefaultCurvature,
+        jump: float = DefaultJump,
+        min_current: float = DefaultMinCurrent,
+        confirm: int = DefaultConfirm,
+    ) -> None:
+        self.slope_limit: float = slope
+        self.curvature_limit: float = curvature
+        self.jump_limit: float = jump
+        self.min_current: float = min_current
+        self.confirm: int = confirm
+        self.count: int = 0
+        self.voltage: float = math.nan
+        self.current: float = math.nan
+        self.slope: float = math.nan
+        self.curvature: float = math.nan
+        self.jump: float = math.nan
+        self.triggered: Optional[str] = None
+
+    def add(self, voltage: float, current: float) -> Optional[str]:
+        """Add ramp step, returns reason on breakdown onset, else None.
+
+        Once triggered the detector keeps returning None.
+        """
+        if self.triggered or current is None or math.isnan(current):
+            return None
+        voltage, current = abs(voltage), abs(current)
+        previous_voltage, previous_current = self.voltage, self.current
+        self.voltage, self.current = voltage, current
+        if math.isnan(previous_current) or current < self.min_current or previous_current < self.min_current:
+            self.slope = math.nan
+            self.count = 0
+            return None
+        previous_slope = self.slope
+        if voltage > previous_voltage > 0:
+            self.jump = (current / previous_current) / (voltage / previous_voltage) - 1.0
+            self.slope = math.log(current / previous_current) / math.log(voltage / previous_voltage)
+        else:
+            self.jump = math.nan
+            self.slope = math.nan
+        self.curvature = self.slope - previous_slope
+        if self.slope > self.slope_limit and self.curvature > self.curvature_limit:
+            self.count += 1
+        else:
+            self.count = 0
+        if self.jump > self.jump_limit:
+            self.triggered = f"current jump {self.jump:+.0%}"
+        elif self.count >= self.confirm:
+            self.triggered = f"slope {self.slope:.1f}, curvature {self.curvature:+.1f}"
+        return self.triggered
@@ -0,0 +1,96 @@
+import threading
+import time
+from typing import Optional
+
+__all__ = ["Clock", "VirtualClock"]
+
+
+class Clock:
+    """System clock, providing wall time, monotonic time and sleep."""
+
+    def time(self) -> float:
+        return time.time()
+
+    def monotonic(self) -> float:
+        return time.monotonic()
+
+    def sleep(self, seconds: float) -> None:
+        time.sleep(seconds)
+
+
+class VirtualClock(Clock):
+    """Virtual clock for accelerated simulations.
+
+    Time only advances by sleeping. Threads calling `sleep` take part in
+    the simulation; time is advanced to the earliest wake up deadline as
+    soon as every participating thread sleeps, so concurrent workers stay
+    in step with each other. Threads should be attached before they are
+    started, else a thread may run ahead until the others sleep for the
+    first time. Participating threads that terminated are dropped
+    automatically.
+
+    If a participant does not reach a sleep within `timeout` seconds of
+    real time (e.g. blocked on I/O), time advances anyway.
+    """
+
+    def __init__(self, start: Optional[float] = None, timeout: float = 1.0) -> None:
+        self.start: float = time.time() if start is None else start
+        self.timeout: float = timeout
+        self._now: float = 0.0
+        self._condition = threading.Condition()
+        self._threads: set[threading.Thread] = set()
+        self._deadlines: dict[threading.Thread, float] = {}
+
+    def time(self) -> float:
+        with self._condition:
+            return self.start + self._now
+
+    def monotonic(self) -> float:
+        with self._condition:
+            return self._now
+
+    def elapsed(self) -> float:
+        """Returns virtual seconds elapsed since start."""
+        return self.monotonic()
+
+    def advance(self, seconds: float) -> None:
+        """Advance time by seconds, waking up due sleepers."""
+        with self._condition:
+            self._now += max(0.0, seconds)
+            self._condition.notify_all()
+
+    def attach(self, thread: threading.Thread) -> None:
+        """Attach thread to simulation, time does not advance before an
+        attached thread was started and sleeps or terminated.
+        """
+        with self._condition:
+            self._threads.add(thread)
+
+    def sleep(self, seconds: float) -> None:
+        thread = threading.current_thread()
+        with self._condition:
+            self._threads.add(thread)
+            deadline = self._now + max(0.0, seconds)
+            self._deadlines[thread] = deadline
+            try:
+                while self._now < deadline:
+                    # Advance to earliest deadline if all participants sleep
+                    # and none of them is already due to wake up.
+                    if self._all_sleeping():
+                        earliest = min(self._deadlines.values())
+                        if earliest > self._now:
+                            self._now = earliest
+                            self._condition.notify_all()
+                            continue
+                    if not self._condition.wait(self.timeout):
+                        self._now = max(self._now, min(self._deadlines.values()))
+                        self._condition.notify_all()
+            finally:
+                del self._deadlines[thread]
+                self._condition.notify_all()
+
+    def _all_sleeping(self) -> bool:
+        for thread in list(self._threads):
+            if thread.ident is not None and not thread.is_alive():
+                self._threads.discard(thread)
+        return len(self._deadlines) >= len(self._threads)
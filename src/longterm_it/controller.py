@@ -1,4 +1,5 @@
 import datetime
+import gc
 import logging
 import os
 import re
@@ -9,7 +10,24 @@ from PyQt5 import QtCore, QtWidgets
 
 
 from . import __version__
+from .anomaly import AnomalyDetector
+from .breakdown import BreakdownDetector
+from .feed import Feed
+from .journal import Journal, find_resumable
+from .memprofile import MemoryProfiler
+from .normalize import DefaultBandGap, DefaultReferenceTemperature
+from .metrics import MetricsServer
+from .ramp import (
+    AdaptiveRamp,
+    DefaultRampDownSlewRate,
+    DefaultRampDownStep,
+    DefaultSettleInterval,
+    DefaultSettleThreshold,
+    DefaultSettleWindow,
+)
 from .resource import Resource
+from .sampling import AdaptiveInterval
+from .tracing import tracer
 from .workers import EnvironWorker, MeasureWorker
 
 __all__ = ["Controller"]
@@ -29,6 +47,14 @@ class Controller:
         self.view.resources.update({"multi": Resource("TCPIP::localhost::10003::SOCKET")})
         self.view.resources.update({"cts": Resource("TCPIP::localhost::1080::SOCKET")})
 
+        self.feed = None
+        self.metricsServer = None
+        self.memoryProfiler = None
+        self.resumeJournal = None
+
+        self.memoryTimer = QtCore.QTimer()
+        self.memoryTimer.timeout.connect(self.onMemorySample)
+
         self.createProcesses()
 
         dashboard = self.view.dashboard
@@ -37,6 +63,7 @@ class Controller:
         dashboard.controlsWidget.started.connect(self.onStart)
         dashboard.controlsWidget.stopRequest.connect(self.onStopRequest)
         dashboard.controlsWidget.halted.connect(self.onHalted)
+        self.view.resumeAction.triggered.connect(self.onResume)
 
         self.view.environ_thread.start()
 
@@ -59,8 +86,75 @@ class Controller:
                 else:
                     resource.options[key] = value
 
+    def loadServices(self):
+        settings = QtCore.QSettings()
+        if settings.value("feed/enabled", False, bool):
+            address = settings.value("feed/address", "localhost:10010", str)
+            replay = settings.value("feed/replay", 100, int)
+            format = settings.value("feed/format", "json", str)
+            try:
+                feed = Feed(address, replay=replay, format=format)
+                feed.start()
+            except Exception as exc:
+                logger.exception(exc)
+                logger.error("failed to start reading feed on %r", address)
+            else:
+                self.feed = feed
+                self.view.environ_worker.setFeed(feed)
+                self.view.meas_worker.setFeed(feed)
+        if settings.value("metrics/enabled", False, bool):
+            port = settings.value("metrics/port", 10020, int)
+            try:
+                metricsServer = MetricsServer(port)
+                metricsServer.start()
+            except Exception as exc:
+                logger.exception(exc)
+                logger.error("failed to start metrics endpoint on port %d", port)
+            else:
+                self.metricsServer = metricsServer
+
+    def stopServices(self):
+        if self.feed is not None:
+            self.feed.stop()
+            self.feed = None
+        if self.metricsServer is not None:
+            self.metricsServer.stop()
+            self.metricsServer = None
+
+    def setMemoryProfiler(self, profiler: MemoryProfiler) -> None:
+        """Enable memory profiling of measurements."""
+        dashboard = self.view.dashboard
+        charts = [
+            dashboard.ivChart,
+            dashboard.itChart,
+            dashboard.itNormChart,
+            dashboard.ctsChart,
+            dashboard.ivTempChart,
+            dashboard.itTempChart,
+            dashboard.shuntBoxChart,
+            dashboard.ivSourceChart,
+            dashboard.itSourceChart,
+        ]
+
+        def objectCount(type) -> int:
+            return sum(1 for obj in gc.get_objects() if isinstance(obj, type))
+
+        profiler.add_counter("qt_widgets", lambda: len(QtWidgets.QApplication.allWidgets()))
+        profiler.add_counter("qt_objects", lambda: objectCount(QtCore.QObject))
+        profiler.add_counter("dicts", lambda: objectCount(dict))
+        profiler.add_counter("chart_points", lambda: sum(len(series.data()) for chart in charts for series in chart.series()))
+        profiler.add_counter("log_messages", lambda: self.view.logWindow.treeWidget.topLevelItemCount())
+        self.memoryProfiler = profiler
+        self.memoryTimer.setInterval(int(profiler.interval * 1000))
+        self.view.diagnosticsDialog.setMemoryProfiler(profiler)
+
+    def onMemorySample(self):
+        if self.memoryProfiler is not None:
+            self.memoryProfiler.sample()
+
     def readSettings(self):
         self.loadResources()
+        self.loadServices()
         self.view.readSettings()
         dashboard = self.view.dashboard
         dashboard.sensors().readSettings()
@@ -78,12 +172,14 @@ class Controller:
         self.view.environ_worker = EnvironWorker(self.view.resources)
         self.view.environ_worker.reading.connect(self.onEnvironReading)
         self.view.environ_worker.failed.connect(self.view.onShowException)
+        self.view.environ_worker.circuitStateChanged.connect(dashboard.statusWidget.setConnection)
         self.onEnableEnviron(dashboard.controlsWidget.isEnvironEnabled())
         self.onEnableShuntBox(dashboard.controlsWidget.isShuntBoxEnabled())
         self.view.environ_thread = threading.Thread(target=self.view.environ_worker)
 
         # Measurement process
         meas = MeasureWorker(self.view.resources)
+        meas.setEnvironSnapshot(self.view.environ_worker.snapshot)
 
         meas.ivStarted.connect(dashboard.onIvStarted)
         meas.itStarted.connect(dashboard.onItStarted)
@@ -158,6 +254,7 @@ class Controller:
         dashboard.statusWidget.setTemperature(float("nan"))
         dashboard.statusWidget.setHumidity(float("nan"))
         dashboard.statusWidget.setStatus("N/A")
+        dashboard.statusWidget.setConnection(self.view.environ_worker.circuitState)
         dashboard.sensorsWidget.dataChanged()  # HACK keep updated
         # Toggle environ worker
         self.view.environ_worker.setEnabled(enabled)
@@ -168,47 +265,66 @@ class Controller:
 
     def onEnvironReading(self, reading):
         dashboard = self.view.dashboard
-        dashboard.ctsChart.append(reading)
+        dashboard.appendChart(dashboard.ctsChart, reading)
         dashboard.statusWidget.setTemperature(reading.get("temp"))
         dashboard.statusWidget.setHumidity(reading.get("humid"))
         dashboard.statusWidget.setStatus(
             "{} ({})".format(reading.get("status"), reading.get("program"))
         )
-        meas = self.view.meas_worker
-        meas.setTemperature(reading.get("temp"))
-        meas.setHumidity(reading.get("humid"))
-        meas.setStatus(reading.get("status"))
-        meas.setProgram(reading.get("program"))
         dashboard.sensorsWidget.dataChanged()  # HACK keep updated
 
     def onStart(self):
         dashboard = self.view.dashboard
         dashboard.sensors().setEditable(False)
         dashboard.statusWidget.clearCurrent()
+        for sensor in dashboard.sensors():
+            sensor.statistics = None
+            sensor.events = 0
+            sensor.last_event = None
 
         self.view.importCalibAction.setEnabled(False)
         self.view.preferencesAction.setEnabled(False)
         self.view.startAction.setEnabled(False)
+        self.view.resumeAction.setEnabled(False)
         self.view.stopAction.setEnabled(True)
 
         # TODO
         dashboard.ctsChart.reset()
         dashboard.ivChart.load(dashboard.sensors())
         dashboard.itChart.load(dashboard.sensors())
+        dashboard.itNormChart.load(dashboard.sensors())
         dashboard.ivTempChart.load(dashboard.sensors())
         dashboard.itTempChart.load(dashboard.sensors())
         dashboard.ivSourceChart.reset()
         dashboard.itSourceChart.reset()
 
         # Setup output location
-        path = os.path.normpath(dashboard.controlsWidget.path())
+        journal, self.resumeJournal = self.resumeJournal, None
         timestamp = datetime.datetime.utcfromtimestamp(time.time()).strftime(
             "%Y-%m-%dT%H-%M-%S"
         )
-        path = os.path.join(path, timestamp)
+        if journal is not None:
+            path = journal.path  # append to interrupted run
+        else:
+            path = os.path.normpath(dashboard.controlsWidget.path())
+            path = os.path.join(path, timestamp)
         if not os.path.exists(path):
             os.makedirs(path)
 
+        if self.memoryProfiler is not None:
+            try:
+                self.memoryProfiler.start(os.path.join(path, f"memory-{timestamp}.jsonl"))
+            except Exception as exc:
+                logger.exception(exc)
+            else:
+                self.memoryTimer.start()
+
+        if tracer.enabled:
+            try:
+                tracer.start(os.path.join(path, f"trace-{timestamp}.json"))
+            except Exception as exc:
+                logger.exception(exc)
+
         meas = self.view.meas_worker
         meas.setSensors(dashboard.sensors())
         meas.setUseShuntBox(dashboard.controlsWidget.isShuntBoxEnabled())
@@ -235,20 +351,129 @@ class Controller:
             "dmm.trigger.delay_auto": dashboard.controlsWidget.dmmWidget.triggerDelayAuto(),
             "dmm.trigger.delay": dashboard.controlsWidget.dmmWidget.triggerDelay(),
         })
+        settings = QtCore.QSettings()
+        meas.params.update({
+            "output.compression": settings.value("output/compression", "", str),
+            "output.chunk_interval": settings.value("output/chunkInterval", 3600, int),
+            "output.rotate_size": settings.value("output/rotateSize", 0, int) * 1000 * 1000,
+            "output.rotate_interval": settings.value("output/rotateInterval", 0, int) * 3600,
+            "output.database": settings.value("output/database", "", str) if settings.value("output/databaseEnabled", False, bool) else "",
+            "normalize.reference_temperature": settings.value("normalization/referenceTemperature", DefaultReferenceTemperature, float),
+            "normalize.band_gap": settings.value("normalization/bandGap", DefaultBandGap, float),
+        })
+        meas.params.update({
+            "ramp.adaptive": settings.value("ramp/adaptive", False, bool),
+            "ramp.max_step": settings.value("ramp/maxStep", AdaptiveRamp.DefaultMaxStep, float),
+            "ramp.max_slew_rate": settings.value("ramp/maxSlewRate", AdaptiveRamp.DefaultMaxSlewRate, float),
+            "ramp.tolerance": settings.value("ramp/tolerance", AdaptiveRamp.DefaultTolerance, float),
+            "ramp.hardware_sweep": settings.value("ramp/hardwareSweep", False, bool),
+            "ramp.down_step": settings.value("ramp/downStep", DefaultRampDownStep, float),
+            "ramp.down_slew_rate": settings.value("ramp/downSlewRate", DefaultRampDownSlewRate, float),
+        })
+        meas.params.update({
+            "settle.enabled": settings.value("settle/enabled", False, bool),
+            "settle.threshold": settings.value("settle/threshold", DefaultSettleThreshold, float),
+            "settle.window": settings.value("settle/window", DefaultSettleWindow, int),
+            "settle.interval": settings.value("settle/interval", DefaultSettleInterval, float),
+        })
+        meas.params.update({
+            "it.adaptive": settings.value("sampling/adaptive", False, bool),
+            "it.max_interval": settings.value("sampling/maxInterval", AdaptiveInterval.DefaultMaxInterval, float),
+            "it.tolerance": settings.value("sampling/tolerance", AdaptiveInterval.DefaultTolerance, float),
+            "it.temperature_tolerance": settings.value("sampling/temperatureTolerance", AdaptiveInterval.DefaultTemperatureTolerance, float),
+        })
+        meas.params.update({
+            "anomaly.enabled": settings.value("anomaly/enabled", True, bool),
+            "anomaly.window": settings.value("anomaly/window", AnomalyDetector.DefaultWindow, int),
+            "anomaly.spike_threshold": settings.value("anomaly/spikeThreshold", AnomalyDetector.DefaultSpikeThreshold, float),
+            "anomaly.step_threshold": settings.value("anomaly/stepThreshold", AnomalyDetector.DefaultStepThreshold, float),
+        })
+        meas.params.update({
+            "breakdown.enabled": settings.value("breakdown/enabled", False, bool),
+            "breakdown.slope": settings.value("breakdown/slope", BreakdownDetector.DefaultSlope, float),
+            "breakdown.curvature": settings.value("breakdown/curvature", BreakdownDetector.DefaultCurvature, float),
+            "breakdown.jump": settings.value("breakdown/jump", BreakdownDetector.DefaultJump, float),
+            "breakdown.min_current": settings.value("breakdown/minCurrent", BreakdownDetector.DefaultMinCurrent, float),
+            "breakdown.confirm": settings.value("breakdown/confirm", BreakdownDetector.DefaultConfirm, int),
+            "breakdown.stop_ramp": settings.value("breakdown/stopRamp", False, bool),
+        })
         meas.setPath(path)
         meas.setOperator(dashboard.controlsWidget.operator())
+        meas.setResumeJournal(journal)
+        if journal is not None:
+            # Continue with settings of interrupted run
+            meas.params.update(journal.state.get("params", {}))
+            meas.setOperator(journal.state.get("operator", ""))
 
         self.view.meas_thread = threading.Thread(target=self.view.meas_worker)
         self.view.meas_thread.start()
 
+    def onResume(self):
+        """Resume most recent interrupted run in current output path."""
+        dashboard = self.view.dashboard
+        path = dashboard.controlsWidget.path()
+        journal = find_resumable(path)
+        if journal is None:
+            QtWidgets.QMessageBox.information(
+                self.view, "Resume", f"No interrupted measurement found in {path}."
+            )
+            return
+        state = journal.state
+        sensors = ", ".join(item.get("name", "") for item in state.get("sensors", []) if item.get("enabled"))
+        updated = datetime.datetime.fromtimestamp(state.get("updated", 0)).strftime("%Y-%m-%d %H:%M:%S")
+        result = QtWidgets.QMessageBox.question(
+            self.view,
+            "Resume",
+            f"Resume measurement {journal.path}?\n\n"
+            f"Operator: {state.get('operator')}\n"
+            f"Bias voltage: {state.get('biasVoltage')} V\n"
+            f"Sensors: {sensors}\n"
+            f"Last update: {updated}\n\n"
+            "The SMU output must still be ON at bias voltage.",
+        )
+        if result != QtWidgets.QMessageBox.Yes:
+            return
+        self.applyJournal(journal)
+        self.resumeJournal = journal
+        dashboard.controlsWidget.onStart()
+
+    def applyJournal(self, journal: Journal) -> None:
+        """Restore controls and sensors from run state journal."""
+        state = journal.state
+        controls = self.view.dashboard.controlsWidget
+        controls.setShuntBoxEnabled(state.get("useShuntBox", True))
+        controls.setBiasVoltage(state.get("biasVoltage", controls.biasVoltage()))
+        controls.setTotalCompliance(state.get("totalCompliance", controls.totalCompliance()))
+        controls.setSingleCompliance(state.get("singleCompliance", controls.singleCompliance()))
+        controls.setContinueInCompliance(state.get("continueInCompliance", controls.continueInCompliance()))
+        controls.setItDuration(state.get("itDuration", controls.itDuration()))
+        controls.setItInterval(state.get("itInterval", controls.itInterval()))
+        items = {item.get("index"): item for item in state.get("sensors", [])}
+        for sensor in self.view.dashboard.sensors():
+            item = items.get(sensor.index)
+            if item is not None:
+                sensor.enabled = item.get("enabled", False)
+                sensor.name = item.get("name", sensor.name)
+                sensor.resistivity = item.get("resistivity", sensor.resistivity)
+                sensor.temperature_offset = item.get("temperature_offset", sensor.temperature_offset)
+        self.view.dashboard.sensorsWidget.dataChanged()
+
     def onStopRequest(self):
         self.view.importCalibAction.setEnabled(False)
         self.view.preferencesAction.setEnabled(False)
         self.view.startAction.setEnabled(False)
+        self.view.resumeAction.setEnabled(False)
         self.view.stopAction.setEnabled(False)
 
     def onHalted(self):
+        if self.memoryProfiler is not None and self.memoryProfiler.is_active():
+            self.memoryTimer.stop()
+            self.memoryProfiler.sample()
+            self.memoryProfiler.stop()
+        if tracer.is_active():
+            tracer.stop()
         self.view.importCalibAction.setEnabled(True)
         self.view.preferencesAction.setEnabled(True)
         self.view.startAction.setEnabled(True)
+        self.view.resumeAction.setEnabled(True)
         self.view.stopAction.setEnabled(False)
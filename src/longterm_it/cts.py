@@ -0,0 +1,236 @@
+"""Batched CTS climate chamber polling.
+
+The ITC controller answers every command with a fixed size reply over a
+slow serial-over-TCP link. All commands of a poll are written back to
+back and the concatenated replies are read at once, so a poll costs one
+round trip instead of one per value. Fields missing from a batched reply
+are queried command by command, controllers failing to answer a batch are
+queried command by command from then on. Polls are scheduled at a fixed rate
+independent of the query duration, every field keeps the time of its
+last valid reply so stale values can be told apart.
+
+The latest reading is shared with the measurement through a snapshot
+replaced as a whole, readers never wait for the poller or the GUI.
+"""
+
+import logging
+import math
+import types
+from typing import Callable, Mapping, Optional
+
+from .clock import Clock
+
+__all__ = ["ItcQueries", "EnvironPoller", "EnvironSnapshot", "query_batch", "query_single", "parse_field", "status_text"]
+
+logger = logging.getLogger(__name__)
+
+ItcQueries: tuple[tuple[str, str, int], ...] = (
+    ("temp", "A0", 14),
+    ("humid", "A1", 14),
+    ("running", "S", 10),
+    ("pause", "O", 14),
+    ("program", "P", 4),
+)
+"""Field name, ITC command and reply size in bytes."""
+
+
+def query_batch(resource, queries=ItcQueries) -> dict[str, str]:
+    """Write all commands back to back and read the fixed size replies in a
+    single read. Returns replies by field name, replies not echoing their
+    command are omitted. If the read fails, late bytes are discarded by
+    clearing the resource before the error is raised."""
+    for _, command, _ in queries:
+        resource.write(command)
+    try:
+        data = decode(resource.read_bytes(sum(size for _, _, size in queries)))
+    except Exception:
+        resource.clear()
+        raise
+    replies = {}
+    offset = 0
+    for name, command, size in queries:
+        reply = data[offset:offset + size]
+        offset += size
+        if is_reply(reply, command, size):
+            replies[name] = reply
+    return replies
+
+
+def query_single(resource, queries=ItcQueries) -> dict[str, str]:
+    """Query commands one by one, returns replies by field name. Replies
+    not echoing their command are omitted."""
+    replies = {}
+    for name, command, size in queries:
+        resource.write(command)
+        reply = decode(resource.read_bytes(size))
+        if is_reply(reply, command, size):
+            replies[name] = reply
+    return replies
+
+
+def decode(data) -> str:
+    if isinstance(data, bytes):
+        return data.decode(errors="replace")
+    return data
+
+
+def is_reply(reply: str, command: str, size: int) -> bool:
+    return len(reply) == size and reply.startswith(command)
+
+
+def parse_field(name: str, reply: str):
+    """Returns value of field parsed from its ITC reply, raises ValueError
+    on malformed replies."""
+    if name in ("temp", "humid"):
+        return float(reply[3:8])  # actual value, followed by target value
+    if name == "running":
+        return parse_flag(reply, 1)
+    if name == "pause":
+        return parse_flag(reply, 3)
+    if name == "program":
+        return int(reply[1:4])
+    raise ValueError(f"no such field: {name!r}")
+
+
+def parse_flag(reply: str, index: int) -> bool:
+    flag = reply[index:index + 1]
+    if flag not in ("0", "1"):
+        raise ValueError(f"invalid flag: {reply!r}")
+    return flag == "1"
+
+
+def status_text(running: Optional[bool], pause: Optional[bool]) -> str:
+    if pause:
+        return "PAUSE"
+    if running is None:
+        return "N/A"
+    return "ON" if running else "OFF"
+
+
+class EnvironPoller:
+    """Fixed rate CTS poller keeping the last value and update time of every
+    field.
+
+    >>> poller = EnvironPoller(clock, interval=5.0)
+    >>> while running:
+    ...     poller.poll(resource)
+    ...     publish(poller.reading())
+    ...     poller.wait()
+    """
+
+    DefaultInterval: float = 5.0
+
+    def __init__(self, clock: Clock, interval: float = DefaultInterval, queries=ItcQueries) -> None:
+        self.clock: Clock = clock
+        self.interval: float = interval
+        self.queries = queries
+        self.values: dict = {}
+        self.updated: dict[str, float] = {}
+        self.errors: dict[str, str] = {}
+        self.deadline: Optional[float] = None
+        self.batch: bool = True
+
+    def poll(self, resource) -> None:
+        """Query all fields, fields with missing or malformed replies keep
+        their previous value and update time."""
+        if self.deadline is None:
+            self.deadline = self.clock.monotonic()
+        replies = self.query(resource)
+        now = self.clock.time()
+        self.errors.clear()
+        for name, command, _ in self.queries:
+            reply = replies.get(name)
+            try:
+                if reply is None:
+                    raise ValueError(f"no reply to {command!r}")
+                self.values[name] = parse_field(name, reply)
+            except ValueError as exc:
+                self.errors[name] = format(exc)
+            else:
+                self.updated[name] = now
+
+    def query(self, resource) -> dict[str, str]:
+        """Query fields batched while the controller answers batches,
+        missing fields are queried one by one."""
+        if not self.batch:
+            return query_single(resource, self.queries)
+        try:
+            replies = query_batch(resource, self.queries)
+        except Exception as exc:
+            logger.warning("CTS batched query failed, querying commands one by one: %s", exc)
+            self.batch = False
+            return query_single(resource, self.queries)
+        missing = [query for query in self.queries if query[0] not in replies]
+        if missing:
+            resource.clear()
+            replies.update(query_single(resource, missing))
+        return replies
+
+    def age(self) -> dict[str, float]:
+        """Returns seconds since last valid reply per field, NaN if never
+        updated."""
+        now = self.clock.time()
+        return {name: now - self.updated[name] if name in self.updated else math.nan for name, _, _ in self.queries}
+
+    def reading(self) -> dict:
+        return {
+            "time": self.clock.time(),
+            "temp": self.values.get("temp", math.nan),
+            "humid": self.values.get("humid", math.nan),
+            "running": self.values.get("running", False),
+            "status": status_text(self.values.get("running"), self.values.get("pause")),
+            "program": self.values.get("program", 0),
+            "age": self.age(),
+        }
+
+    def wait(self, abort: Callable[[], bool] = lambda: False) -> None:
+        """Sleep until the next poll is due, the query duration does not
+        delay the schedule. Overruns skip missed polls instead of bursting."""
+        if self.deadline is None:
+            self.deadline = self.clock.monotonic()
+        self.deadline += self.interval
+        now = self.clock.monotonic()
+        if self.deadline < now:
+            self.deadline += math.ceil((now - self.deadline) / self.interval) * self.interval
+        while not abort():
+            remaining = self.deadline - self.clock.monotonic()
+            if remaining <= 0:
+                break
+            self.clock.sleep(min(remaining, 1.0))
+
+
+class EnvironSnapshot:
+    """Latest CTS reading shared between threads without locking.
+
+    Every update replaces the read-only reading by a single reference
+    assignment, which is atomic in CPython, so a reader always gets a
+    complete reading of one poll.
+
+    >>> snapshot = EnvironSnapshot()
+    >>> snapshot.update(poller.reading())  # environment thread
+    >>> reading = snapshot.read()  # measurement thread
+    >>> snapshot.age(reading, clock.time())
+    """
+
+    def __init__(self) -> None:
+        self._reading: Mapping = types.MappingProxyType({})
+
+    def update(self, reading: dict) -> None:
+        self._reading = types.MappingProxyType(dict(reading))
+
+    def clear(self) -> None:
+        self._reading = types.MappingProxyType({})
+
+    def read(self) -> Mapping:
+        return self._reading
+
+    @staticmethod
+    def age(reading: Mapping, now: float) -> float:
+        """Returns seconds since the oldest field of `reading` was valid,
+        NaN for empty readings or fields never updated."""
+        if "time" not in reading:
+            return math.nan
+        ages = list(reading.get("age", {}).values())
+        if any(math.isnan(age) for age in ages):
+            return math.nan
+        return now - reading["time"] + max(ages, default=0.0)
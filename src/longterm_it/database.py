@@ -0,0 +1,286 @@
+"""Optional SQLite store for runs, sensors, calibration and It samples."""
+
+import sqlite3
+import time
+from typing import Callable, Iterable, Optional, Union
+
+from . import __version__
+from .sensor import Sensor
+
+__all__ = ["DatabaseWriter", "RunDatabase", "SampleColumns"]
+
+Schema: str = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    started REAL NOT NULL,
+    finished REAL,
+    operator TEXT,
+    voltage REAL,
+    path TEXT,
+    version TEXT
+);
+CREATE TABLE IF NOT EXISTS sensors (
+    id INTEGER PRIMARY KEY,
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    channel INTEGER NOT NULL,
+    name TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS calibration (
+    sensor_id INTEGER PRIMARY KEY REFERENCES sensors(id),
+    resistivity REAL,
+    temperature_offset REAL
+);
+CREATE TABLE IF NOT EXISTS samples (
+    sensor_id INTEGER NOT NULL REFERENCES sensors(id),
+    time REAL NOT NULL,
+    voltage REAL,
+    current REAL,
+    smu_current REAL,
+    pt100 REAL,
+    cts_temperature REAL,
+    cts_humidity REAL,
+    hv INTEGER
+);
+CREATE INDEX IF NOT EXISTS samples_sensor_time ON samples(sensor_id, time);
+CREATE INDEX IF NOT EXISTS sensors_name ON sensors(name);
+CREATE INDEX IF NOT EXISTS runs_started ON runs(started);
+"""
+
+SampleColumns: tuple[str, ...] = (
+    "time",
+    "voltage",
+    "current",
+    "smu_current",
+    "pt100",
+    "cts_temperature",
+    "cts_humidity",
+    "hv",
+)
+"""Sample columns returned by `RunDatabase.samples`."""
+
+
+def connect(filename: str) -> sqlite3.Connection:
+    connection = sqlite3.connect(filename)
+    connection.execute("PRAGMA journal_mode=WAL")  # concurrent readers
+    connection.executescript(Schema)
+    return connection
+
+
+class DatabaseWriter:
+    """Writes run, sensors, calibration and samples of an It measurement.
+
+    Samples are buffered and inserted in a single transaction once
+    `batch_size` rows are pending or `batch_interval` seconds passed.
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        batch_size: int = 1000,
+        batch_interval: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.filename: str = filename
+        self.batch_size: int = batch_size
+        self.batch_interval: float = batch_interval
+        self.clock: Callable[[], float] = clock
+        self.connection: sqlite3.Connection = connect(filename)
+        self.run_id: Optional[int] = None
+        self.sensor_ids: dict[int, int] = {}
+        self._pending: list[tuple] = []
+        self._committed: float = clock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        self.close()
+        return False
+
+    def begin_run(self, started: float, operator: str, voltage: float, path: str, sensors: Iterable[Sensor]) -> int:
+        with self.connection:
+            cursor = self.connection.execute(
+                "INSERT INTO runs (started, operator, voltage, path, version) VALUES (?, ?, ?, ?, ?)",
+                (started, operator, voltage, path, __version__),
+            )
+            self.run_id = cursor.lastrowid
+            self.sensor_ids = {}
+            for sensor in sensors:
+                cursor = self.connection.execute(
+                    "INSERT INTO sensors (run_id, channel, name) VALUES (?, ?, ?)",
+                    (self.run_id, sensor.index, sensor.name),
+                )
+                self.sensor_ids[sensor.index] = cursor.lastrowid  # type: ignore
+                self.connection.execute(
+                    "INSERT INTO calibration (sensor_id, resistivity, temperature_offset) VALUES (?, ?, ?)",
+                    (cursor.lastrowid, sensor.resistivity, sensor.temperature_offset),
+                )
+        self._committed = self.clock()
+        return self.run_id  # type: ignore
+
+    def resume_run(self, run_id: int) -> None:
+        """Continue writing samples of an interrupted run."""
+        rows = self.connection.execute("SELECT channel, id FROM sensors WHERE run_id = ?", (run_id,))
+        self.sensor_ids = {channel: sensor_id for channel, sensor_id in rows}
+        if not self.sensor_ids:
+            raise ValueError(f"no such run in database: {run_id}")
+        self.run_id = run_id
+        with self.connection:
+            self.connection.execute("UPDATE runs SET finished = NULL WHERE id = ?", (run_id,))
+        self._committed = self.clock()
+
+    def write_sample(
+        self,
+        *,
+        timestamp: float,
+        voltage: float,
+        smu_current: float,
+        cts_temperature: float,
+        cts_humidity: float,
+        channels: dict,
+    ) -> None:
+        """Buffer samples of a scan, `channels` maps sensor index to
+        dictionary containing current `I`, PT100 temperature `temp` and HV
+        status `hv`."""
+        for index, channel in channels.items():
+            sensor_id = self.sensor_ids.get(index)
+            if sensor_id is None:
+                continue
+            hv = channel.get("hv")
+            self._pending.append((
+                sensor_id,
+                timestamp,
+                voltage,
+                channel.get("I"),
+                smu_current,
+                channel.get("temp"),
+                cts_temperature,
+                cts_humidity,
+                None if hv is None else int(hv),
+            ))
+        if len(self._pending) >= self.batch_size or self.clock() - self._committed >= self.batch_interval:
+            self.commit()
+
+    def commit(self) -> None:
+        """Insert pending samples in a single transaction."""
+        if self._pending:
+            with self.connection:
+                self.connection.executemany(
+                    "INSERT INTO samples VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    self._pending,
+                )
+            self._pending.clear()
+        self._committed = self.clock()
+
+    def end_run(self, finished: float) -> None:
+        self.commit()
+        if self.run_id is not None:
+            with self.connection:
+                self.connection.execute("UPDATE runs SET finished = ? WHERE id = ?", (finished, self.run_id))
+
+    def close(self) -> None:
+        try:
+            self.commit()
+        finally:
+            self.connection.close()
+
+
+class RunDatabase:
+    """Query API for the run database.
+
+    >>> db = RunDatabase("longterm.sqlite")
+    >>> runs = db.runs(sensor="HPK_01", since=1.7e9)
+    >>> data = db.samples("HPK_01", start=1.7e9, end=1.7e9 + 86400)
+    >>> data["current"].mean()
+    """
+
+    def __init__(self, filename: str) -> None:
+        self.connection: sqlite3.Connection = connect(filename)
+        self.connection.row_factory = sqlite3.Row
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        self.close()
+        return False
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def runs(
+        self,
+        sensor: Optional[str] = None,
+        operator: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        voltage: Optional[float] = None,
+    ) -> list[dict]:
+        """Returns runs matching all given filters, ordered by start time."""
+        conditions = []
+        params: list = []
+        if sensor is not None:
+            conditions.append("id IN (SELECT run_id FROM sensors WHERE name = ?)")
+            params.append(sensor)
+        if operator is not None:
+            conditions.append("operator = ?")
+            params.append(operator)
+        if since is not None:
+            conditions.append("started >= ?")
+            params.append(since)
+        if until is not None:
+            conditions.append("started < ?")
+            params.append(until)
+        if voltage is not None:
+            conditions.append("voltage = ?")
+            params.append(voltage)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        rows = self.connection.execute(f"SELECT * FROM runs{where} ORDER BY started", params)
+        return [dict(row) for row in rows]
+
+    def sensors(self, run_id: int) -> list[dict]:
+        """Returns sensors of run including calibration."""
+        rows = self.connection.execute(
+            "SELECT sensors.*, calibration.resistivity, calibration.temperature_offset "
+            "FROM sensors LEFT JOIN calibration ON calibration.sensor_id = sensors.id "
+            "WHERE sensors.run_id = ? ORDER BY sensors.channel",
+            (run_id,),
+        )
+        return [dict(row) for row in rows]
+
+    def samples(
+        self,
+        sensor: Union[str, int],
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        run_id: Optional[int] = None,
+    ) -> dict:
+        """Returns samples of sensor (name or sensor id) in time range
+        [start, end) as dictionary of NumPy arrays, see `SampleColumns`.
+        Missing values (e.g. unknown HV status) are NaN.
+        """
+        import numpy as np
+
+        if isinstance(sensor, int):
+            sensor_ids = [sensor]
+        else:
+            query = "SELECT id FROM sensors WHERE name = ?"
+            params: list = [sensor]
+            if run_id is not None:
+                query += " AND run_id = ?"
+                params.append(run_id)
+            sensor_ids = [row[0] for row in self.connection.execute(query, params)]
+        rows: list = []
+        for sensor_id in sensor_ids:
+            query = f"SELECT {', '.join(SampleColumns)} FROM samples WHERE sensor_id = ?"
+            params = [sensor_id]
+            if start is not None:
+                query += " AND time >= ?"
+                params.append(start)
+            if end is not None:
+                query += " AND time < ?"
+                params.append(end)
+            rows.extend(self.connection.execute(query, params))
+        array = np.array([tuple(row) for row in rows], dtype=float).reshape(-1, len(SampleColumns))
+        array = array[np.argsort(array[:, 0], kind="stable")]
+        return {name: array[:, index] for index, name in enumerate(SampleColumns)}
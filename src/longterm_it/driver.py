@@ -3,6 +3,8 @@ from typing import Optional
 from comet.driver import Driver
 from comet.driver.generic import InstrumentError, ErrorQueueMixin
 
+from .relays import RelaysMixin
+
 
 def parse_error(response: str) -> tuple[int, str]:
     code, message = [token.strip() for token in response.split(",")][:2]
@@ -21,7 +23,7 @@ class K2700(ErrorQueueMixin, Driver):
         return self.resource.query(message).strip()
 
 
-class ShuntBox(Driver):
+class ShuntBox(RelaysMixin, Driver):
     """HEPHY shunt box providing 10 channels of high voltage relays and PT100
     temperature sensors.
     """
@@ -45,18 +47,3 @@ class ShuntBox(Driver):
         channels return a float of special value NaN."""
         result = self.resource.query("GET:TEMP ALL").strip()
         return [float(value) for value in result.split(",") if value.strip()][:type(self).CHANNELS] # avoid trailing commas
-
-    def set_relay(self, index: int, enabled: bool) -> None:
-        """Enable or disable a single channel relais."""
-        if not 0 < index <= ShuntBox.CHANNELS:
-            raise ValueError(f"invalid channel index: {index}")
-        mode = "ON" if enabled else "OFF"
-        result = self.resource.query(f"SET:REL_{mode} {index:d}").strip()
-        if result != "OK":
-            raise RuntimeError(f"returned unexpected value: {result!r}")
-
-    def set_all_relays(self, enabled: bool) -> None:
-        """Enable or disable all relays."""
-        result = self.resource.query("SET:REL_{} ALL".format("ON" if enabled else "OFF")).strip()
-        if result != "OK":
-            raise RuntimeError(f"returned unexpected value: {result!r}")
@@ -0,0 +1,128 @@
+import csv
+import os
+import re
+from typing import Iterator, Optional
+
+from .archive import open_text
+from .normalize import DefaultBandGap, DefaultReferenceTemperature
+from .sensor import Sensor
+from .writers import HVStatus, ItWriter
+
+__all__ = ["RunReader", "export_sensor_files"]
+
+
+class RunReader:
+    """Reader for combined It run files written by `RunWriter`.
+
+    >>> with open("it-2024-01-01T00-00-00.txt", newline="") as fp:
+    ...     reader = RunReader(fp)
+    ...     for row in reader:
+    ...         print(row["timestamp [s]"])
+    """
+
+    def __init__(self, fp) -> None:
+        self.reader = csv.reader(fp)
+        self.meta: dict[str, str] = {}
+        self.sensors: list[Sensor] = []
+        self.version: str = ""
+        self._read_meta()
+        self.header: list[str] = next(self.reader, [])
+
+    def _read_meta(self) -> None:
+        for row in self.reader:
+            if not row:
+                break
+            line = row[0]
+            if line.startswith("HEPHY"):
+                self.version = line.split()[-1]
+                continue
+            key, _, value = line.partition(": ")
+            if key == "sensor channel":
+                self.sensors.append(Sensor(int(value)))
+            elif key == "sensor name" and self.sensors:
+                self.sensors[-1].name = value
+            elif key == "calibration [Ohm]" and self.sensors:
+                self.sensors[-1].resistivity = float(value)
+            else:
+                self.meta[key] = value
+
+    def operator(self) -> str:
+        return self.meta.get("operator", "")
+
+    def timestamp(self) -> str:
+        return self.meta.get("datetime", "")
+
+    def voltage(self) -> float:
+        return float(self.meta.get("Voltage [V]", "nan"))
+
+    def reference_temperature(self) -> float:
+        return float(self.meta.get("reference temperature [°C]", DefaultReferenceTemperature))
+
+    def band_gap(self) -> float:
+        return float(self.meta.get("band gap [eV]", DefaultBandGap))
+
+    def __iter__(self) -> Iterator[dict[str, str]]:
+        for row in self.reader:
+            if row:
+                yield dict(zip(self.header, row))
+
+
+def parse_hv_status(value: str) -> Optional[bool]:
+    for status, text in HVStatus.items():
+        if value == text:
+            return status
+    return None
+
+
+def export_sensor_files(filename: str, path: Optional[str] = None) -> list[str]:
+    """Export per sensor It files from combined (optionally compressed) run
+    file, returns list of written filenames. Files are written to `path` or
+    next to the run file.
+    """
+    if path is None:
+        path = os.path.dirname(filename)
+    basename = os.path.basename(filename)
+    match = re.match(r"^it-(.+)\.txt(?:\.gz|\.zst)?$", basename)
+    suffix = match.group(1) if match else os.path.splitext(basename)[0]
+    with open_text(filename) as fp:
+        reader = RunReader(fp)
+        filenames = []
+        files = []
+        writers = {}
+        try:
+            for sensor in reader.sensors:
+                output = os.path.join(path, f"it-{sensor.name}-{suffix}.txt")
+                f = open(output, "w", newline="")
+                files.append(f)
+                writer = ItWriter(f)
+                writer.write_meta(
+                    sensor,
+                    reader.operator(),
+                    reader.timestamp(),
+                    reader.voltage(),
+                    reader.reference_temperature(),
+                    reader.band_gap(),
+                )
+                writer.write_header()
+                writers[sensor.index] = writer
+                filenames.append(output)
+            for row in reader:
+                for sensor in reader.sensors:
+                    writers[sensor.index].write_row(
+                        timestamp=float(row["timestamp [s]"]),
+                        voltage=float(row["voltage [V]"]),
+                        current=float(row[f"current_{sensor.index} [A]"]),
+                        smu_current=float(row["smu_current [A]"]),
+                        pt100=float(row[f"pt100_{sensor.index} [°C]"]),
+                        cts_temperature=float(row["cts_temperature [°C]"]),
+                        cts_humidity=float(row["cts_humidity [%rH]"]),
+                        cts_status=row["cts_status"],  # type: ignore
+                        cts_program=row["cts_program"],  # type: ignore
+                        cts_age=float(row.get("cts_age [s]", "nan")),
+                        hv_status=parse_hv_status(row[f"hv_status_{sensor.index}"]),  # type: ignore
+                        current_norm=float(row.get(f"current_norm_{sensor.index} [A]", "nan")),
+                    )
+        finally:
+            for f in files:
+                f.close()
+    return filenames
@@ -0,0 +1,220 @@
+import collections
+import json
+import logging
+import math
+import os
+import socket
+import struct
+import threading
+import time
+from typing import Any, Optional
+
+try:
+    import msgpack  # type: ignore
+except ImportError:
+    msgpack = None
+
+__all__ = ["Feed", "parse_address", "encode_frame", "decode_frame"]
+
+logger = logging.getLogger(__name__)
+
+FrameHeader = struct.Struct(">I")
+"""Frame header, payload length as 32 bit unsigned big endian integer."""
+
+
+def parse_address(address: str) -> tuple[int, Any]:
+    """Returns socket family and address from address string.
+
+    >>> parse_address("localhost:10010")
+    (<AddressFamily.AF_INET: 2>, ('localhost', 10010))
+    >>> parse_address("unix:/tmp/longterm.sock")
+    (<AddressFamily.AF_UNIX: 1>, '/tmp/longterm.sock')
+    """
+    if address.startswith("unix:"):
+        if not hasattr(socket, "AF_UNIX"):
+            raise ValueError(f"unix sockets not supported on this platform: {address!r}")
+        return socket.AF_UNIX, address[len("unix:"):]
+    host, _, port = address.rpartition(":")
+    return socket.AF_INET, (host or "localhost", int(port))
+
+
+def replace_nan(value: Any) -> Any:
+    """Returns copy of value with NaN and infinite floats replaced by None,
+    which are not valid JSON.
+
+    >>> replace_nan({"I": float("nan"), "U": [1.0, float("inf")]})
+    {'I': None, 'U': [1.0, None]}
+    """
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {key: replace_nan(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [replace_nan(item) for item in value]
+    return value
+
+
+def encode_frame(message: dict, format: str = "json") -> bytes:
+    """Returns length prefixed frame for message. JSON frames encode NaN as
+    null."""
+    if format == "msgpack":
+        if msgpack is None:
+            raise RuntimeError("msgpack format requires package 'msgpack'")
+        payload = msgpack.packb(message)
+    else:
+        payload = json.dumps(replace_nan(message), allow_nan=False).encode()
+    return FrameHeader.pack(len(payload)) + payload
+
+
+def decode_frame(payload: bytes, format: str = "json") -> dict:
+    """Returns message from frame payload (without length prefix)."""
+    if format == "msgpack":
+        if msgpack is None:
+            raise RuntimeError("msgpack format requires package 'msgpack'")
+        return msgpack.unpackb(payload, strict_map_key=False)  # integer channel keys
+    return json.loads(payload.decode())
+
+
+class Subscriber:
+    """Connected feed client with bounded send queue.
+
+    If the client can not keep up, oldest frames are dropped so publishing
+    never blocks the acquisition.
+    """
+
+    def __init__(self, connection: socket.socket, address: Any, backlog: int) -> None:
+        self.connection = connection
+        self.address = address
+        self.dropped: int = 0
+        self._frames: collections.deque = collections.deque(maxlen=backlog)
+        self._condition = threading.Condition()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def put(self, frame: bytes) -> None:
+        with self._condition:
+            if len(self._frames) == self._frames.maxlen:
+                self.dropped += 1
+            self._frames.append(frame)
+            self._condition.notify()
+
+    def close(self) -> None:
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+
+    def is_closed(self) -> bool:
+        return self._closed
+
+    def _run(self) -> None:
+        try:
+            while True:
+                with self._condition:
+                    while not self._frames and not self._closed:
+                        self._condition.wait()
+                    if self._closed:
+                        break
+                    frame = self._frames.popleft()
+                self.connection.sendall(frame)
+        except OSError as exc:
+            logger.info("feed subscriber %s disconnected: %s", self.address, exc)
+        finally:
+            self._closed = True
+            self.connection.close()
+            if self.dropped:
+                logger.warning("feed subscriber %s dropped %d frames", self.address, self.dropped)
+
+
+class Feed:
+    """Publishes readings and state changes to local socket subscribers as
+    length prefixed JSON or msgpack frames.
+
+    Late joiners receive the last `replay` readings and the latest state.
+    """
+
+    ReplayTopics: tuple[str, ...] = ("iv", "it", "cts")
+
+    def __init__(self, address: str, replay: int = 100, backlog: int = 1000, format: str = "json") -> None:
+        if format not in ("json", "msgpack"):
+            raise ValueError(f"invalid feed format: {format!r}")
+        if format == "msgpack" and msgpack is None:
+            raise RuntimeError("msgpack format requires package 'msgpack'")
+        self.family, self.address = parse_address(address)
+        self.format: str = format
+        self.backlog: int = backlog
+        self._replay: collections.deque = collections.deque(maxlen=replay)
+        self._state: Optional[bytes] = None
+        self._subscribers: list[Subscriber] = []
+        self._lock = threading.RLock()
+        self._server: Optional[socket.socket] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def bound_address(self) -> Any:
+        """Returns address the server socket is bound to."""
+        if self._server is None:
+            return None
+        return self._server.getsockname()
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len([subscriber for subscriber in self._subscribers if not subscriber.is_closed()])
+
+    def start(self) -> None:
+        if self.family == getattr(socket, "AF_UNIX", None) and os.path.exists(self.address):
+            os.unlink(self.address)
+        server = socket.socket(self.family, socket.SOCK_STREAM)
+        if self.family == socket.AF_INET:
+            server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        server.bind(self.address)
+        server.listen()
+        self._server = server
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+        logger.info("feed serving on %s", self.bound_address())
+
+    def stop(self) -> None:
+        server, self._server = self._server, None
+        if server is not None:
+            try:
+                server.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                ...
+            server.close()
+        with self._lock:
+            for subscriber in self._subscribers:
+                subscriber.close()
+            self._subscribers.clear()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def publish(self, topic: str, data: Any) -> None:
+        """Publish message to all subscribers, never blocks."""
+        frame = encode_frame({"topic": topic, "time": time.time(), "data": data}, self.format)
+        with self._lock:
+            if topic in self.ReplayTopics:
+                self._replay.append(frame)
+            elif topic == "state":
+                self._state = frame
+            for subscriber in self._subscribers:
+                subscriber.put(frame)
+            self._subscribers = [subscriber for subscriber in self._subscribers if not subscriber.is_closed()]
+
+    def _serve(self) -> None:
+        while self._server is not None:
+            try:
+                connection, address = self._server.accept()
+            except OSError:
+                break
+            subscriber = Subscriber(connection, address, self.backlog)
+            with self._lock:
+                if self._state is not None:
+                    subscriber.put(self._state)
+                for frame in self._replay:
+                    subscriber.put(frame)
+                self._subscribers.append(subscriber)
+            subscriber.start()
+            logger.info("feed subscriber connected: %s", address)
@@ -63,26 +63,35 @@ class IVChart(Chart):
 
 
 class ItChart(Chart):
+    """It chart of raw or temperature normalized currents."""
 
-    def __init__(self, sensors: Iterable) -> None:
+    def __init__(self, sensors: Iterable, normalized: bool = False) -> None:
         super().__init__()
         self.legend().setAlignment(QtCore.Qt.AlignRight)
+        self.key: str = "I_norm" if normalized else "I"
 
         self.axisX = self.addDateTimeAxis(QtCore.Qt.AlignBottom)
         self.axisX.setTitleText("Time")
         self.axisX.setFormat(DateTimeFormat)
 
         self.axisY = self.addValueAxis(QtCore.Qt.AlignLeft)
-        self.axisY.setTitleText("Current uA")
+        self.axisY.setTitleText("Normalized Current uA" if normalized else "Current uA")
         self.axisY.setRange(0, 100)
 
         self.itSeries: dict = {}
         for sensor in sensors:
             series = self.addLineSeries(self.axisX, self.axisY)
             self.itSeries[sensor.index] = series
+
+        self.eventSeries = self.addScatterSeries(self.axisX, self.axisY)
+        self.eventSeries.setName("Events")
+        self.eventSeries.setColor(QtGui.QColor("#bb0000"))
+        self.eventSeries.setBorderColor(QtGui.QColor("#bb0000"))
+        self.eventSeries.setMarkerSize(8)
         self.load(sensors)
 
     def load(self, sensors: Iterable) -> None:
+        self.eventSeries.data().clear()
         for sensor in sensors:
             series = self.itSeries.get(sensor.index)
             if series is not None:
@@ -97,7 +106,10 @@ class ItChart(Chart):
         for channel in reading.get("channels", {}).values():
             series = self.itSeries.get(channel.get("index"))
             if series is not None:
-                series.data().append(ts, channel.get("I", math.nan) * 1000 * 1000)  # A to uA
+                series.data().append(ts, channel.get(self.key, math.nan) * 1000 * 1000)  # A to uA
+        for event in reading.get("events", []):
+            channel = reading.get("channels", {}).get(event.get("index"), {})
+            self.eventSeries.data().append(ts, channel.get(self.key, math.nan) * 1000 * 1000)  # A to uA
         if self.isZoomed():
             self.updateAxis(self.axisX, self.axisX.min(), self.axisX.max())
         else:
@@ -2,8 +2,9 @@ from typing import Optional
 
 from PyQt5 import QtCore, QtWidgets, QtChart
 
-from QCharted import ChartView
+from QCharted import ChartView, Chart
 
+from ..metrics import registry
 from .controlswidget import ControlsWidget
 from .sensorswidget import SensorsWidget, SensorManager
 from .statuswidget import StatusWidget
@@ -38,9 +39,15 @@ class DashboardWidget(QtWidgets.QWidget):
         itTabLayout = QtWidgets.QGridLayout(self.itTab)
         itTabLayout.addWidget(self.itChartView, 0, 0, 1, 1)
 
+        self.itNormTab = QtWidgets.QWidget()
+        self.itNormChartView = ChartView()
+        itNormTabLayout = QtWidgets.QGridLayout(self.itNormTab)
+        itNormTabLayout.addWidget(self.itNormChartView, 0, 0, 1, 1)
+
         self.topTabWidget = QtWidgets.QTabWidget(self)
         self.topTabWidget.addTab(self.ivTab, "IV Curve")
         self.topTabWidget.addTab(self.itTab, "It Curve")
+        self.topTabWidget.addTab(self.itNormTab, "It Curve (norm.)")
         self.topTabWidget.setCurrentIndex(0)
 
         self.ctsTab = QtWidgets.QWidget()
@@ -127,6 +134,8 @@ class DashboardWidget(QtWidgets.QWidget):
         self.ivChartView.setChart(self.ivChart)
         self.itChart = ItChart(self.sensors())
         self.itChartView.setChart(self.itChart)
+        self.itNormChart = ItChart(self.sensors(), normalized=True)
+        self.itNormChartView.setChart(self.itNormChart)
         self.ctsChart = CtsChart()
         self.ctsChartView.setChart(self.ctsChart)
         self.ivTempChart = IVTempChart(self.sensors())
@@ -177,6 +186,16 @@ class DashboardWidget(QtWidgets.QWidget):
         """Returns sensors manager."""
         return self.sensorsWidget.sensors
 
+    def appendChart(self, chart: Chart, reading: dict) -> None:
+        """Append reading to chart, measuring the update duration."""
+        histogram = registry.histogram(
+            "longterm_chart_update_duration_seconds",
+            "Chart append and axis update duration in seconds.",
+            {"chart": type(chart).__name__},
+        )
+        with histogram.time():
+            chart.append(reading)
+
     @QtCore.pyqtSlot()
     def onIvStarted(self) -> None:
         self.topTabWidget.setCurrentIndex(0)
@@ -193,11 +212,12 @@ class DashboardWidget(QtWidgets.QWidget):
             if sensor.enabled:
                 sensor.current = reading.get("channels", {})[sensor.index].get("I")
                 sensor.temperature = reading.get("channels", {})[sensor.index].get("temp")
+                sensor.current_norm = reading.get("channels", {})[sensor.index].get("I_norm")
         self.sensorsWidget.dataChanged()  # HACK keep updated
-        self.ivTempChart.append(reading)
-        self.shuntBoxChart.append(reading)
-        self.ivSourceChart.append(reading)
-        self.ivChart.append(reading)
+        self.appendChart(self.ivTempChart, reading)
+        self.appendChart(self.shuntBoxChart, reading)
+        self.appendChart(self.ivSourceChart, reading)
+        self.appendChart(self.ivChart, reading)
 
     @QtCore.pyqtSlot(dict)
     def onMeasItReading(self, reading: dict) -> None:
@@ -205,11 +225,19 @@ class DashboardWidget(QtWidgets.QWidget):
             if sensor.enabled:
                 sensor.current = reading.get("channels", {})[sensor.index].get("I")
                 sensor.temperature = reading.get("channels", {})[sensor.index].get("temp")
+                sensor.current_norm = reading.get("channels", {})[sensor.index].get("I_norm")
+                sensor.statistics = reading.get("statistics", {}).get(sensor.index)
+        for event in reading.get("events", []):
+            for sensor in self.sensors():
+                if sensor.index == event.get("index"):
+                    sensor.events += 1
+                    sensor.last_event = event
         self.sensorsWidget.dataChanged()  # HACK keep updated
-        self.itTempChart.append(reading)
-        self.shuntBoxChart.append(reading)
-        self.itSourceChart.append(reading)
-        self.itChart.append(reading)
+        self.appendChart(self.itTempChart, reading)
+        self.appendChart(self.shuntBoxChart, reading)
+        self.appendChart(self.itSourceChart, reading)
+        self.appendChart(self.itChart, reading)
+        self.appendChart(self.itNormChart, reading)
 
     @QtCore.pyqtSlot(dict)
     def onSmuReading(self, reading: dict) -> None:
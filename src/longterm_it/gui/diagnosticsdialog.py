@@ -0,0 +1,143 @@
+from typing import Optional
+
+from PyQt5 import QtCore, QtWidgets
+
+from ..memprofile import MemoryProfiler
+from ..metrics import Histogram, Registry, format_labels
+
+__all__ = ["DiagnosticsDialog"]
+
+
+class DiagnosticsDialog(QtWidgets.QDialog):
+    """Shows acquisition and I/O performance counters of a metrics registry
+    and memory profile samples, if a memory profiler is assigned."""
+
+    UpdateInterval: int = 1000
+
+    def __init__(self, registry: Registry, parent: Optional[QtWidgets.QWidget] = None) -> None:
+        super().__init__(parent)
+        self.setWindowTitle(self.tr("Diagnostics"))
+        self.resize(640, 420)
+
+        self.registry: Registry = registry
+        self.memoryProfiler: Optional[MemoryProfiler] = None
+        self.lastMemorySample: Optional[dict] = None
+
+        self.metricsTreeWidget = QtWidgets.QTreeWidget(self)
+        self.metricsTreeWidget.setHeaderLabels([
+            self.tr("Metric"),
+            self.tr("Labels"),
+            self.tr("Value"),
+            self.tr("Count"),
+            self.tr("Mean"),
+        ])
+        self.metricsTreeWidget.setAlternatingRowColors(True)
+        self.metricsTreeWidget.setRootIsDecorated(False)
+        self.metricsTreeWidget.setSortingEnabled(True)
+        self.metricsTreeWidget.sortByColumn(0, QtCore.Qt.AscendingOrder)
+
+        self.samplesTreeWidget = QtWidgets.QTreeWidget(self)
+        self.samplesTreeWidget.setAlternatingRowColors(True)
+        self.samplesTreeWidget.setRootIsDecorated(False)
+
+        self.growthTreeWidget = QtWidgets.QTreeWidget(self)
+        self.growthTreeWidget.setHeaderLabels([
+            self.tr("Module"),
+            self.tr("Growth"),
+            self.tr("Blocks"),
+        ])
+        self.growthTreeWidget.setAlternatingRowColors(True)
+        self.growthTreeWidget.setRootIsDecorated(False)
+
+        self.memorySplitter = QtWidgets.QSplitter(QtCore.Qt.Vertical, self)
+        self.memorySplitter.addWidget(self.samplesTreeWidget)
+        self.memorySplitter.addWidget(self.growthTreeWidget)
+
+        self.tabWidget = QtWidgets.QTabWidget(self)
+        self.tabWidget.addTab(self.metricsTreeWidget, self.tr("Metrics"))
+
+        self.buttonBox = QtWidgets.QDialogButtonBox(self)
+        self.buttonBox.setStandardButtons(QtWidgets.QDialogButtonBox.Close)
+        self.buttonBox.rejected.connect(self.hide)
+
+        layout = QtWidgets.QVBoxLayout(self)
+        layout.addWidget(self.tabWidget)
+        layout.addWidget(self.buttonBox)
+
+        self.updateTimer = QtCore.QTimer(self)
+        self.updateTimer.timeout.connect(self.updateMetrics)
+        self.updateTimer.setInterval(self.UpdateInterval)
+
+    def setMemoryProfiler(self, profiler: MemoryProfiler) -> None:
+        self.memoryProfiler = profiler
+        if self.tabWidget.indexOf(self.memorySplitter) < 0:
+            self.tabWidget.addTab(self.memorySplitter, self.tr("Memory"))
+
+    def showEvent(self, event) -> None:
+        self.updateMetrics()
+        self.updateTimer.start()
+        super().showEvent(event)
+
+    def hideEvent(self, event) -> None:
+        self.updateTimer.stop()
+        super().hideEvent(event)
+
+    @QtCore.pyqtSlot()
+    def updateMetrics(self) -> None:
+        items: dict = {}
+        for index in range(self.metricsTreeWidget.topLevelItemCount()):
+            item = self.metricsTreeWidget.topLevelItem(index)
+            items[(item.text(0), item.text(1))] = item
+        for metric in self.registry.metrics():
+            key = metric.name, format_labels(metric.labels)
+            item = items.get(key)
+            if item is None:
+                item = QtWidgets.QTreeWidgetItem(list(key))
+                for column in (2, 3, 4):
+                    item.setTextAlignment(column, QtCore.Qt.AlignRight)
+                self.metricsTreeWidget.addTopLevelItem(item)
+            if isinstance(metric, Histogram):
+                item.setText(2, format(metric.sum(), "G"))
+                item.setText(3, format(metric.count()))
+                item.setText(4, format(metric.mean(), "G"))
+            else:
+                item.setText(2, format(metric.value(), "G"))  # type: ignore
+        for column in range(2):
+            self.metricsTreeWidget.resizeColumnToContents(column)
+        self.updateMemory()
+
+    def updateMemory(self) -> None:
+        if self.memoryProfiler is None:
+            return
+        samples = list(self.memoryProfiler.samples)
+        counters = list(self.memoryProfiler.counters)
+        labels = [self.tr("Time"), self.tr("RSS MiB"), self.tr("Traced MiB")] + counters
+        if self.samplesTreeWidget.headerItem().columnCount() != len(labels):
+            self.samplesTreeWidget.setHeaderLabels(labels)
+        # Add samples following the last shown one, rebuild if it was
+        # rotated out of the bounded samples or cleared by a new run
+        index = next((index for index, sample in enumerate(samples) if sample is self.lastMemorySample), None)
+        if index is None:
+            self.samplesTreeWidget.clear()
+            index = -1
+        for sample in samples[index + 1:]:
+            values = [
+                QtCore.QDateTime.fromMSecsSinceEpoch(int(sample["time"] * 1e3)).toString("yyyy-MM-dd hh:mm:ss"),
+                format(sample["rss"] / 1024 ** 2, ".1f"),
+                format(sample["traced"] / 1024 ** 2, ".1f"),
+            ] + [format(sample["counters"].get(name, "")) for name in counters]
+            item = QtWidgets.QTreeWidgetItem(values)
+            for column in range(1, len(values)):
+                item.setTextAlignment(column, QtCore.Qt.AlignRight)
+            self.samplesTreeWidget.addTopLevelItem(item)
+        while self.samplesTreeWidget.topLevelItemCount() > len(samples):
+            self.samplesTreeWidget.takeTopLevelItem(0)
+        self.lastMemorySample = samples[-1] if samples else None
+        self.growthTreeWidget.clear()
+        if samples:
+            for module, size, count in samples[-1]["growth"]:
+                item = QtWidgets.QTreeWidgetItem([module, format(size / 1024, "+.1f") + " KiB", format(count, "+d")])
+                item.setTextAlignment(1, QtCore.Qt.AlignRight)
+                item.setTextAlignment(2, QtCore.Qt.AlignRight)
+                self.growthTreeWidget.addTopLevelItem(item)
+            self.growthTreeWidget.resizeColumnToContents(0)
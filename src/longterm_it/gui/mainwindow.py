@@ -7,7 +7,9 @@ from typing import Optional
 
 from PyQt5 import QtCore, QtGui, QtWidgets
 
+from ..metrics import registry
 from .dashboard import DashboardWidget
+from .diagnosticsdialog import DiagnosticsDialog
 from .logwindow import LogWindow
 from .preferencesdialog import PreferencesDialog
 
@@ -40,9 +42,17 @@ class MainWindow(QtWidgets.QMainWindow):
         self.loggingAction.setText(self.tr("Logging..."))
         self.loggingAction.triggered.connect(self.onShowLogWindow)
 
+        self.diagnosticsAction = QtWidgets.QAction(self)
+        self.diagnosticsAction.setText(self.tr("Diagnostics..."))
+        self.diagnosticsAction.triggered.connect(self.onShowDiagnostics)
+
         self.startAction = QtWidgets.QAction(self)
         self.startAction.setText(self.tr("Start"))
 
+        self.resumeAction = QtWidgets.QAction(self)
+        self.resumeAction.setText(self.tr("Resume..."))
+        self.resumeAction.setStatusTip("Resume interrupted measurement.")
+
         self.stopAction = QtWidgets.QAction(self)
         self.stopAction.setText(self.tr("Stop"))
         self.stopAction.setEnabled(False)
@@ -72,9 +82,11 @@ class MainWindow(QtWidgets.QMainWindow):
 
         self.viewMenu = self.menuBar().addMenu(self.tr("&View"))
         self.viewMenu.addAction(self.loggingAction)
+        self.viewMenu.addAction(self.diagnosticsAction)
 
         self.controlMenu = self.menuBar().addMenu(self.tr("&Control"))
         self.controlMenu.addAction(self.startAction)
+        self.controlMenu.addAction(self.resumeAction)
         self.controlMenu.addAction(self.stopAction)
 
         self.helpMenu = self.menuBar().addMenu(self.tr("&Help"))
@@ -106,6 +118,10 @@ class MainWindow(QtWidgets.QMainWindow):
         self.logWindow.resize(640, 420)
         self.logWindow.hide()
 
+        # Diagnostics
+        self.diagnosticsDialog = DiagnosticsDialog(registry, self)
+        self.diagnosticsDialog.setModal(False)
+
     def readSettings(self) -> None:
         settings = QtCore.QSettings()
         settings.beginGroup("mainwindow")
@@ -193,6 +209,10 @@ class MainWindow(QtWidgets.QMainWindow):
         self.logWindow.show()
         self.logWindow.raise_()
 
+    def onShowDiagnostics(self) -> None:
+        self.diagnosticsDialog.show()
+        self.diagnosticsDialog.raise_()
+
     def onShowPreferences(self) -> None:
         """Show modal preferences dialog."""
         context = {"resources": self.resources}
@@ -2,6 +2,18 @@ from typing import Any, Optional
 
 from PyQt5 import QtCore, QtWidgets
 
+from ..anomaly import AnomalyDetector
+from ..breakdown import BreakdownDetector
+from ..normalize import DefaultBandGap, DefaultReferenceTemperature
+from ..ramp import (
+    AdaptiveRamp,
+    DefaultRampDownSlewRate,
+    DefaultRampDownStep,
+    DefaultSettleInterval,
+    DefaultSettleThreshold,
+    DefaultSettleWindow,
+)
+from ..sampling import AdaptiveInterval
 from ..utils import escape_string, unescape_string
 
 
@@ -263,6 +275,482 @@ class OperatorsWidget(PreferencesWidget):
         settings.setValue("operators", self.operators())
 
 
+class ServicesWidget(PreferencesWidget):
+
+    DefaultFeedAddress = "localhost:10010"
+    DefaultFeedReplay = 100
+    DefaultMetricsPort = 10020
+
+    def __init__(self, context: dict, parent: Optional[QtWidgets.QWidget] = None) -> None:
+        super().__init__(context, parent)
+        self.setWindowTitle(self.tr("Services"))
+
+        self.feedAddressLineEdit = QtWidgets.QLineEdit(self)
+        self.feedAddressLineEdit.setToolTip(self.tr("TCP address (host:port) or unix socket (unix:path)."))
+
+        self.feedReplaySpinBox = QtWidgets.QSpinBox(self)
+        self.feedReplaySpinBox.setRange(0, 100000)
+        self.feedReplaySpinBox.setToolTip(self.tr("Number of readings replayed to late joining subscribers."))
+
+        self.feedFormatComboBox = QtWidgets.QComboBox(self)
+        self.feedFormatComboBox.addItem("JSON", "json")
+        self.feedFormatComboBox.addItem("MessagePack", "msgpack")
+
+        self.feedGroupBox = QtWidgets.QGroupBox(self)
+        self.feedGroupBox.setTitle(self.tr("Reading Feed"))
+        self.feedGroupBox.setCheckable(True)
+        self.feedGroupBox.setChecked(False)
+
+        feedGroupBoxLayout = QtWidgets.QFormLayout(self.feedGroupBox)
+        feedGroupBoxLayout.addRow(self.tr("Address"), self.feedAddressLineEdit)
+        feedGroupBoxLayout.addRow(self.tr("Replay"), self.feedReplaySpinBox)
+        feedGroupBoxLayout.addRow(self.tr("Format"), self.feedFormatComboBox)
+
+        self.metricsPortSpinBox = QtWidgets.QSpinBox(self)
+        self.metricsPortSpinBox.setRange(1, 65535)
+        self.metricsPortSpinBox.setToolTip(self.tr("Local HTTP port serving metrics in Prometheus text format."))
+
+        self.metricsGroupBox = QtWidgets.QGroupBox(self)
+        self.metricsGroupBox.setTitle(self.tr("Metrics Endpoint"))
+        self.metricsGroupBox.setCheckable(True)
+        self.metricsGroupBox.setChecked(False)
+
+        metricsGroupBoxLayout = QtWidgets.QFormLayout(self.metricsGroupBox)
+        metricsGroupBoxLayout.addRow(self.tr("Port"), self.metricsPortSpinBox)
+
+        layout = QtWidgets.QVBoxLayout(self)
+        layout.addWidget(self.feedGroupBox)
+        layout.addWidget(self.metricsGroupBox)
+        layout.addStretch()
+
+    def readSettings(self, settings: QtCore.QSettings) -> None:
+        self.feedGroupBox.setChecked(settings.value("feed/enabled", False, bool))
+        self.feedAddressLineEdit.setText(settings.value("feed/address", self.DefaultFeedAddress, str))
+        self.feedReplaySpinBox.setValue(settings.value("feed/replay", self.DefaultFeedReplay, int))
+        index = self.feedFormatComboBox.findData(settings.value("feed/format", "json", str))
+        self.feedFormatComboBox.setCurrentIndex(max(0, index))
+        self.metricsGroupBox.setChecked(settings.value("metrics/enabled", False, bool))
+        self.metricsPortSpinBox.setValue(settings.value("metrics/port", self.DefaultMetricsPort, int))
+
+    def writeSettings(self, settings: QtCore.QSettings) -> None:
+        settings.setValue("feed/enabled", self.feedGroupBox.isChecked())
+        settings.setValue("feed/address", self.feedAddressLineEdit.text().strip())
+        settings.setValue("feed/replay", self.feedReplaySpinBox.value())
+        settings.setValue("feed/format", self.feedFormatComboBox.currentData())
+        settings.setValue("metrics/enabled", self.metricsGroupBox.isChecked())
+        settings.setValue("metrics/port", self.metricsPortSpinBox.value())
+
+
+class OutputWidget(PreferencesWidget):
+
+    DefaultChunkInterval = 3600
+    DefaultRotateSize = 0
+    DefaultRotateInterval = 0
+
+    def __init__(self, context: dict, parent: Optional[QtWidgets.QWidget] = None) -> None:
+        super().__init__(context, parent)
+        self.setWindowTitle(self.tr("Output"))
+
+        self.compressionComboBox = QtWidgets.QComboBox(self)
+        self.compressionComboBox.addItem(self.tr("None"), "")
+        self.compressionComboBox.addItem("gzip", "gzip")
+        self.compressionComboBox.addItem("zstd", "zstd")
+        self.compressionComboBox.setToolTip(self.tr("Compression of It run files, zstd requires package 'zstandard'."))
+
+        self.chunkIntervalSpinBox = QtWidgets.QSpinBox(self)
+        self.chunkIntervalSpinBox.setRange(1, 86400)
+        self.chunkIntervalSpinBox.setSuffix(" s")
+        self.chunkIntervalSpinBox.setToolTip(self.tr("Maximum age of a compressed chunk, at most one chunk is lost on a crash."))
+
+        self.rotateSizeSpinBox = QtWidgets.QSpinBox(self)
+        self.rotateSizeSpinBox.setRange(0, 1000000)
+        self.rotateSizeSpinBox.setSuffix(" MB")
+        self.rotateSizeSpinBox.setSpecialValueText(self.tr("Off"))
+        self.rotateSizeSpinBox.setToolTip(self.tr("Start a new compressed file after size."))
+
+        self.rotateIntervalSpinBox = QtWidgets.QSpinBox(self)
+        self.rotateIntervalSpinBox.setRange(0, 100000)
+        self.rotateIntervalSpinBox.setSuffix(" h")
+        self.rotateIntervalSpinBox.setSpecialValueText(self.tr("Off"))
+        self.rotateIntervalSpinBox.setToolTip(self.tr("Start a new compressed file after time."))
+
+        self.compressionGroupBox = QtWidgets.QGroupBox(self)
+        self.compressionGroupBox.setTitle(self.tr("It Run Files"))
+
+        compressionGroupBoxLayout = QtWidgets.QFormLayout(self.compressionGroupBox)
+        compressionGroupBoxLayout.addRow(self.tr("Compression"), self.compressionComboBox)
+        compressionGroupBoxLayout.addRow(self.tr("Chunk Interval"), self.chunkIntervalSpinBox)
+        compressionGroupBoxLayout.addRow(self.tr("Rotate Size"), self.rotateSizeSpinBox)
+        compressionGroupBoxLayout.addRow(self.tr("Rotate Interval"), self.rotateIntervalSpinBox)
+
+        self.referenceTemperatureSpinBox = QtWidgets.QDoubleSpinBox(self)
+        self.referenceTemperatureSpinBox.setRange(-100.0, 100.0)
+        self.referenceTemperatureSpinBox.setDecimals(1)
+        self.referenceTemperatureSpinBox.setSuffix(" °C")
+        self.referenceTemperatureSpinBox.setToolTip(self.tr("Temperature leakage currents are normalized to."))
+
+        self.bandGapSpinBox = QtWidgets.QDoubleSpinBox(self)
+        self.bandGapSpinBox.setRange(0.1, 10.0)
+        self.bandGapSpinBox.setDecimals(3)
+        self.bandGapSpinBox.setSingleStep(0.01)
+        self.bandGapSpinBox.setSuffix(" eV")
+        self.bandGapSpinBox.setToolTip(self.tr("Effective band gap energy used for normalization."))
+
+        self.normalizationGroupBox = QtWidgets.QGroupBox(self)
+        self.normalizationGroupBox.setTitle(self.tr("Current Normalization"))
+
+        normalizationGroupBoxLayout = QtWidgets.QFormLayout(self.normalizationGroupBox)
+        normalizationGroupBoxLayout.addRow(self.tr("Reference Temperature"), self.referenceTemperatureSpinBox)
+        normalizationGroupBoxLayout.addRow(self.tr("Band Gap"), self.bandGapSpinBox)
+
+        self.databaseLineEdit = QtWidgets.QLineEdit(self)
+        self.databaseLineEdit.setToolTip(self.tr("SQLite database file collecting runs, sensors and samples."))
+
+        self.databaseButton = QtWidgets.QToolButton(self)
+        self.databaseButton.setText("...")
+        self.databaseButton.clicked.connect(self.selectDatabase)
+
+        self.databaseGroupBox = QtWidgets.QGroupBox(self)
+        self.databaseGroupBox.setTitle(self.tr("Run Database"))
+        self.databaseGroupBox.setCheckable(True)
+        self.databaseGroupBox.setChecked(False)
+
+        databaseGroupBoxLayout = QtWidgets.QHBoxLayout(self.databaseGroupBox)
+        databaseGroupBoxLayout.addWidget(self.databaseLineEdit)
+        databaseGroupBoxLayout.addWidget(self.databaseButton)
+
+        self.compressionComboBox.currentIndexChanged.connect(self.updateCompression)
+
+        layout = QtWidgets.QVBoxLayout(self)
+        layout.addWidget(self.compressionGroupBox)
+        layout.addWidget(self.normalizationGroupBox)
+        layout.addWidget(self.databaseGroupBox)
+        layout.addStretch()
+
+        self.updateCompression()
+
+    def updateCompression(self) -> None:
+        enabled = bool(self.compressionComboBox.currentData())
+        self.chunkIntervalSpinBox.setEnabled(enabled)
+        self.rotateSizeSpinBox.setEnabled(enabled)
+        self.rotateIntervalSpinBox.setEnabled(enabled)
+
+    def selectDatabase(self) -> None:
+        filename, _ = QtWidgets.QFileDialog.getSaveFileName(
+            self,
+            self.tr("Run Database"),
+            self.databaseLineEdit.text(),
+            self.tr("SQLite (*.sqlite *.db);;All files (*)"),
+            options=QtWidgets.QFileDialog.DontConfirmOverwrite,
+        )
+        if filename:
+            self.databaseLineEdit.setText(filename)
+
+    def readSettings(self, settings: QtCore.QSettings) -> None:
+        index = self.compressionComboBox.findData(settings.value("output/compression", "", str))
+        self.compressionComboBox.setCurrentIndex(max(0, index))
+        self.chunkIntervalSpinBox.setValue(settings.value("output/chunkInterval", self.DefaultChunkInterval, int))
+        self.rotateSizeSpinBox.setValue(settings.value("output/rotateSize", self.DefaultRotateSize, int))
+        self.rotateIntervalSpinBox.setValue(settings.value("output/rotateInterval", self.DefaultRotateInterval, int))
+        self.referenceTemperatureSpinBox.setValue(settings.value("normalization/referenceTemperature", DefaultReferenceTemperature, float))
+        self.bandGapSpinBox.setValue(settings.value("normalization/bandGap", DefaultBandGap, float))
+        self.databaseGroupBox.setChecked(settings.value("output/databaseEnabled", False, bool))
+        self.databaseLineEdit.setText(settings.value("output/database", "", str))
+
+    def writeSettings(self, settings: QtCore.QSettings) -> None:
+        settings.setValue("output/compression", self.compressionComboBox.currentData())
+        settings.setValue("output/chunkInterval", self.chunkIntervalSpinBox.value())
+        settings.setValue("output/rotateSize", self.rotateSizeSpinBox.value())
+        settings.setValue("output/rotateInterval", self.rotateIntervalSpinBox.value())
+        settings.setValue("normalization/referenceTemperature", self.referenceTemperatureSpinBox.value())
+        settings.setValue("normalization/bandGap", self.bandGapSpinBox.value())
+        settings.setValue("output/databaseEnabled", self.databaseGroupBox.isChecked())
+        settings.setValue("output/database", self.databaseLineEdit.text())
+
+
+class RampWidget(PreferencesWidget):
+
+    def __init__(self, context: dict, parent: Optional[QtWidgets.QWidget] = None) -> None:
+        super().__init__(context, parent)
+        self.setWindowTitle(self.tr("Ramp"))
+
+        self.breakdownSlopeSpinBox = QtWidgets.QDoubleSpinBox(self)
+        self.breakdownSlopeSpinBox.setRange(1.0, 1000.0)
+        self.breakdownSlopeSpinBox.setDecimals(1)
+        self.breakdownSlopeSpinBox.setValue(BreakdownDetector.DefaultSlope)
+        self.breakdownSlopeSpinBox.setToolTip(self.tr("Limit of log-log slope d ln(I) / d ln(U), bulk current is about 0.5, ohmic current 1."))
+
+        self.breakdownCurvatureSpinBox = QtWidgets.QDoubleSpinBox(self)
+        self.breakdownCurvatureSpinBox.setRange(0.0, 1000.0)
+        self.breakdownCurvatureSpinBox.setDecimals(1)
+        self.breakdownCurvatureSpinBox.setValue(BreakdownDetector.DefaultCurvature)
+        self.breakdownCurvatureSpinBox.setToolTip(self.tr("Minimum increase of slope between steps exceeding the slope limit."))
+
+        self.breakdownJumpSpinBox = QtWidgets.QSpinBox(self)
+        self.breakdownJumpSpinBox.setRange(1, 100000)
+        self.breakdownJumpSpinBox.setSuffix(" %")
+        self.breakdownJumpSpinBox.setValue(round(BreakdownDetector.DefaultJump * 100))
+        self.breakdownJumpSpinBox.setToolTip(self.tr("Limit of current increase between steps, beyond proportional scaling with voltage."))
+
+        self.breakdownMinCurrentSpinBox = QtWidgets.QDoubleSpinBox(self)
+        self.breakdownMinCurrentSpinBox.setRange(0.0, 1000000.0)
+        self.breakdownMinCurrentSpinBox.setDecimals(3)
+        self.breakdownMinCurrentSpinBox.setSuffix(" nA")
+        self.breakdownMinCurrentSpinBox.setValue(BreakdownDetector.DefaultMinCurrent * 1e9)
+        self.breakdownMinCurrentSpinBox.setToolTip(self.tr("Currents below are ignored by the detector."))
+
+        self.breakdownConfirmSpinBox = QtWidgets.QSpinBox(self)
+        self.breakdownConfirmSpinBox.setRange(1, 100)
+        self.breakdownConfirmSpinBox.setValue(BreakdownDetector.DefaultConfirm)
+        self.breakdownConfirmSpinBox.setToolTip(self.tr("Number of consecutive steps exceeding the limits required for breakdown onset."))
+
+        self.breakdownStopRampCheckBox = QtWidgets.QCheckBox(self)
+        self.breakdownStopRampCheckBox.setText(self.tr("Stop ramp on breakdown"))
+        self.breakdownStopRampCheckBox.setToolTip(self.tr("End the IV ramp at the first breakdown and continue with ramping to bias."))
+
+        self.breakdownGroupBox = QtWidgets.QGroupBox(self)
+        self.breakdownGroupBox.setTitle(self.tr("Breakdown Detection"))
+        self.breakdownGroupBox.setCheckable(True)
+        self.breakdownGroupBox.setChecked(False)
+        self.breakdownGroupBox.setToolTip(self.tr("Switch off HV relay of sensors showing breakdown onset during the IV ramp."))
+
+        breakdownGroupBoxLayout = QtWidgets.QFormLayout(self.breakdownGroupBox)
+        breakdownGroupBoxLayout.addRow(self.tr("Slope"), self.breakdownSlopeSpinBox)
+        breakdownGroupBoxLayout.addRow(self.tr("Curvature"), self.breakdownCurvatureSpinBox)
+        breakdownGroupBoxLayout.addRow(self.tr("Jump"), self.breakdownJumpSpinBox)
+        breakdownGroupBoxLayout.addRow(self.tr("Min. Current"), self.breakdownMinCurrentSpinBox)
+        breakdownGroupBoxLayout.addRow(self.tr("Confirm"), self.breakdownConfirmSpinBox)
+        breakdownGroupBoxLayout.addRow("", self.breakdownStopRampCheckBox)
+
+        self.maxStepSpinBox = QtWidgets.QDoubleSpinBox(self)
+        self.maxStepSpinBox.setRange(0.1, 1000.0)
+        self.maxStepSpinBox.setDecimals(1)
+        self.maxStepSpinBox.setSuffix(" V")
+        self.maxStepSpinBox.setValue(AdaptiveRamp.DefaultMaxStep)
+        self.maxStepSpinBox.setToolTip(self.tr("Maximum voltage step, the IV step is the minimum."))
+
+        self.maxSlewRateSpinBox = QtWidgets.QDoubleSpinBox(self)
+        self.maxSlewRateSpinBox.setRange(0.0, 1000.0)
+        self.maxSlewRateSpinBox.setDecimals(1)
+        self.maxSlewRateSpinBox.setSuffix(" V/s")
+        self.maxSlewRateSpinBox.setSpecialValueText(self.tr("Off"))
+        self.maxSlewRateSpinBox.setValue(AdaptiveRamp.DefaultMaxSlewRate)
+        self.maxSlewRateSpinBox.setToolTip(self.tr("Maximum dV/dt, the delay of wide steps is extended accordingly."))
+
+        self.toleranceSpinBox = QtWidgets.QDoubleSpinBox(self)
+        self.toleranceSpinBox.setRange(0.1, 100.0)
+        self.toleranceSpinBox.setDecimals(1)
+        self.toleranceSpinBox.setSuffix(" %")
+        self.toleranceSpinBox.setValue(AdaptiveRamp.DefaultTolerance * 100)
+        self.toleranceSpinBox.setToolTip(self.tr("Step is widened while currents deviate less from a linear extrapolation."))
+
+        self.adaptiveGroupBox = QtWidgets.QGroupBox(self)
+        self.adaptiveGroupBox.setTitle(self.tr("Adaptive Step"))
+        self.adaptiveGroupBox.setCheckable(True)
+        self.adaptiveGroupBox.setChecked(False)
+        self.adaptiveGroupBox.setToolTip(self.tr("Widen IV ramp steps while currents change smoothly."))
+
+        adaptiveGroupBoxLayout = QtWidgets.QFormLayout(self.adaptiveGroupBox)
+        adaptiveGroupBoxLayout.addRow(self.tr("Max. Step"), self.maxStepSpinBox)
+        adaptiveGroupBoxLayout.addRow(self.tr("Max. dV/dt"), self.maxSlewRateSpinBox)
+        adaptiveGroupBoxLayout.addRow(self.tr("Tolerance"), self.toleranceSpinBox)
+
+        self.settleThresholdSpinBox = QtWidgets.QDoubleSpinBox(self)
+        self.settleThresholdSpinBox.setRange(0.01, 100.0)
+        self.settleThresholdSpinBox.setDecimals(2)
+        self.settleThresholdSpinBox.setSuffix(" %")
+        self.settleThresholdSpinBox.setValue(DefaultSettleThreshold * 100)
+        self.settleThresholdSpinBox.setToolTip(self.tr("Current is settled if the relative change over the window falls below."))
+
+        self.settleWindowSpinBox = QtWidgets.QSpinBox(self)
+        self.settleWindowSpinBox.setRange(2, 100)
+        self.settleWindowSpinBox.setValue(DefaultSettleWindow)
+        self.settleWindowSpinBox.setToolTip(self.tr("Number of SMU readings compared."))
+
+        self.settleIntervalSpinBox = QtWidgets.QDoubleSpinBox(self)
+        self.settleIntervalSpinBox.setRange(0.0, 60.0)
+        self.settleIntervalSpinBox.setDecimals(2)
+        self.settleIntervalSpinBox.setSuffix(" s")
+        self.settleIntervalSpinBox.setValue(DefaultSettleInterval)
+        self.settleIntervalSpinBox.setToolTip(self.tr("Interval between SMU readings."))
+
+        self.settleGroupBox = QtWidgets.QGroupBox(self)
+        self.settleGroupBox.setTitle(self.tr("Settling"))
+        self.settleGroupBox.setCheckable(True)
+        self.settleGroupBox.setChecked(False)
+        self.settleGroupBox.setToolTip(self.tr("Continue after a voltage step once the SMU current settled, the IV delay is the upper bound."))
+
+        settleGroupBoxLayout = QtWidgets.QFormLayout(self.settleGroupBox)
+        settleGroupBoxLayout.addRow(self.tr("Threshold"), self.settleThresholdSpinBox)
+        settleGroupBoxLayout.addRow(self.tr("Window"), self.settleWindowSpinBox)
+        settleGroupBoxLayout.addRow(self.tr("Interval"), self.settleIntervalSpinBox)
+
+        self.rampDownStepSpinBox = QtWidgets.QDoubleSpinBox(self)
+        self.rampDownStepSpinBox.setRange(0.1, 100.0)
+        self.rampDownStepSpinBox.setDecimals(1)
+        self.rampDownStepSpinBox.setSuffix(" V")
+        self.rampDownStepSpinBox.setValue(DefaultRampDownStep)
+        self.rampDownStepSpinBox.setToolTip(self.tr("Voltage step ramping down to zero."))
+
+        self.rampDownSlewRateSpinBox = QtWidgets.QDoubleSpinBox(self)
+        self.rampDownSlewRateSpinBox.setRange(1.0, 1000.0)
+        self.rampDownSlewRateSpinBox.setDecimals(1)
+        self.rampDownSlewRateSpinBox.setSuffix(" V/s")
+        self.rampDownSlewRateSpinBox.setValue(DefaultRampDownSlewRate)
+        self.rampDownSlewRateSpinBox.setToolTip(self.tr("Maximum dV/dt ramping down to zero, also on abort."))
+
+        self.hardwareSweepCheckBox = QtWidgets.QCheckBox(self)
+        self.hardwareSweepCheckBox.setText(self.tr("Use SMU hardware sweep"))
+        self.hardwareSweepCheckBox.setToolTip(self.tr("Ramp to bias and to zero using K2410 list sweeps with source delay, readings are fetched after each sweep."))
+
+        self.biasGroupBox = QtWidgets.QGroupBox(self)
+        self.biasGroupBox.setTitle(self.tr("Ramp to Bias and Zero"))
+
+        biasGroupBoxLayout = QtWidgets.QFormLayout(self.biasGroupBox)
+        biasGroupBoxLayout.addRow(self.tr("Ramp Down Step"), self.rampDownStepSpinBox)
+        biasGroupBoxLayout.addRow(self.tr("Ramp Down dV/dt"), self.rampDownSlewRateSpinBox)
+        biasGroupBoxLayout.addRow("", self.hardwareSweepCheckBox)
+
+        layout = QtWidgets.QVBoxLayout(self)
+        layout.addWidget(self.adaptiveGroupBox)
+        layout.addWidget(self.settleGroupBox)
+        layout.addWidget(self.breakdownGroupBox)
+        layout.addWidget(self.biasGroupBox)
+        layout.addStretch()
+
+    def readSettings(self, settings: QtCore.QSettings) -> None:
+        self.adaptiveGroupBox.setChecked(settings.value("ramp/adaptive", False, bool))
+        self.maxStepSpinBox.setValue(settings.value("ramp/maxStep", AdaptiveRamp.DefaultMaxStep, float))
+        self.maxSlewRateSpinBox.setValue(settings.value("ramp/maxSlewRate", AdaptiveRamp.DefaultMaxSlewRate, float))
+        self.toleranceSpinBox.setValue(settings.value("ramp/tolerance", AdaptiveRamp.DefaultTolerance, float) * 100)
+        self.settleGroupBox.setChecked(settings.value("settle/enabled", False, bool))
+        self.settleThresholdSpinBox.setValue(settings.value("settle/threshold", DefaultSettleThreshold, float) * 100)
+        self.settleWindowSpinBox.setValue(settings.value("settle/window", DefaultSettleWindow, int))
+        self.settleIntervalSpinBox.setValue(settings.value("settle/interval", DefaultSettleInterval, float))
+        self.breakdownGroupBox.setChecked(settings.value("breakdown/enabled", False, bool))
+        self.breakdownSlopeSpinBox.setValue(settings.value("breakdown/slope", BreakdownDetector.DefaultSlope, float))
+        self.breakdownCurvatureSpinBox.setValue(settings.value("breakdown/curvature", BreakdownDetector.DefaultCurvature, float))
+        self.breakdownJumpSpinBox.setValue(round(settings.value("breakdown/jump", BreakdownDetector.DefaultJump, float) * 100))
+        self.breakdownMinCurrentSpinBox.setValue(settings.value("breakdown/minCurrent", BreakdownDetector.DefaultMinCurrent, float) * 1e9)
+        self.breakdownConfirmSpinBox.setValue(settings.value("breakdown/confirm", BreakdownDetector.DefaultConfirm, int))
+        self.breakdownStopRampCheckBox.setChecked(settings.value("breakdown/stopRamp", False, bool))
+        self.hardwareSweepCheckBox.setChecked(settings.value("ramp/hardwareSweep", False, bool))
+        self.rampDownStepSpinBox.setValue(settings.value("ramp/downStep", DefaultRampDownStep, float))
+        self.rampDownSlewRateSpinBox.setValue(settings.value("ramp/downSlewRate", DefaultRampDownSlewRate, float))
+
+    def writeSettings(self, settings: QtCore.QSettings) -> None:
+        settings.setValue("ramp/adaptive", self.adaptiveGroupBox.isChecked())
+        settings.setValue("ramp/maxStep", self.maxStepSpinBox.value())
+        settings.setValue("ramp/maxSlewRate", self.maxSlewRateSpinBox.value())
+        settings.setValue("ramp/tolerance", self.toleranceSpinBox.value() / 100)
+        settings.setValue("settle/enabled", self.settleGroupBox.isChecked())
+        settings.setValue("settle/threshold", self.settleThresholdSpinBox.value() / 100)
+        settings.setValue("settle/window", self.settleWindowSpinBox.value())
+        settings.setValue("settle/interval", self.settleIntervalSpinBox.value())
+        settings.setValue("breakdown/enabled", self.breakdownGroupBox.isChecked())
+        settings.setValue("breakdown/slope", self.breakdownSlopeSpinBox.value())
+        settings.setValue("breakdown/curvature", self.breakdownCurvatureSpinBox.value())
+        settings.setValue("breakdown/jump", self.breakdownJumpSpinBox.value() / 100)
+        settings.setValue("breakdown/minCurrent", self.breakdownMinCurrentSpinBox.value() * 1e-9)
+        settings.setValue("breakdown/confirm", self.breakdownConfirmSpinBox.value())
+        settings.setValue("breakdown/stopRamp", self.breakdownStopRampCheckBox.isChecked())
+        settings.setValue("ramp/hardwareSweep", self.hardwareSweepCheckBox.isChecked())
+        settings.setValue("ramp/downStep", self.rampDownStepSpinBox.value())
+        settings.setValue("ramp/downSlewRate", self.rampDownSlewRateSpinBox.value())
+
+
+class SamplingWidget(PreferencesWidget):
+
+    def __init__(self, context: dict, parent: Optional[QtWidgets.QWidget] = None) -> None:
+        super().__init__(context, parent)
+        self.setWindowTitle(self.tr("Sampling"))
+
+        self.maxIntervalSpinBox = QtWidgets.QSpinBox(self)
+        self.maxIntervalSpinBox.setRange(1, 86400)
+        self.maxIntervalSpinBox.setSuffix(" s")
+        self.maxIntervalSpinBox.setValue(round(AdaptiveInterval.DefaultMaxInterval))
+        self.maxIntervalSpinBox.setToolTip(self.tr("Maximum It interval while all channels are stable."))
+
+        self.toleranceSpinBox = QtWidgets.QDoubleSpinBox(self)
+        self.toleranceSpinBox.setRange(0.01, 100.0)
+        self.toleranceSpinBox.setDecimals(2)
+        self.toleranceSpinBox.setSuffix(" %")
+        self.toleranceSpinBox.setValue(AdaptiveInterval.DefaultTolerance * 100)
+        self.toleranceSpinBox.setToolTip(self.tr("Relative current change between scans considered stable."))
+
+        self.temperatureToleranceSpinBox = QtWidgets.QDoubleSpinBox(self)
+        self.temperatureToleranceSpinBox.setRange(0.01, 100.0)
+        self.temperatureToleranceSpinBox.setDecimals(2)
+        self.temperatureToleranceSpinBox.setSuffix(" °C")
+        self.temperatureToleranceSpinBox.setValue(AdaptiveInterval.DefaultTemperatureTolerance)
+        self.temperatureToleranceSpinBox.setToolTip(self.tr("PT100 and CTS temperature change considered stable."))
+
+        self.adaptiveGroupBox = QtWidgets.QGroupBox(self)
+        self.adaptiveGroupBox.setTitle(self.tr("Adaptive It Interval"))
+        self.adaptiveGroupBox.setCheckable(True)
+        self.adaptiveGroupBox.setChecked(False)
+        self.adaptiveGroupBox.setToolTip(self.tr("Stretch the It interval while all channels are stable, measure at the It interval on any change."))
+
+        adaptiveGroupBoxLayout = QtWidgets.QFormLayout(self.adaptiveGroupBox)
+        adaptiveGroupBoxLayout.addRow(self.tr("Max. Interval"), self.maxIntervalSpinBox)
+        adaptiveGroupBoxLayout.addRow(self.tr("Current Tolerance"), self.toleranceSpinBox)
+        adaptiveGroupBoxLayout.addRow(self.tr("Temperature Tolerance"), self.temperatureToleranceSpinBox)
+
+        self.windowSpinBox = QtWidgets.QSpinBox(self)
+        self.windowSpinBox.setRange(AnomalyDetector.MinSamples, 1000)
+        self.windowSpinBox.setSuffix(" samples")
+        self.windowSpinBox.setValue(AnomalyDetector.DefaultWindow)
+        self.windowSpinBox.setToolTip(self.tr("Number of samples of rolling median and MAD baseline."))
+
+        self.spikeThresholdSpinBox = QtWidgets.QDoubleSpinBox(self)
+        self.spikeThresholdSpinBox.setRange(1.0, 1000.0)
+        self.spikeThresholdSpinBox.setDecimals(1)
+        self.spikeThresholdSpinBox.setValue(AnomalyDetector.DefaultSpikeThreshold)
+        self.spikeThresholdSpinBox.setToolTip(self.tr("Robust z-score of a single sample reported as spike."))
+
+        self.stepThresholdSpinBox = QtWidgets.QDoubleSpinBox(self)
+        self.stepThresholdSpinBox.setRange(1.0, 1000.0)
+        self.stepThresholdSpinBox.setDecimals(1)
+        self.stepThresholdSpinBox.setValue(AnomalyDetector.DefaultStepThreshold)
+        self.stepThresholdSpinBox.setToolTip(self.tr("Cumulative sum of robust z-scores reported as step."))
+
+        self.anomalyGroupBox = QtWidgets.QGroupBox(self)
+        self.anomalyGroupBox.setTitle(self.tr("Anomaly Detection"))
+        self.anomalyGroupBox.setCheckable(True)
+        self.anomalyGroupBox.setChecked(True)
+        self.anomalyGroupBox.setToolTip(self.tr("Detect spikes and steps in It currents, events are marked in the It chart and written to an events file."))
+
+        anomalyGroupBoxLayout = QtWidgets.QFormLayout(self.anomalyGroupBox)
+        anomalyGroupBoxLayout.addRow(self.tr("Window"), self.windowSpinBox)
+        anomalyGroupBoxLayout.addRow(self.tr("Spike Threshold"), self.spikeThresholdSpinBox)
+        anomalyGroupBoxLayout.addRow(self.tr("Step Threshold"), self.stepThresholdSpinBox)
+
+        layout = QtWidgets.QVBoxLayout(self)
+        layout.addWidget(self.adaptiveGroupBox)
+        layout.addWidget(self.anomalyGroupBox)
+        layout.addStretch()
+
+    def readSettings(self, settings: QtCore.QSettings) -> None:
+        self.adaptiveGroupBox.setChecked(settings.value("sampling/adaptive", False, bool))
+        self.maxIntervalSpinBox.setValue(settings.value("sampling/maxInterval", round(AdaptiveInterval.DefaultMaxInterval), int))
+        self.toleranceSpinBox.setValue(settings.value("sampling/tolerance", AdaptiveInterval.DefaultTolerance, float) * 100)
+        self.temperatureToleranceSpinBox.setValue(settings.value("sampling/temperatureTolerance", AdaptiveInterval.DefaultTemperatureTolerance, float))
+        self.anomalyGroupBox.setChecked(settings.value("anomaly/enabled", True, bool))
+        self.windowSpinBox.setValue(settings.value("anomaly/window", AnomalyDetector.DefaultWindow, int))
+        self.spikeThresholdSpinBox.setValue(settings.value("anomaly/spikeThreshold", AnomalyDetector.DefaultSpikeThreshold, float))
+        self.stepThresholdSpinBox.setValue(settings.value("anomaly/stepThreshold", AnomalyDetector.DefaultStepThreshold, float))
+
+    def writeSettings(self, settings: QtCore.QSettings) -> None:
+        settings.setValue("sampling/adaptive", self.adaptiveGroupBox.isChecked())
+        settings.setValue("sampling/maxInterval", self.maxIntervalSpinBox.value())
+        settings.setValue("sampling/tolerance", self.toleranceSpinBox.value() / 100)
+        settings.setValue("sampling/temperatureTolerance", self.temperatureToleranceSpinBox.value())
+        settings.setValue("anomaly/enabled", self.anomalyGroupBox.isChecked())
+        settings.setValue("anomaly/window", self.windowSpinBox.value())
+        settings.setValue("anomaly/spikeThreshold", self.spikeThresholdSpinBox.value())
+        settings.setValue("anomaly/stepThreshold", self.stepThresholdSpinBox.value())
+
+
 class PreferencesDialog(QtWidgets.QDialog):
 
     def __init__(self, context: dict, parent: Optional[QtWidgets.QWidget] = None) -> None:
@@ -272,10 +760,18 @@ class PreferencesDialog(QtWidgets.QDialog):
 
         self.resourcesWidget = ResourcesWidget(context, self)
         self.operatorsWidget = OperatorsWidget(context, self)
+        self.servicesWidget = ServicesWidget(context, self)
+        self.outputWidget = OutputWidget(context, self)
+        self.rampWidget = RampWidget(context, self)
+        self.samplingWidget = SamplingWidget(context, self)
 
         self.tabWidget = QtWidgets.QTabWidget(self)
         self.tabWidget.addTab(self.resourcesWidget, self.resourcesWidget.windowTitle())
         self.tabWidget.addTab(self.operatorsWidget, self.operatorsWidget.windowTitle())
+        self.tabWidget.addTab(self.servicesWidget, self.servicesWidget.windowTitle())
+        self.tabWidget.addTab(self.outputWidget, self.outputWidget.windowTitle())
+        self.tabWidget.addTab(self.rampWidget, self.rampWidget.windowTitle())
+        self.tabWidget.addTab(self.samplingWidget, self.samplingWidget.windowTitle())
 
         self.buttonBox = QtWidgets.QDialogButtonBox()
         self.buttonBox.setOrientation(QtCore.Qt.Horizontal)
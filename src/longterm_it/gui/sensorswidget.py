@@ -1,4 +1,6 @@
+import datetime
 import logging
+import math
 from typing import Iterable, Optional
 
 from PyQt5 import QtCore, QtGui, QtWidgets
@@ -86,9 +88,10 @@ class SensorsWidget(QtWidgets.QWidget):
         self.tableView.resizeRowsToContents()
         self.tableView.setColumnWidth(0, 172)
         self.tableView.setColumnWidth(1, 64)
-        self.tableView.setColumnWidth(3, 96)
-        self.tableView.setColumnWidth(4, 64)
-        self.tableView.setItemDelegateForColumn(2, HVDelegate())
+        self.tableView.setColumnWidth(SensorsModel.Column.Current, 96)
+        self.tableView.setColumnWidth(SensorsModel.Column.CurrentNorm, 96)
+        self.tableView.setColumnWidth(SensorsModel.Column.Temperature, 64)
+        self.tableView.setItemDelegateForColumn(SensorsModel.Column.HV, HVDelegate())
         self.tableView.setSizeAdjustPolicy(
             QtWidgets.QAbstractScrollArea.AdjustToContents
         )
@@ -116,7 +119,7 @@ class SensorsWidget(QtWidgets.QWidget):
     def dataChanged(self) -> None:
         self.model.dataChanged.emit(
             self.model.createIndex(0, 1),
-            self.model.createIndex(len(self.sensors), 4),
+            self.model.createIndex(len(self.sensors), len(self.model.columns) - 1),
         )
 
     def editTableItem(self, index: QtCore.QModelIndex) -> None:
@@ -153,9 +156,14 @@ class SensorsModel(QtCore.QAbstractTableModel):
         "Status",
         "HV",
         "Current",
+        "Norm.",
         "Temp.",
         "Temp. Off.",
         "Calib.",
+        "Mean",
+        "Std. Dev.",
+        "Drift",
+        "Events",
     ]
 
     class Column:
@@ -163,9 +171,14 @@ class SensorsModel(QtCore.QAbstractTableModel):
         State = 1
         HV = 2
         Current = 3
-        Temperature = 4
-        TemperatureOffset = 5
-        Resistivity = 6
+        CurrentNorm = 4
+        Temperature = 5
+        TemperatureOffset = 6
+        Resistivity = 7
+        Mean = 8
+        StdDev = 9
+        Drift = 10
+        Events = 11
 
     def __init__(self, sensors: Iterable, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -182,12 +195,22 @@ class SensorsModel(QtCore.QAbstractTableModel):
             if role == QtCore.Qt.DisplayRole:
                 return self.columns[section]
             elif role == QtCore.Qt.ToolTipRole:
-                if section == self.Column.Temperature:
+                if section == self.Column.CurrentNorm:
+                    return "Temperature normalized current"
+                elif section == self.Column.Temperature:
                     return "Temperature"
                 elif section == self.Column.TemperatureOffset:
                     return "Temperature Offset"
                 elif section == self.Column.Resistivity:
                     return "Calibration Resistivitiy"
+                elif section == self.Column.Mean:
+                    return "Mean current of It run"
+                elif section == self.Column.StdDev:
+                    return "Standard deviation of current of It run"
+                elif section == self.Column.Drift:
+                    return "Current drift of It run (least squares slope)"
+                elif section == self.Column.Events:
+                    return "Current spikes and steps detected in It run"
         elif orientation == QtCore.Qt.Vertical:
             if role == QtCore.Qt.DisplayRole:
                 return section + 1
@@ -213,6 +236,10 @@ class SensorsModel(QtCore.QAbstractTableModel):
                 if sensor.enabled:
                     if not sensor.current is None:
                         return auto_unit(sensor.current, "A", decimals=3)
+            elif index.column() == self.Column.CurrentNorm:
+                if sensor.enabled:
+                    if sensor.current_norm is not None and not math.isnan(sensor.current_norm):
+                        return auto_unit(sensor.current_norm, "A", decimals=3)
             elif index.column() == self.Column.Temperature:
                 if sensor.enabled:
                     if not sensor.temperature is None:
@@ -221,6 +248,27 @@ class SensorsModel(QtCore.QAbstractTableModel):
                 return "{:+.2f} °C".format(sensor.temperature_offset)
             elif index.column() == self.Column.Resistivity:
                 return "{:d} Ohm".format(sensor.resistivity)
+            elif index.column() == self.Column.Mean:
+                value = self.currentStatistic(sensor, "mean")
+                if value is not None:
+                    return auto_unit(value, "A", decimals=3)
+            elif index.column() == self.Column.StdDev:
+                value = self.currentStatistic(sensor, "std")
+                if value is not None:
+                    return auto_unit(value, "A", decimals=3)
+            elif index.column() == self.Column.Drift:
+                value = self.currentStatistic(sensor, "drift")
+                if value is not None:
+                    return auto_unit(value * 3600, "A/h", decimals=3)
+            elif index.column() == self.Column.Events:
+                if sensor.enabled:
+                    return format(sensor.events)
+
+        elif role == QtCore.Qt.ToolTipRole:
+            if index.column() in (self.Column.Mean, self.Column.StdDev, self.Column.Drift):
+                return self.statisticsToolTip(sensor)
+            if index.column() == self.Column.Events:
+                return self.eventToolTip(sensor)
 
         elif role == QtCore.Qt.DecorationRole:
             if index.column() == self.Column.Name:
@@ -235,6 +283,8 @@ class SensorsModel(QtCore.QAbstractTableModel):
                 if sensor.hv:
                     return QtGui.QBrush(QtGui.QColor("#00bb00"))
                 return QtGui.QBrush(QtGui.QColor("#bb0000"))
+            if index.column() == self.Column.Events and sensor.enabled and sensor.events:
+                return QtGui.QBrush(QtGui.QColor("#bb0000"))
             else:
                 if not sensor.enabled:
                     return QtGui.QBrush(QtCore.Qt.darkGray)
@@ -242,12 +292,16 @@ class SensorsModel(QtCore.QAbstractTableModel):
         elif role == QtCore.Qt.TextAlignmentRole:
             if index.column() == self.Column.Current:
                 return QtCore.Qt.AlignRight
+            elif index.column() == self.Column.CurrentNorm:
+                return QtCore.Qt.AlignRight
             elif index.column() == self.Column.Temperature:
                 return QtCore.Qt.AlignRight
             elif index.column() == self.Column.TemperatureOffset:
                 return QtCore.Qt.AlignRight
             elif index.column() == self.Column.Resistivity:
                 return QtCore.Qt.AlignRight
+            elif index.column() in (self.Column.Mean, self.Column.StdDev, self.Column.Drift, self.Column.Events):
+                return QtCore.Qt.AlignRight
 
         elif role == QtCore.Qt.CheckStateRole:
             if index.column() == self.Column.Name:
@@ -261,6 +315,45 @@ class SensorsModel(QtCore.QAbstractTableModel):
             if index.column() == self.Column.Resistivity:
                 return sensor.resistivity
 
+    def currentStatistic(self, sensor: Sensor, key: str) -> Optional[float]:
+        if sensor.enabled and sensor.statistics:
+            value = sensor.statistics.get("current", {}).get(key)
+            if value is not None and not math.isnan(value):
+                return value
+        return None
+
+    def statisticsToolTip(self, sensor: Sensor) -> Optional[str]:
+        if not sensor.enabled or not sensor.statistics:
+            return None
+        lines = []
+        for name, unit in (("current", "A"), ("temperature", "°C")):
+            stats = sensor.statistics.get(name, {})
+            values = [
+                ("mean", stats.get("mean")),
+                ("std", stats.get("std")),
+                ("min", stats.get("min")),
+                ("max", stats.get("max")),
+                ("EWMA", stats.get("ewma")),
+                ("hour", stats.get("hour_mean")),
+                ("day", stats.get("day_mean")),
+            ]
+            text = ", ".join(f"{key} {auto_unit(value, unit)}" for key, value in values if value is not None and not math.isnan(value))
+            lines.append(f"{name.capitalize()} ({stats.get('count', 0)} samples): {text}")
+        return "\n".join(lines)
+
+    def eventToolTip(self, sensor: Sensor) -> Optional[str]:
+        event = sensor.last_event
+        if not sensor.enabled or not event:
+            return None
+        dt = datetime.datetime.fromtimestamp(event.get("time", 0))
+        return "Last {} at {}: {} (median {}, score {:+.1f})".format(
+            event.get("kind"),
+            dt.strftime("%Y-%m-%d %H:%M:%S"),
+            auto_unit(event.get("value"), "A", decimals=3),
+            auto_unit(event.get("median"), "A", decimals=3),
+            event.get("score"),
+        )
+
     def setData(self, index, value, role=QtCore.Qt.EditRole):
         if not index.isValid():
             return
@@ -2,6 +2,7 @@ from typing import Optional
 
 from PyQt5 import QtCore, QtWidgets
 
+from ..reconnect import CircuitState
 from ..utils import auto_unit
 
 
@@ -59,6 +60,13 @@ class StatusWidget(QtWidgets.QWidget):
         self.statusLineEdit.setMaximumWidth(86)
         self.statusLineEdit.setReadOnly(True)
 
+        self.connectionLabel = QtWidgets.QLabel()
+        self.connectionLabel.setText("Connection")
+
+        self.connectionLineEdit = QtWidgets.QLineEdit()
+        self.connectionLineEdit.setMaximumWidth(86)
+        self.connectionLineEdit.setReadOnly(True)
+
         self.ctsGroupBox = QtWidgets.QGroupBox()
         self.ctsGroupBox.setTitle("Chamber Status")
 
@@ -69,11 +77,13 @@ class StatusWidget(QtWidgets.QWidget):
         ctsGroupBoxLayout.addWidget(self.tempLineEdit, 1, 0, 1, 1)
         ctsGroupBoxLayout.addWidget(self.statusLabel, 0, 2, 1, 1)
         ctsGroupBoxLayout.addWidget(self.statusLineEdit, 1, 2, 1, 1)
+        ctsGroupBoxLayout.addWidget(self.connectionLabel, 0, 3, 1, 1)
+        ctsGroupBoxLayout.addWidget(self.connectionLineEdit, 1, 3, 1, 1)
 
         spacerItem1 = QtWidgets.QSpacerItem(
             0, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum
         )
-        ctsGroupBoxLayout.addItem(spacerItem1, 1, 3, 1, 1)
+        ctsGroupBoxLayout.addItem(spacerItem1, 1, 4, 1, 1)
 
         layout = QtWidgets.QHBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
@@ -114,3 +124,18 @@ class StatusWidget(QtWidgets.QWidget):
         else:
             text = self.tr("{}").format(status)
         self.statusLineEdit.setText(text)
+
+    def setConnection(self, state: str) -> None:
+        """Set chamber connection circuit state."""
+        texts = {
+            CircuitState.CLOSED: self.tr("OK"),
+            CircuitState.OPEN: self.tr("Offline"),
+            CircuitState.HALF_OPEN: self.tr("Retrying"),
+        }
+        tooltips = {
+            CircuitState.CLOSED: self.tr("Chamber connected."),
+            CircuitState.OPEN: self.tr("Chamber not reachable, reconnecting with increasing delays."),
+            CircuitState.HALF_OPEN: self.tr("Trying to reconnect to chamber."),
+        }
+        self.connectionLineEdit.setText(texts.get(state, state))
+        self.connectionLineEdit.setToolTip(tooltips.get(state, ""))
@@ -0,0 +1,88 @@
+"""Run state journal used to resume interrupted It runs."""
+
+import json
+import os
+from typing import Optional
+
+from . import __version__
+
+__all__ = ["Journal", "JournalFilename", "find_resumable", "truncate_partial_line"]
+
+JournalFilename: str = "state.json"
+
+ResumableStages: tuple[str, ...] = ("longterm",)
+"""Stages a run can be resumed from, the SMU is still at bias voltage."""
+
+
+class Journal:
+    """Run state persisted as JSON in the run directory.
+
+    The file is replaced atomically on every update, so it is either the
+    previous or the new state after a crash.
+    """
+
+    def __init__(self, path: str, state: Optional[dict] = None) -> None:
+        self.path: str = path
+        self.filename: str = os.path.join(path, JournalFilename)
+        self.state: dict = dict(state or {})
+
+    @classmethod
+    def load(cls, path: str) -> "Journal":
+        with open(os.path.join(path, JournalFilename)) as fp:
+            return cls(path, json.load(fp))
+
+    def is_resumable(self) -> bool:
+        return self.state.get("stage") in ResumableStages
+
+    def update(self, **values) -> None:
+        self.state.update(values)
+        self.write()
+
+    def write(self) -> None:
+        self.state["version"] = __version__
+        filename = self.filename + ".tmp"
+        with open(filename, "w") as fp:
+            json.dump(self.state, fp, indent=2)
+            fp.flush()
+            os.fsync(fp.fileno())
+        os.replace(filename, self.filename)
+
+
+def find_resumable(path: str) -> Optional[Journal]:
+    """Returns most recently updated resumable journal of run directories
+    in `path`, or None."""
+    journals = []
+    try:
+        entries = list(os.scandir(path))
+    except FileNotFoundError:
+        return None
+    for entry in entries:
+        if entry.is_dir():
+            try:
+                journal = Journal.load(entry.path)
+            except (OSError, ValueError):
+                continue
+            if journal.is_resumable():
+                journals.append(journal)
+    if not journals:
+        return None
+    return max(journals, key=lambda journal: journal.state.get("updated", 0))
+
+
+def truncate_partial_line(filename: str) -> int:
+    """Truncate incomplete last line left by a crash, returns number of
+    removed bytes."""
+    with open(filename, "rb+") as fp:
+        size = fp.seek(0, os.SEEK_END)
+        position = size
+        while position > 0:
+            step = min(4096, position)
+            fp.seek(position - step)
+            data = fp.read(step)
+            index = data.rfind(b"\n")
+            if index >= 0:
+                position = position - step + index + 1
+                break
+            position -= step
+        fp.truncate(position)
+    return size - position
@@ -0,0 +1,144 @@
+import collections
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from typing import Callable, Optional
+
+from .metrics import resident_memory
+
+__all__ = ["MemoryProfiler", "module_name"]
+
+logger = logging.getLogger(__name__)
+
+
+def module_name(filename: str) -> str:
+    """Returns dotted module name for source filename, derived from the
+    longest matching `sys.path` entry.
+
+    >>> module_name("/usr/lib/python3/site-packages/longterm_it/gui/charts.py")
+    'longterm_it.gui.charts'
+    """
+    filename = os.path.normpath(filename)
+    best = ""
+    for path in sys.path:
+        path = os.path.normpath(path or os.getcwd())
+        if filename.startswith(path + os.sep) and len(path) > len(best):
+            best = path
+    name = os.path.relpath(filename, best) if best else os.path.basename(filename)
+    name = os.path.splitext(name)[0].replace(os.sep, ".")
+    if name.endswith(".__init__"):
+        name = name[:-len(".__init__")]
+    return name or filename
+
+
+class MemoryProfiler:
+    """Opt-in memory growth profiler.
+
+    Takes periodic `tracemalloc` snapshots together with resident memory
+    and custom object counters (e.g. Qt widgets, chart points, log
+    messages) and attributes allocation growth since the first sample to
+    modules. Samples are appended as JSON lines to a file next to the run
+    data.
+    """
+
+    MaximumSampleCount: int = 1000
+
+    def __init__(self, interval: float = 600.0, frames: int = 1, top: int = 10) -> None:
+        self.interval: float = interval
+        self.frames: int = frames
+        self.top: int = top
+        self.counters: dict[str, Callable[[], int]] = {}
+        self.samples: collections.deque = collections.deque(maxlen=self.MaximumSampleCount)
+        self._lock = threading.RLock()
+        self._fp = None
+        self._baseline: Optional[tracemalloc.Snapshot] = None
+        self._started: bool = False
+        self._t0: float = 0.0
+
+    def add_counter(self, name: str, function: Callable[[], int]) -> None:
+        self.counters[name] = function
+
+    def is_active(self) -> bool:
+        return self._fp is not None
+
+    def start(self, filename: str) -> None:
+        """Start profiling, take baseline sample."""
+        with self._lock:
+            self.stop()
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(self.frames)
+                self._started = True
+            self._fp = open(filename, "a")
+            self._baseline = None
+            self._t0 = time.monotonic()
+            self.samples.clear()
+            logger.info("Memory profile written to %s", filename)
+        self.sample()
+
+    def stop(self) -> None:
+        with self._lock:
+            if self._fp is not None:
+                self._fp.close()
+                self._fp = None
+            if self._started:
+                tracemalloc.stop()
+                self._started = False
+            self._baseline = None
+
+    def snapshot(self) -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<unknown>"),
+        ))
+
+    def growth(self, snapshot: tracemalloc.Snapshot) -> list[tuple[str, int, int]]:
+        """Returns top allocation growth since baseline grouped by module as
+        list of (module, size difference, count difference).
+        """
+        if self._baseline is None:
+            return []
+        modules: dict[str, list[int]] = {}
+        for stat in snapshot.compare_to(self._baseline, "filename"):
+            name = module_name(stat.traceback[0].filename)
+            size, count = modules.setdefault(name, [0, 0])
+            modules[name] = [size + stat.size_diff, count + stat.count_diff]
+        items = sorted(modules.items(), key=lambda item: item[1][0], reverse=True)
+        return [(name, size, count) for name, (size, count) in items[:self.top]]
+
+    def sample(self) -> Optional[dict]:
+        """Take and record sample, returns sample or None if not active."""
+        with self._lock:
+            if self._fp is None:
+                return None
+            counters = {}
+            for name, function in self.counters.items():
+                try:
+                    counters[name] = function()
+                except Exception as exc:
+                    logger.exception(exc)
+            snapshot = self.snapshot()
+            traced, peak = tracemalloc.get_traced_memory()
+            sample = {
+                "time": time.time(),
+                "elapsed": time.monotonic() - self._t0,
+                "rss": resident_memory(),
+                "traced": traced,
+                "peak": peak,
+                "counters": counters,
+                "growth": self.growth(snapshot),
+            }
+            if self._baseline is None:
+                self._baseline = snapshot
+            self.samples.append(sample)
+            try:
+                self._fp.write(json.dumps(sample, separators=(",", ":")))
+                self._fp.write("\n")
+                self._fp.flush()
+            except Exception as exc:
+                logger.exception(exc)
+            return sample
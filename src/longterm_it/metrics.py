@@ -0,0 +1,312 @@
+import bisect
+import contextlib
+import http.server
+import logging
+import math
+import os
+import sys
+import threading
+import time
+from typing import Callable, Iterator, Optional
+
+__all__ = [
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "Registry",
+    "MetricsServer",
+    "registry",
+    "resident_memory",
+]
+
+logger = logging.getLogger(__name__)
+
+DefaultBuckets: tuple[float, ...] = (.001, .0025, .005, .01, .025, .05, .1, .25, .5, 1.0, 2.5, 5.0, 10.0)
+"""Default histogram buckets in seconds."""
+
+
+def resident_memory() -> int:
+    """Returns resident set size of current process in bytes, zero if not
+    available on this platform."""
+    try:
+        if sys.platform.startswith("linux"):
+            with open("/proc/self/statm") as f:
+                return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        if sys.platform == "win32":
+            import ctypes
+            import ctypes.wintypes
+
+            class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+                _fields_ = [
+                    ("cb", ctypes.wintypes.DWORD),
+                    ("PageFaultCount", ctypes.wintypes.DWORD),
+                    ("PeakWorkingSetSize", ctypes.c_size_t),
+                    ("WorkingSetSize", ctypes.c_size_t),
+                    ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                    ("PagefileUsage", ctypes.c_size_t),
+                    ("PeakPagefileUsage", ctypes.c_size_t),
+                ]
+
+            counters = PROCESS_MEMORY_COUNTERS()
+            counters.cb = ctypes.sizeof(counters)
+            handle = ctypes.windll.kernel32.GetCurrentProcess()  # type: ignore
+            if ctypes.windll.psapi.GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb):  # type: ignore
+                return int(counters.WorkingSetSize)
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    except Exception:
+        return 0
+
+
+def format_labels(labels: dict) -> str:
+    """Returns labels in Prometheus text format.
+
+    >>> format_labels({"resource": "smu"})
+    '{resource="smu"}'
+    """
+    if not labels:
+        return ""
+    items = []
+    for key, value in sorted(labels.items()):
+        value = format(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+        items.append(f"{key}=\"{value}\"")
+    return "{" + ",".join(items) + "}"
+
+
+def format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+class Metric:
+
+    type: str = "untyped"
+
+    def __init__(self, name: str, help: str, labels: Optional[dict] = None) -> None:
+        self.name: str = name
+        self.help: str = help
+        self.labels: dict = dict(labels or {})
+        self._lock = threading.Lock()
+
+    def samples(self) -> list[tuple[str, dict, float]]:
+        """Returns list of (name, labels, value) samples."""
+        return []
+
+
+class Counter(Metric):
+    """Monotonically increasing counter."""
+
+    type = "counter"
+
+    def __init__(self, name: str, help: str, labels: Optional[dict] = None) -> None:
+        super().__init__(name, help, labels)
+        self._value: float = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value += amount
+
+    def value(self) -> float:
+        return self._value
+
+    def samples(self) -> list[tuple[str, dict, float]]:
+        return [(self.name, self.labels, self._value)]
+
+
+class Gauge(Metric):
+    """Value that can go up and down, optionally evaluated on collection."""
+
+    type = "gauge"
+
+    def __init__(self, name: str, help: str, labels: Optional[dict] = None) -> None:
+        super().__init__(name, help, labels)
+        self._value: float = 0.0
+        self._function: Optional[Callable[[], float]] = None
+
+    def set(self, value: float) -> None:
+        with self._lock:
+            self._value = value
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value -= amount
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        """Evaluate `function` on every collection."""
+        self._function = function
+
+    def value(self) -> float:
+        if self._function is not None:
+            return float(self._function())
+        return self._value
+
+    def samples(self) -> list[tuple[str, dict, float]]:
+        return [(self.name, self.labels, self.value())]
+
+
+class Histogram(Metric):
+    """Cumulative histogram with fixed upper bounds."""
+
+    type = "histogram"
+
+    def __init__(self, name: str, help: str, labels: Optional[dict] = None, buckets: tuple[float, ...] = DefaultBuckets) -> None:
+        super().__init__(name, help, labels)
+        self.buckets: tuple[float, ...] = tuple(sorted(buckets))
+        self._counts: list[int] = [0] * (len(self.buckets) + 1)
+        self._sum: float = 0.0
+        self._count: int = 0
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+            self._count += 1
+
+    @contextlib.contextmanager
+    def time(self) -> Iterator[None]:
+        """Observe duration of context in seconds."""
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - t0)
+
+    def count(self) -> int:
+        return self._count
+
+    def sum(self) -> float:
+        return self._sum
+
+    def mean(self) -> float:
+        with self._lock:
+            return self._sum / self._count if self._count else math.nan
+
+    def samples(self) -> list[tuple[str, dict, float]]:
+        with self._lock:
+            counts = list(self._counts)
+            total, count = self._sum, self._count
+        samples = []
+        cumulative = 0
+        for bound, value in zip(self.buckets + (math.inf,), counts):
+            cumulative += value
+            samples.append((f"{self.name}_bucket", {**self.labels, "le": format_value(bound)}, cumulative))
+        samples.append((f"{self.name}_sum", self.labels, total))
+        samples.append((f"{self.name}_count", self.labels, count))
+        return samples
+
+
+class Registry:
+    """Collection of metrics, identified by name and labels."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[tuple, Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, cls, name: str, help: str, labels: Optional[dict], **kwargs) -> Metric:
+        key = name, tuple(sorted((labels or {}).items()))
+        with self._lock:
+            metric = self._metrics.get(key)
+            if metric is None:
+                metric = cls(name, help, labels, **kwargs)
+                self._metrics[key] = metric
+            elif not isinstance(metric, cls):
+                raise TypeError(f"metric {name!r} already registered as {metric.type}")
+            return metric
+
+    def counter(self, name: str, help: str = "", labels: Optional[dict] = None) -> Counter:
+        return self._get(Counter, name, help, labels)  # type: ignore
+
+    def gauge(self, name: str, help: str = "", labels: Optional[dict] = None) -> Gauge:
+        return self._get(Gauge, name, help, labels)  # type: ignore
+
+    def histogram(self, name: str, help: str = "", labels: Optional[dict] = None, buckets: tuple[float, ...] = DefaultBuckets) -> Histogram:
+        return self._get(Histogram, name, help, labels, buckets=buckets)  # type: ignore
+
+    def metrics(self) -> list[Metric]:
+        with self._lock:
+            return list(self._metrics.values())
+
+    def clear(self) -> None:
+        with self._lock:
+            self._metrics.clear()
+
+    def expose(self) -> str:
+        """Returns all metrics in Prometheus text exposition format."""
+        families: dict[str, list[Metric]] = {}
+        for metric in self.metrics():
+            families.setdefault(metric.name, []).append(metric)
+        lines = []
+        for name, metrics in sorted(families.items()):
+            lines.append(f"# HELP {name} {metrics[0].help}")
+            lines.append(f"# TYPE {name} {metrics[0].type}")
+            for metric in metrics:
+                for sample_name, labels, value in metric.samples():
+                    lines.append(f"{sample_name}{format_labels(labels)} {format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+"""Default application metrics registry."""
+
+registry.gauge(
+    "longterm_process_resident_memory_bytes",
+    "Resident memory size in bytes.",
+).set_function(resident_memory)
+
+registry.gauge(
+    "longterm_process_start_time_seconds",
+    "Start time of the process since unix epoch in seconds.",
+).set(time.time())
+
+
+class MetricsRequestHandler(http.server.BaseHTTPRequestHandler):
+
+    registry: Registry = registry
+
+    def do_GET(self) -> None:
+        if self.path.split("?")[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        data = self.registry.expose().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", format(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args) -> None:
+        logger.debug("metrics: %s", format % args)
+
+
+class MetricsServer:
+    """Serves registry on a local HTTP endpoint in Prometheus text format."""
+
+    def __init__(self, port: int, host: str = "localhost", registry: Registry = registry) -> None:
+        handler = type("Handler", (MetricsRequestHandler,), {"registry": registry})
+        self.server = http.server.ThreadingHTTPServer((host, port), handler)
+        self.server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    def server_address(self) -> tuple:
+        return self.server.server_address
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        logger.info("metrics serving on http://%s:%s/metrics", *self.server_address()[:2])
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
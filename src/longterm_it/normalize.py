@@ -0,0 +1,173 @@
+"""Temperature normalization of sensor leakage current.
+
+Leakage current scales with temperature T (Kelvin) as
+
+    I(T) ~ T^2 exp(-Eg / (2 k T))
+
+using the effective band gap energy Eg, so a current measured at T is
+normalized to the reference temperature Tr by
+
+    I(Tr) = I(T) (Tr / T)^2 exp(-Eg / (2 k) (1 / Tr - 1 / T))
+"""
+
+import csv
+import math
+import re
+from typing import Iterable, Optional
+
+from .archive import open_text
+
+__all__ = [
+    "DefaultBandGap",
+    "DefaultReferenceTemperature",
+    "normalize_current",
+    "normalize_channels",
+    "normalize_file",
+]
+
+BoltzmannConstant: float = 8.617333262e-5
+"""Boltzmann constant in eV/K."""
+
+DefaultBandGap: float = 1.21
+"""Effective silicon band gap energy in eV."""
+
+DefaultReferenceTemperature: float = 20.0
+"""Reference temperature in °C."""
+
+ZeroCelsius: float = 273.15
+
+
+def normalize_current(
+    current,
+    temperature,
+    reference: float = DefaultReferenceTemperature,
+    band_gap: float = DefaultBandGap,
+):
+    """Returns current(s) normalized from temperature(s) in °C to reference
+    temperature, accepts scalars or sequences (returning a list). Results
+    are NaN where the temperature is unknown.
+    """
+    if isinstance(current, (int, float)) and isinstance(temperature, (int, float)):
+        return current * normalize_factor(temperature, reference, band_gap)
+    return [value * normalize_factor(t, reference, band_gap) for value, t in zip(current, temperature)]
+
+
+def normalize_factor(
+    temperature: float,
+    reference: float = DefaultReferenceTemperature,
+    band_gap: float = DefaultBandGap,
+) -> float:
+    """Returns normalization factor for temperature in °C, NaN if the
+    temperature is unknown or not above absolute zero."""
+    t = float(temperature) + ZeroCelsius
+    tr = reference + ZeroCelsius
+    if not t > 0:
+        return math.nan
+    try:
+        return (tr / t) ** 2 * math.exp(-band_gap / (2 * BoltzmannConstant) * (1 / tr - 1 / t))
+    except OverflowError:
+        return math.inf
+
+
+def normalize_channels(
+    channels: dict,
+    reference: float = DefaultReferenceTemperature,
+    band_gap: float = DefaultBandGap,
+) -> None:
+    """Add normalized current `I_norm` to channel readings in place, using
+    PT100 temperature `temp` of each channel."""
+    if not channels:
+        return
+    keys = list(channels.keys())
+    currents = [channels[key].get("I", math.nan) for key in keys]
+    temperatures = [channels[key].get("temp", math.nan) for key in keys]
+    normalized = normalize_current(currents, temperatures, reference, band_gap)
+    for key, value in zip(keys, normalized):
+        channels[key]["I_norm"] = value
+
+
+def normalized_filename(filename: str) -> str:
+    """Returns output filename for bulk normalization.
+
+    >>> normalized_filename("it-2024-01-01T00-00-00.txt.gz")
+    'it-2024-01-01T00-00-00-norm.txt'
+    """
+    basename = re.sub(r"\.txt(?:\.gz|\.zst)?$", "", filename)
+    return f"{basename}-norm.txt"
+
+
+def column_pairs(header: list[str]) -> list[tuple[int, int, str]]:
+    """Returns (current column, temperature column, normalized column name)
+    for combined run files and per sensor files."""
+    pairs = []
+    for index, name in enumerate(header):
+        match = re.match(r"^current(_\d+)? \[A\]$", name)
+        if match:
+            suffix = match.group(1) or ""
+            temperature = f"pt100{suffix} [°C]"
+            if temperature in header:
+                pairs.append((index, header.index(temperature), f"current_norm{suffix} [A]"))
+    return pairs
+
+
+def normalize_file(
+    filename: str,
+    output: Optional[str] = None,
+    reference: float = DefaultReferenceTemperature,
+    band_gap: float = DefaultBandGap,
+    block_size: int = 10000,
+) -> str:
+    """Write copy of (optionally compressed) It or IV file with normalized
+    current columns added, or replaced if present. Returns output filename.
+    """
+    if output is None:
+        output = normalized_filename(filename)
+    with open_text(filename) as fp, open(output, "w", newline="") as out:
+        reader = csv.reader(fp)
+        writer = csv.writer(out)
+        for row in reader:
+            if not row:
+                break
+            if row[0].startswith(("reference temperature [°C]:", "band gap [eV]:")):
+                continue
+            writer.writerow(row)
+        writer.writerows([
+            [f"reference temperature [°C]: {reference}"],
+            [f"band gap [eV]: {band_gap}"],
+            [],
+        ])
+        header = next(reader, [])
+        pairs = column_pairs(header)
+        names = [name for _, _, name in pairs]
+        kept = [index for index, name in enumerate(header) if name not in names]
+        writer.writerow([header[index] for index in kept] + names)
+        for block in blocks(reader, block_size):
+            rows = [row for row in block if row]
+            if not rows:
+                continue
+            columns = []
+            for current, temperature, _ in pairs:
+                currents = [to_float(row[current]) for row in rows]
+                temperatures = [to_float(row[temperature]) for row in rows]
+                columns.append(normalize_current(currents, temperatures, reference, band_gap))
+            for i, row in enumerate(rows):
+                writer.writerow([row[index] for index in kept] + [format(column[i], "E") for column in columns])
+    return output
+
+
+def blocks(rows: Iterable[list[str]], size: int):
+    block = []
+    for row in rows:
+        block.append(row)
+        if len(block) >= size:
+            yield block
+            block = []
+    if block:
+        yield block
+
+
+def to_float(value: str) -> float:
+    try:
+        return float(value)
+    except ValueError:
+        return math.nan
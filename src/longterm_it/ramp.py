@@ -0,0 +1,241 @@
+"""Adaptive voltage ramp and settling for IV measurements.
+
+The step is widened while the channel currents follow a smooth curve and
+narrowed back to the base step near rapid change or compliance. Smoothness
+is measured as the relative deviation of each current from the linear
+extrapolation of the previous two steps.
+
+After a voltage step the current is polled until the relative change over
+a window of readings falls below a threshold, the configured delay is
+the upper bound.
+
+Ramps without multimeter scans can run as K2410 list sweeps, the points
+are split into chunks fitting the instrument source list.
+"""
+
+import collections
+import math
+from typing import Callable, Iterator, Optional
+
+from .clock import Clock
+
+__all__ = [
+    "AdaptiveRamp",
+    "DefaultRampDownSlewRate",
+    "DefaultRampDownStep",
+    "DefaultSettleInterval",
+    "DefaultSettleThreshold",
+    "DefaultSettleWindow",
+    "RelaySafeVoltage",
+    "SweepListSize",
+    "linear_points",
+    "parse_smu_readings",
+    "sweep_chunks",
+    "wait_settled",
+]
+
+DefaultSettleThreshold: float = 0.01
+"""Relative current change over the window."""
+
+DefaultSettleWindow: int = 3
+"""Number of compared readings."""
+
+DefaultSettleInterval: float = 0.1
+"""Seconds between readings."""
+
+DefaultRampDownStep: float = 10.0
+"""Voltage step ramping down to zero."""
+
+DefaultRampDownSlewRate: float = 100.0
+"""Maximum dV/dt ramping down to zero in V/s, 10 s from 1000 V."""
+
+RelaySafeVoltage: float = 10.0
+"""Maximum absolute SMU voltage for switching off HV relays while ramping
+down."""
+
+SweepListSize: int = 100
+"""Maximum number of points of a K2410 source list."""
+
+SmuReadingElements: int = 5
+"""Elements per K2410 reading: voltage, current, resistance, time, status."""
+
+
+class AdaptiveRamp:
+    """Iterates voltages from `start` to `end` with adaptive step size.
+
+    The step never falls below the base `step` and never exceeds
+    `max_step`. The slew rate is limited to `max_slew_rate` (V/s) by
+    extending the settle delay of wide steps.
+
+    >>> ramp = AdaptiveRamp(0, -800, 5, delay=1.0, max_step=50, max_slew_rate=10)
+    >>> for voltage in ramp:
+    ...     set_voltage(voltage)
+    ...     sleep(ramp.delay)
+    ...     ramp.update(read_currents(), compliance)
+    """
+
+    DefaultMaxStep: float = 50.0
+    DefaultMaxSlewRate: float = 10.0
+    DefaultTolerance: float = 0.05
+    DefaultGrowth: float = 1.5
+    ComplianceFraction: float = 0.5
+    """Fraction of compliance at which the base step is used."""
+
+    def __init__(
+        self,
+        start: float,
+        end: float,
+        step: float,
+        delay: float,
+        max_step: float = DefaultMaxStep,
+        max_slew_rate: float = DefaultMaxSlewRate,
+        tolerance: float = DefaultTolerance,
+        growth: float = DefaultGrowth,
+        min_current: float = 1e-9,
+    ) -> None:
+        self.start: float = start
+        self.end: float = end
+        self.base_step: float = abs(step)
+        self.base_delay: float = delay
+        self.max_step: float = max(abs(max_step), self.base_step)
+        self.max_slew_rate: float = max_slew_rate
+        self.tolerance: float = tolerance
+        self.growth: float = growth
+        self.min_current: float = min_current
+        self.direction: float = 1.0 if end >= start else -1.0
+        self.step: float = self.base_step
+        self.voltage: float = start
+        self.delay: float = delay
+        self.min_delay: float = 0.0
+        self.steps: int = 0
+        self.total_delay: float = 0.0
+        self._history: dict[int, list[tuple[float, float]]] = {}
+
+    def __iter__(self) -> Iterator[float]:
+        while True:
+            voltage = self.next()
+            if voltage is None:
+                break
+            yield voltage
+
+    def next(self) -> Optional[float]:
+        """Returns next voltage or None if end voltage was reached."""
+        remaining = (self.end - self.voltage) * self.direction
+        if not self.steps:
+            step = 0.0  # start voltage
+        elif remaining <= 1e-9:
+            return None
+        else:
+            step = min(self.step, remaining)
+        self.voltage += step * self.direction
+        self.min_delay = step / self.max_slew_rate if self.max_slew_rate > 0 else 0.0
+        self.delay = max(self.base_delay, self.min_delay)
+        self.total_delay += self.delay
+        self.steps += 1
+        return self.voltage
+
+    def update(self, currents: dict, compliance: Optional[float] = None) -> None:
+        """Adjust step using channel currents (index to current) measured at
+        the last voltage."""
+        deviation = 0.0
+        near_compliance = False
+        for index, current in currents.items():
+            if current is None or math.isnan(current):
+                continue
+            if compliance and abs(current) > compliance * self.ComplianceFraction:
+                near_compliance = True
+            history = self._history.setdefault(index, [])
+            history.append((self.voltage, current))
+            del history[:-3]
+            deviation = max(deviation, self.deviation(history))
+        if near_compliance or deviation > 2 * self.tolerance:
+            self.step = self.base_step
+        elif deviation < self.tolerance:
+            self.step = min(self.step * self.growth, self.max_step)
+
+    def deviation(self, history: list[tuple[float, float]]) -> float:
+        """Returns relative deviation of last current from linear
+        extrapolation of the previous two points."""
+        if len(history) < 3:
+            return math.inf
+        (u0, i0), (u1, i1), (u2, i2) = history
+        if u1 == u0:
+            return math.inf
+        predicted = i1 + (i1 - i0) * (u2 - u1) / (u1 - u0)
+        return abs(i2 - predicted) / max(abs(i2), self.min_current)
+
+    def fixed_steps(self) -> int:
+        """Returns number of steps of the fixed base step grid."""
+        return math.ceil(abs(self.end - self.start) / self.base_step - 1e-9) + 1
+
+    def report(self, elapsed: float) -> dict:
+        """Returns summary comparing `elapsed` ramp time with the estimated
+        time of the fixed base step grid."""
+        overhead = max(0.0, elapsed - self.total_delay) / self.steps if self.steps else 0.0
+        fixed = self.fixed_steps() * (self.base_delay + overhead)
+        return {
+            "steps": self.steps,
+            "fixed_steps": self.fixed_steps(),
+            "elapsed": elapsed,
+            "fixed_estimate": fixed,
+            "saved": fixed - elapsed,
+        }
+
+
+def wait_settled(
+    read: Callable[[], float],
+    clock: Clock,
+    timeout: float,
+    minimum: float = 0.0,
+    threshold: float = DefaultSettleThreshold,
+    window: int = DefaultSettleWindow,
+    interval: float = DefaultSettleInterval,
+    min_current: float = 1e-9,
+) -> tuple[float, bool]:
+    """Poll current using `read` until the relative change of the last
+    `window` readings falls below `threshold`, waiting at least `minimum`
+    and at most `timeout` seconds. Returns elapsed time and whether the
+    current settled.
+    """
+    t0 = clock.monotonic()
+    readings: collections.deque = collections.deque(maxlen=max(2, window))
+    while True:
+        readings.append(read())
+        elapsed = clock.monotonic() - t0
+        if len(readings) == readings.maxlen and elapsed >= minimum:
+            spread = max(readings) - min(readings)
+            mean = sum(readings) / len(readings)
+            if spread / max(abs(mean), min_current) < threshold:
+                return elapsed, True
+        if elapsed >= timeout:
+            return elapsed, False
+        clock.sleep(min(interval, timeout - elapsed))
+
+
+def linear_points(start: float, end: float, step: float) -> list[float]:
+    """Returns voltages of a linear ramp from `start` (excluded) to `end`
+    (included).
+
+    >>> linear_points(0, -12, 5)
+    [-5.0, -10.0, -12.0]
+    """
+    step = abs(step)
+    direction = 1.0 if end >= start else -1.0
+    count = math.ceil(abs(end - start) / step - 1e-9) if step else 0
+    points = [start + direction * step * index for index in range(1, count)]
+    if end != start:
+        points.append(float(end))
+    return points
+
+
+def sweep_chunks(start: float, end: float, step: float, size: int = SweepListSize) -> list[list[float]]:
+    """Returns voltages of `linear_points` split into chunks of at most
+    `size` points."""
+    points = linear_points(start, end, step)
+    return [points[index:index + size] for index in range(0, len(points), size)]
+
+
+def parse_smu_readings(response: str, elements: int = SmuReadingElements) -> list[tuple[float, float]]:
+    """Returns list of (voltage, current) of buffered K2410 readings."""
+    values = [float(value) for value in response.split(",") if value.strip()]
+    return [(values[index], values[index + 1]) for index in range(0, len(values) - elements + 1, elements)]
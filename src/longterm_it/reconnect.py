@@ -0,0 +1,121 @@
+"""Reconnect policy with exponential backoff and circuit breaker.
+
+Failed connections are retried after exponentially growing, jittered
+delays. After a number of consecutive failures the circuit opens, further
+errors are counted instead of reported until the next successful
+connection closes the circuit again. Reachability of TCP socket resources
+is probed with a plain connect before the VISA resource is opened.
+"""
+
+import random
+import re
+import socket
+from typing import Optional
+
+__all__ = ["CircuitState", "ReconnectPolicy", "parse_tcp_address", "probe_tcp"]
+
+
+class CircuitState:
+    CLOSED: str = "CLOSED"
+    OPEN: str = "OPEN"
+    HALF_OPEN: str = "HALF_OPEN"
+
+
+class ReconnectPolicy:
+    """Backoff delays and circuit state of a reconnecting worker.
+
+    >>> policy = ReconnectPolicy()
+    >>> while True:
+    ...     policy.attempt()
+    ...     try:
+    ...         connect()
+    ...     except Exception as exc:
+    ...         sleep(policy.failure())
+    ...     else:
+    ...         policy.success()
+    """
+
+    DefaultInitialDelay: float = 1.0
+    DefaultMaxDelay: float = 300.0
+    DefaultFactor: float = 2.0
+    DefaultJitter: float = 0.2
+    DefaultThreshold: int = 3
+
+    def __init__(
+        self,
+        initial_delay: float = DefaultInitialDelay,
+        max_delay: float = DefaultMaxDelay,
+        factor: float = DefaultFactor,
+        jitter: float = DefaultJitter,
+        threshold: int = DefaultThreshold,
+        rng: Optional[random.Random] = None,
+    ) -> None:
+        self.initial_delay: float = initial_delay
+        self.max_delay: float = max(max_delay, initial_delay)
+        self.factor: float = factor
+        self.jitter: float = jitter
+        self.threshold: int = max(1, threshold)
+        self.rng: random.Random = rng or random.Random()
+        self.state: str = CircuitState.CLOSED
+        self.failures: int = 0
+        self.suppressed: int = 0
+
+    def delay(self) -> float:
+        """Returns delay before the next attempt, without jitter."""
+        if not self.failures:
+            return 0.0
+        return min(self.initial_delay * self.factor ** (self.failures - 1), self.max_delay)
+
+    def attempt(self) -> None:
+        """Mark start of an attempt, an open circuit becomes half open."""
+        if self.state == CircuitState.OPEN:
+            self.state = CircuitState.HALF_OPEN
+
+    def failure(self) -> float:
+        """Record failed attempt, returns jittered delay in seconds."""
+        self.failures += 1
+        if self.failures >= self.threshold:
+            self.state = CircuitState.OPEN
+        delay = self.delay()
+        return max(0.0, delay * (1.0 + self.rng.uniform(-self.jitter, self.jitter)))
+
+    def success(self) -> None:
+        """Record successful attempt, closes the circuit."""
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self.suppressed = 0
+
+    def report(self) -> bool:
+        """Returns True if the last failure should be reported: the first
+        failure and the one opening the circuit. Other failures are counted
+        as suppressed."""
+        if self.failures in (1, self.threshold):
+            return True
+        self.suppressed += 1
+        return False
+
+
+def parse_tcp_address(resource_name: str) -> Optional[tuple[str, int]]:
+    """Returns host and port of a VISA TCP socket resource name, else None.
+
+    >>> parse_tcp_address("TCPIP::localhost::1080::SOCKET")
+    ('localhost', 1080)
+    """
+    m = re.match(r"TCPIP\d*::([^:]+)::(\d+)::SOCKET$", resource_name.strip(), re.IGNORECASE)
+    if m:
+        return m.group(1), int(m.group(2))
+    return None
+
+
+def probe_tcp(resource_name: str, timeout: float) -> None:
+    """Probe reachability of a TCP socket resource with a plain connect,
+    raises ConnectionError if unreachable. Other resources are not
+    probed."""
+    address = parse_tcp_address(resource_name)
+    if address is None:
+        return
+    try:
+        with socket.create_connection(address, timeout=timeout):
+            pass
+    except OSError as exc:
+        raise ConnectionError(f"{resource_name} not reachable: {exc}") from exc
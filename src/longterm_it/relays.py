@@ -0,0 +1,96 @@
+"""ShuntBox HV relay switching.
+
+The ShuntBox only documents single channel and `ALL` relay commands, so
+relays are switched channel by channel, or with `ALL` if every channel
+ends up in the same state. Only relays differing from the state read back
+with `GET:REL ALL` are switched. After switching, the states are read back
+again and mismatching relays are switched once more, a relay still not in
+the desired state raises an error instead of being reported as switched.
+
+Kept free of the instrument framework so the switching logic can be used
+with any resource providing `query`.
+"""
+
+from typing import Iterable
+
+__all__ = ["RelaysMixin"]
+
+
+class RelaysMixin:
+    """Relay commands of a ShuntBox driver, requires `resource`."""
+
+    CHANNELS: int = 10
+    """Number of instrument channels."""
+
+    def check_index(self, index: int) -> None:
+        if not 0 < index <= type(self).CHANNELS:
+            raise ValueError(f"invalid channel index: {index}")
+
+    def set_relay(self, index: int, enabled: bool) -> None:
+        """Enable or disable a single channel relais."""
+        self.check_index(index)
+        mode = "ON" if enabled else "OFF"
+        result = self.resource.query(f"SET:REL_{mode} {index:d}").strip()
+        if result != "OK":
+            raise RuntimeError(f"returned unexpected value: {result!r}")
+
+    def set_all_relays(self, enabled: bool) -> None:
+        """Enable or disable all relays."""
+        result = self.resource.query("SET:REL_{} ALL".format("ON" if enabled else "OFF")).strip()
+        if result != "OK":
+            raise RuntimeError(f"returned unexpected value: {result!r}")
+
+    def relays(self) -> dict[int, bool]:
+        """Returns states of all channel relays by channel index."""
+        result = self.resource.query("GET:REL ALL").strip()
+        values = [value.strip() for value in result.split(",") if value.strip()][:type(self).CHANNELS]  # avoid trailing commas
+        return {index: value == "1" for index, value in enumerate(values, 1)}
+
+    def set_relays(self, indices: Iterable[int], enabled: bool) -> None:
+        """Enable or disable a list of channel relays, switching all channels
+        are verified by reading back their states."""
+        indices = sorted(set(indices))
+        for index in indices:
+            self.check_index(index)
+        if len(indices) == type(self).CHANNELS:
+            self.set_all_relays(enabled)
+        else:
+            for index in indices:
+                self.set_relay(index, enabled)
+        if indices:
+            self.verify_relays({index: enabled for index in indices})
+
+    def update_relays(self, states: dict[int, bool]) -> dict[int, bool]:
+        """Switch relays to desired `states` (channel index to state), only
+        relays differing from the state read back are switched. Returns
+        changed states."""
+        for index in states:
+            self.check_index(index)
+        actual = self.relays()
+        changes = {index: bool(enabled) for index, enabled in states.items() if actual.get(index) != bool(enabled)}
+        if not changes:
+            return changes
+        target = {**actual, **changes}
+        values = set(target.values())
+        if len(target) == type(self).CHANNELS and len(values) == 1:
+            self.set_all_relays(values.pop())
+        else:
+            for index, enabled in sorted(changes.items()):
+                self.set_relay(index, enabled)
+        self.verify_relays(changes)
+        return changes
+
+    def verify_relays(self, states: dict[int, bool]) -> None:
+        """Read back relay states, switch mismatching relays once more and
+        raise RuntimeError if they still do not match."""
+        mismatches = self.mismatching_relays(states)
+        for index in mismatches:
+            self.set_relay(index, states[index])
+        if mismatches:
+            mismatches = self.mismatching_relays(states)
+            if mismatches:
+                raise RuntimeError(f"failed to switch relays: {', '.join(format(index, 'd') for index in mismatches)}")
+
+    def mismatching_relays(self, states: dict[int, bool]) -> list[int]:
+        actual = self.relays()
+        return [index for index, enabled in sorted(states.items()) if actual.get(index) != enabled]
@@ -2,6 +2,9 @@ from typing import Optional
 
 import pyvisa
 
+from .metrics import registry
+from .tracing import tracer
+
 
 class Resource:
 
@@ -15,6 +18,21 @@ class Resource:
     def __enter__(self):
         rm = pyvisa.ResourceManager(self.visa_library)
         self.resource = rm.open_resource(self.resource_name, **self.options)
+        self.write_latency = registry.histogram(
+            "longterm_scpi_duration_seconds",
+            "SCPI round trip duration in seconds.",
+            {"resource": self.resource_name, "operation": "write"},
+        )
+        self.read_latency = registry.histogram(
+            "longterm_scpi_duration_seconds",
+            "SCPI round trip duration in seconds.",
+            {"resource": self.resource_name, "operation": "read"},
+        )
+        self.query_latency = registry.histogram(
+            "longterm_scpi_duration_seconds",
+            "SCPI round trip duration in seconds.",
+            {"resource": self.resource_name, "operation": "query"},
+        )
         return self
 
     def __exit__(self, *exc):
@@ -23,16 +41,25 @@ class Resource:
         return False
 
     def write_raw(self, *args) -> int:
-        return self.resource.write_raw(*args)
+        with self.write_latency.time(), tracer.span("write_raw", "scpi", resource=self.resource_name):
+            return self.resource.write_raw(*args)
 
     def write(self, *args) -> int:
-        return self.resource.write(*args)
+        with self.write_latency.time(), tracer.span(format(args[0]) if args else "write", "scpi", resource=self.resource_name):
+            return self.resource.write(*args)
 
     def read_bytes(self, *args) -> bytes:
-        return self.resource.read_bytes(*args)
+        with self.read_latency.time(), tracer.span("read_bytes", "scpi", resource=self.resource_name):
+            return self.resource.read_bytes(*args)
 
     def read(self, *args) -> str:
-        return self.resource.read(*args)
+        with self.read_latency.time(), tracer.span("read", "scpi", resource=self.resource_name):
+            return self.resource.read(*args)
+
+    def clear(self) -> None:
+        with tracer.span("clear", "scpi", resource=self.resource_name):
+            self.resource.clear()
 
     def query(self, *args) -> str:
-        return self.resource.query(*args)
+        with self.query_latency.time(), tracer.span(format(args[0]) if args else "query", "scpi", resource=self.resource_name):
+            return self.resource.query(*args)
@@ -0,0 +1,94 @@
+"""Adaptive It sampling interval.
+
+The interval is stretched up to a maximum while all channels are stable,
+and falls back to the base interval as soon as a channel current or
+temperature moves, an HV relay changes or the climate chamber status,
+program or temperature changes.
+"""
+
+import math
+from typing import Optional
+
+__all__ = ["AdaptiveInterval"]
+
+
+class AdaptiveInterval:
+    """Sampling interval policy for It measurements.
+
+    >>> policy = AdaptiveInterval(interval=10, max_interval=600)
+    >>> interval = policy.update(channels, environ)
+    >>> while waiting and not policy.environ_changed(environ): ...
+    """
+
+    DefaultMaxInterval: float = 600.0
+    DefaultTolerance: float = 0.01
+    DefaultTemperatureTolerance: float = 0.5
+    DefaultGrowth: float = 2.0
+
+    def __init__(
+        self,
+        interval: float,
+        max_interval: float = DefaultMaxInterval,
+        tolerance: float = DefaultTolerance,
+        temperature_tolerance: float = DefaultTemperatureTolerance,
+        growth: float = DefaultGrowth,
+        min_current: float = 1e-9,
+    ) -> None:
+        self.base_interval: float = interval
+        self.max_interval: float = max(max_interval, interval)
+        self.tolerance: float = tolerance
+        self.temperature_tolerance: float = temperature_tolerance
+        self.growth: float = growth
+        self.min_current: float = min_current
+        self.interval: float = interval
+        self.reason: Optional[str] = None
+        self._channels: dict[int, dict] = {}
+        self._environ: Optional[dict] = None
+
+    def update(self, channels: dict, environ: dict) -> float:
+        """Returns interval until next scan. `channels` maps sensor index to
+        channel reading with current `I`, temperature `temp` and HV status
+        `hv`, `environ` contains CTS `temperature`, `status` and `program`.
+        """
+        reason = self.channels_changed(channels) or self.environ_changed(environ)
+        self._channels = {index: dict(channel) for index, channel in channels.items()}
+        self._environ = dict(environ)
+        self.reason = reason
+        if reason:
+            self.interval = self.base_interval
+        else:
+            self.interval = min(self.interval * self.growth, self.max_interval)
+        return self.interval
+
+    def channels_changed(self, channels: dict) -> Optional[str]:
+        """Returns reason if any channel moved since the previous scan."""
+        if not self._channels:
+            return "first scan"
+        for index, channel in channels.items():
+            previous = self._channels.get(index)
+            if previous is None:
+                return f"channel {index} added"
+            if channel.get("hv") != previous.get("hv"):
+                return f"channel {index} HV changed"
+            current, last = channel.get("I", math.nan), previous.get("I", math.nan)
+            if abs(current - last) > self.tolerance * max(abs(last), self.min_current):
+                return f"channel {index} current changed"
+            temperature, last = channel.get("temp", math.nan), previous.get("temp", math.nan)
+            if abs(temperature - last) > self.temperature_tolerance:
+                return f"channel {index} temperature changed"
+        return None
+
+    def environ_changed(self, environ: dict) -> Optional[str]:
+        """Returns reason if climate chamber state changed since the
+        previous scan, may be called while waiting."""
+        previous = self._environ
+        if previous is None:
+            return None
+        if environ.get("status") != previous.get("status"):
+            return "CTS status changed"
+        if environ.get("program") != previous.get("program"):
+            return "CTS program changed"
+        temperature, last = environ.get("temperature", math.nan), previous.get("temperature", math.nan)
+        if abs(temperature - last) > self.temperature_tolerance:
+            return "CTS temperature changed"
+        return None
@@ -7,6 +7,7 @@ class Sensor:
     class State:
         OK: str = "OK"
         COMPL_ERR: str = "COMPL"
+        BREAKDOWN: str = "BREAK"
 
     def __init__(self, index: int) -> None:
         self.index: int = index
@@ -16,6 +17,10 @@ class Sensor:
         self.status: Optional[str] = None
         self.hv: Optional[bool] = None  # valid: None, True, False
         self.current: Optional[float] = None
+        self.current_norm: Optional[float] = None  # temperature normalized
         self.temperature: Optional[float] = None
         self.temperature_offset: float = 0.0
         self.resistivity: float = 0.0
+        self.statistics: Optional[dict] = None  # live It statistics
+        self.events: int = 0  # detected It anomalies
+        self.last_event: Optional[dict] = None
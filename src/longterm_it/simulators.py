@@ -0,0 +1,477 @@
+"""In-process instrument simulators plugging in at the resource level.
+
+Simulated resources provide the same interface as `Resource`, so drivers
+and workers run unmodified against them, without sockets or VISA. Latency
+models and results are reproducible from a seed.
+"""
+
+import math
+import random
+import re
+import time
+from typing import Callable, Optional
+
+__all__ = [
+    "LatencyModel",
+    "SimulatedSetup",
+    "SimulatedResource",
+    "K2410Simulator",
+    "K2700Simulator",
+    "ITCSimulator",
+    "ShuntBoxSimulator",
+    "create_resources",
+]
+
+
+class LatencyModel:
+    """Round trip latency model for simulated instruments.
+
+    zero:  no latency
+    fixed:  constant latency of `mean` seconds
+    normal:  gaussian distributed latency, truncated at zero
+    lognormal:  log-normal distributed latency with given mean, long tail
+    """
+
+    Kinds: tuple[str, ...] = ("zero", "fixed", "normal", "lognormal")
+
+    def __init__(self, kind: str = "zero", mean: float = 0.0, sigma: float = 0.0, seed: Optional[int] = None) -> None:
+        if kind not in self.Kinds:
+            raise ValueError(f"invalid latency model: {kind!r}")
+        self.kind: str = kind
+        self.mean: float = mean
+        self.sigma: float = sigma
+        self.rng = random.Random(seed)
+
+    @classmethod
+    def zero(cls) -> "LatencyModel":
+        return cls("zero")
+
+    @classmethod
+    def fixed(cls, mean: float) -> "LatencyModel":
+        return cls("fixed", mean)
+
+    @classmethod
+    def realistic(cls, mean: float = 0.005, sigma: float = 0.5, seed: Optional[int] = None) -> "LatencyModel":
+        """Returns log-normal latency model, `sigma` being the shape parameter."""
+        return cls("lognormal", mean, sigma, seed)
+
+    def sample(self) -> float:
+        """Returns next latency in seconds."""
+        if self.kind == "fixed":
+            return self.mean
+        if self.kind == "normal":
+            return max(0.0, self.rng.gauss(self.mean, self.sigma))
+        if self.kind == "lognormal":
+            if self.mean <= 0:
+                return 0.0
+            mu = math.log(self.mean) - self.sigma ** 2 / 2
+            return self.rng.lognormvariate(mu, self.sigma)
+        return 0.0
+
+
+def parse_bool(value: str) -> bool:
+    return value.strip().upper() in ("1", "ON", "TRUE")
+
+
+def parse_channel_list(value: str) -> list[int]:
+    """Returns channels of a SCPI channel list, including ranges.
+
+    >>> parse_channel_list("(@101:103,110)")
+    [101, 102, 103, 110]
+    """
+    channels = []
+    for first, last in re.findall(r"(\d+)(?::(\d+))?", value):
+        channels.extend(range(int(first), int(last or first) + 1))
+    return channels
+
+
+class SimulatedInstrument:
+    """Base class for simulated instruments answering text messages.
+
+    Settings written as `HEADER value` are stored and returned on `HEADER?`,
+    so configuration read back checks work for any command.
+    """
+
+    identity: str = "Simulated Instrument"
+
+    def __init__(self, setup: "SimulatedSetup") -> None:
+        self.setup = setup
+        self.settings: dict[str, str] = {}
+
+    @staticmethod
+    def normalize(header: str) -> str:
+        return header.strip().lstrip(":").upper()
+
+    def reset(self) -> None:
+        self.settings.clear()
+
+    def handle(self, message: str) -> Optional[str]:
+        """Handle message, returns response or None."""
+        message = message.strip()
+        if not message:
+            return None
+        header, _, value = message.partition(" ")
+        header = self.normalize(header)
+        if header == "*IDN?":
+            return self.identity
+        if header == "*RST":
+            self.reset()
+            return None
+        if header in ("*CLS", "*OPC"):
+            return None
+        if header == "*OPC?":
+            return "1"
+        if header in ("SYST:ERR?", "SYST:ERR:NEXT?"):
+            return "0,\"No error\""
+        if header.endswith("?"):
+            return self.settings.get(header[:-1], "0")
+        self.settings[header] = value.strip()
+        return None
+
+
+class K2410Simulator(SimulatedInstrument):
+    """Keithley 2410 source meter, total current of all connected sensors.
+
+    Supports list sweeps: in list mode the source level sets the bias level
+    present before and after the sweep, `:INIT` runs the sweep instantly and
+    `:FETC?` returns the buffered readings. Every level applied to the
+    enabled output is recorded in `trace`.
+    """
+
+    identity = "KEITHLEY INSTRUMENTS INC.,MODEL 2410,SIMULATED,C34"
+
+    def __init__(self, setup: "SimulatedSetup") -> None:
+        super().__init__(setup)
+        self.reset()
+
+    def reset(self) -> None:
+        super().reset()
+        self.voltage: float = 0.0
+        self.level: float = 0.0
+        self.mode: str = "FIX"
+        self.source_list: list[float] = []
+        self.trigger_count: int = 1
+        self.output: bool = False
+        self.compliance: float = 105e-6
+        self.operation_pending: bool = False
+        self.readings: list[str] = []
+        self.trace: list[float] = []
+
+    def apply(self, voltage: float) -> None:
+        self.voltage = voltage
+        if self.output:
+            self.trace.append(voltage)
+
+    def current(self) -> float:
+        if not self.output:
+            return 0.0
+        return sum(self.setup.channel_current(index) for index in self.setup.channels())
+
+    def reading(self) -> str:
+        current = max(-self.compliance, min(self.compliance, self.current()))
+        return f"{self.voltage:+E},{current:+E},+9.910000E+37,+0.000000E+00,+0.000000E+00"
+
+    def handle(self, message: str) -> Optional[str]:
+        header, _, value = message.strip().partition(" ")
+        header = self.normalize(header)
+        if header in ("SOUR:VOLT:LEV", "SOUR:VOLT"):
+            self.level = float(value)
+            self.apply(self.level)
+            return None
+        if header in ("SOUR:VOLT:LEV?", "SOUR:VOLT?"):
+            return format(self.level, "E")
+        if header == "SOUR:VOLT:MODE":
+            self.mode = value.strip().upper()[:4]
+            self.apply(self.level)
+            return None
+        if header == "SOUR:LIST:VOLT":
+            self.source_list = [float(item) for item in value.split(",")]
+            return None
+        if header == "TRIG:COUN":
+            self.trigger_count = int(value)
+            return None
+        if header == "*OPC":
+            self.operation_pending = True
+            return None
+        if header == "*CLS":
+            self.operation_pending = False
+            return None
+        if header == "*ESR?":
+            return format(int(self.operation_pending))
+        if header == "INIT":
+            self.readings = []
+            for index in range(self.trigger_count):
+                if self.mode == "LIST" and self.source_list:
+                    self.apply(self.source_list[index % len(self.source_list)])
+                self.readings.append(self.reading())
+            self.apply(self.level)
+            return None
+        if header in ("FETC?", "FETCH?"):
+            return ",".join(self.readings)
+        if header in ("OUTP", "OUTP:STAT"):
+            self.output = parse_bool(value)
+            self.apply(self.voltage)
+            return None
+        if header in ("OUTP?", "OUTP:STAT?"):
+            return format(int(self.output))
+        if header == "SENS:CURR:PROT:LEV":
+            self.compliance = float(value)
+            return None
+        if header == "SENS:CURR:PROT:LEV?":
+            return format(self.compliance, "E")
+        if header == "SENS:CURR:PROT:TRIP?":
+            return format(int(abs(self.current()) >= self.compliance))
+        if header in ("READ?", "MEAS:CURR?"):
+            return self.reading()
+        return super().handle(message)
+
+
+class K2700Simulator(SimulatedInstrument):
+    """Keithley 2700 multimeter scanning shunt voltages of sensor channels."""
+
+    identity = "KEITHLEY INSTRUMENTS INC.,MODEL 2700,SIMULATED,B10"
+
+    def __init__(self, setup: "SimulatedSetup", scan_time: float = 0.0) -> None:
+        super().__init__(setup)
+        self.scan_time: float = scan_time
+        self.scan_channels: list[int] = []
+        self.ready_at: float = 0.0
+        self.operation_pending: bool = False
+        self.readings: list[float] = []
+
+    def reset(self) -> None:
+        super().reset()
+        self.scan_channels = []
+        self.ready_at = 0.0
+        self.operation_pending = False
+        self.readings = []
+
+    def handle(self, message: str) -> Optional[str]:
+        header, _, value = message.strip().partition(" ")
+        header = self.normalize(header)
+        if header in ("ROUT:SCAN", "ROUTE:SCAN"):
+            self.scan_channels = parse_channel_list(value)
+            return None
+        if header == "*OPC":
+            self.operation_pending = True
+            return None
+        if header == "*CLS":
+            self.operation_pending = False
+            return None
+        if header == "INIT":
+            self.ready_at = self.setup.now() + self.scan_time
+            self.readings = [self.setup.shunt_voltage(channel % 100) for channel in self.scan_channels]
+            return None
+        if header == "*ESR?":
+            ready = self.operation_pending and self.setup.now() >= self.ready_at
+            return format(int(ready))
+        if header in ("FETC?", "FETCH?"):
+            return ",".join(f"{value:+.8E}VDC,+0.000SECS,+0.0000RDNG#" for value in self.readings)
+        if header == "READ?":
+            readings = [self.setup.shunt_voltage(channel % 100) for channel in self.scan_channels]
+            return ",".join(format(value, "E") for value in readings)
+        return super().handle(message)
+
+
+class ShuntBoxSimulator(SimulatedInstrument):
+    """HEPHY shunt box with HV relays and PT100 sensors."""
+
+    identity = "HEPHY ShuntBox Simulator"
+
+    def handle(self, message: str) -> Optional[str]:
+        message = message.strip()
+        if message == "*IDN?":
+            return self.identity
+        if message == "GET:UP ?":
+            return format(int(self.setup.now() - self.setup.start_time))
+        if message == "GET:RAM ?":
+            return "4242"
+        if message == "GET:TEMP ALL":
+            return ",".join(format(self.setup.channel_temperature(index), ".1f") for index in self.setup.channels()) + ","
+        m = re.match(r"GET:TEMP (\d+)$", message)
+        if m:
+            return format(self.setup.channel_temperature(int(m.group(1))), ".1f")
+        m = re.match(r"SET:REL_(ON|OFF) (\d+|ALL)$", message)
+        if m:
+            enabled = m.group(1) == "ON"
+            if m.group(2) == "ALL":
+                for index in self.setup.channels():
+                    self.setup.relays[index] = enabled
+            else:
+                self.setup.relays[int(m.group(2))] = enabled
+            return "OK"
+        if message == "GET:REL ALL":
+            return ",".join(format(int(self.setup.relays[index])) for index in self.setup.channels())
+        m = re.match(r"GET:REL (\d+)$", message)
+        if m:
+            return format(int(self.setup.relays[int(m.group(1))]))
+        return "ERR"
+
+
+class ITCSimulator(SimulatedInstrument):
+    """CTS climate chamber ITC controller."""
+
+    def __init__(self, setup: "SimulatedSetup") -> None:
+        super().__init__(setup)
+        self.running: bool = True
+        self.paused: bool = False
+        self.program: int = 0
+
+    def handle(self, message: str) -> Optional[str]:
+        message = message.strip()
+        rng = self.setup.rng
+        if message == "T":
+            return time.strftime("T%d%m%y%H%M%S", time.localtime(self.setup.wall_time()))
+        if message == "A0":
+            return f"A0 {self.setup.temperature + rng.uniform(-.05, .05):05.1f} {self.setup.temperature:05.1f}"
+        if message == "A1":
+            return f"A1 {self.setup.humidity + rng.uniform(-.25, .25):05.1f} {self.setup.humidity:05.1f}"
+        m = re.match(r"A([2-9:;<=>?])$", message)
+        if m:
+            return f"{message} {rng.uniform(0, 25):05.1f} {0:05.1f}"
+        if message == "S":
+            return f"S{int(self.running)}0000100\x06"
+        if message == "O":
+            return f"O11{int(self.paused)}0000000000"
+        if message == "P":
+            return f"P{self.program:03d}"
+        if re.match(r"P\d{3}$", message):
+            self.program = int(message[1:])
+            return message
+        if re.match(r"a\d\s+", message):
+            return "a"
+        return None
+
+
+class SimulatedSetup:
+    """Shared state of simulated instruments: sensors, relays and chamber.
+
+    Sensor leakage currents follow I = I0 * sqrt(|V| / 100 V) scaled by
+    temperature, with optional breakdown voltage per channel and relative
+    gaussian noise.
+    """
+
+    def __init__(
+        self,
+        channels: int = 10,
+        seed: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic,
+        wall_clock: Callable[[], float] = time.time,
+        leakage_current: float = 50e-9,
+        resistivity: float = 470e3,
+        noise: float = 0.01,
+        breakdown: Optional[dict[int, float]] = None,
+    ) -> None:
+        self.rng = random.Random(seed)
+        self.now = clock
+        self.wall_time = wall_clock
+        self.start_time: float = clock()
+        self.channel_count: int = channels
+        self.leakage_current: float = leakage_current
+        self.resistivity: float = resistivity
+        self.noise: float = noise
+        self.breakdown: dict[int, float] = dict(breakdown or {})
+        self.relays: dict[int, bool] = {index: False for index in self.channels()}
+        self.temperature: float = 20.0
+        self.humidity: float = 30.0
+        self.smu = K2410Simulator(self)
+        self.dmm = K2700Simulator(self)
+        self.shuntbox = ShuntBoxSimulator(self)
+        self.itc = ITCSimulator(self)
+
+    def channels(self) -> range:
+        return range(1, self.channel_count + 1)
+
+    def channel_temperature(self, index: int) -> float:
+        return self.temperature + 0.1 * index + self.rng.uniform(-.05, .05)
+
+    def channel_current(self, index: int) -> float:
+        """Returns leakage current of sensor channel in Ampere."""
+        if not self.relays.get(index) or not self.smu.output:
+            return 0.0
+        voltage = abs(self.smu.voltage)
+        current = self.leakage_current * math.sqrt(voltage / 100.0)
+        # Leakage current doubles about every 7 K
+        current *= 2 ** ((self.temperature - 20.0) / 7.0)
+        breakdown = self.breakdown.get(index)
+        if breakdown is not None and voltage > breakdown:
+            current *= math.exp(min((voltage - breakdown) / 10.0, 50.0))
+        current *= 1.0 + self.rng.gauss(0.0, self.noise)
+        return math.copysign(current, self.smu.voltage)
+
+    def shunt_voltage(self, index: int) -> float:
+        """Returns voltage drop over calibration resistor of channel."""
+        return self.channel_current(index) * self.resistivity
+
+
+class SimulatedResource:
+    """Drop-in replacement for `Resource` talking to a simulated instrument."""
+
+    def __init__(
+        self,
+        instrument: SimulatedInstrument,
+        latency: Optional[LatencyModel] = None,
+        sleep: Callable[[float], None] = time.sleep,
+        resource_name: str = "SIM::INSTR",
+    ) -> None:
+        self.instrument = instrument
+        self.latency: LatencyModel = latency or LatencyModel.zero()
+        self.sleep = sleep
+        self.resource_name: str = resource_name
+        self.visa_library: str = "@sim"
+        self.options: dict = {}
+        self._buffer: str = ""
+
+    def __enter__(self):
+        self._buffer = ""
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def _delay(self) -> None:
+        delay = self.latency.sample()
+        if delay > 0:
+            self.sleep(delay)
+
+    def write_raw(self, message: bytes) -> int:
+        return self.write(message.decode())
+
+    def write(self, message: str) -> int:
+        response = self.instrument.handle(message)
+        if response is not None:
+            self._buffer += response
+        return len(message)
+
+    def read_bytes(self, count: int) -> bytes:
+        self._delay()
+        data, self._buffer = self._buffer[:count], self._buffer[count:]
+        return data.encode()
+
+    def read(self) -> str:
+        self._delay()
+        data, self._buffer = self._buffer, ""
+        return data
+
+    def clear(self) -> None:
+        self._buffer = ""
+
+    def query(self, message: str) -> str:
+        self.write(message)
+        return self.read()
+
+
+def create_resources(
+    setup: Optional[SimulatedSetup] = None,
+    latency: Optional[LatencyModel] = None,
+    sleep: Callable[[float], None] = time.sleep,
+) -> dict[str, SimulatedResource]:
+    """Returns application resources connected to a simulated setup."""
+    if setup is None:
+        setup = SimulatedSetup()
+    return {
+        "smu": SimulatedResource(setup.smu, latency, sleep, "SIM::K2410"),
+        "multi": SimulatedResource(setup.dmm, latency, sleep, "SIM::K2700"),
+        "shunt": SimulatedResource(setup.shuntbox, latency, sleep, "SIM::SHUNTBOX"),
+        "cts": SimulatedResource(setup.itc, latency, sleep, "SIM::ITC"),
+    }
@@ -0,0 +1,228 @@
+"""Streaming per sensor statistics with constant memory per accumulator."""
+
+import collections
+import json
+import math
+from typing import Iterable, Optional
+
+from .sensor import Sensor
+
+__all__ = ["Welford", "EWMA", "WindowStatistics", "RunStatistics"]
+
+Quantities: dict[str, str] = {
+    "current": "I",
+    "current_norm": "I_norm",
+    "temperature": "temp",
+}
+"""Accumulated quantities and their channel reading keys."""
+
+Windows: dict[str, float] = {
+    "hour": 3600.0,
+    "day": 86400.0,
+}
+"""Time windows in seconds."""
+
+
+class Welford:
+    """Running count, mean, variance, min/max and linear drift (least
+    squares slope over time) using Welford's online algorithm. NaN values
+    are ignored.
+    """
+
+    def __init__(self) -> None:
+        self.count: int = 0
+        self.mean: float = math.nan
+        self.m2: float = 0.0
+        self.minimum: float = math.nan
+        self.maximum: float = math.nan
+        self._t_mean: float = 0.0
+        self._t_m2: float = 0.0
+        self._c: float = 0.0
+
+    def add(self, value: float, t: float = 0.0) -> None:
+        if value is None or math.isnan(value):
+            return
+        self.count += 1
+        if self.count == 1:
+            self.mean = value
+            self.minimum = value
+            self.maximum = value
+            self._t_mean = t
+            return
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+        t_delta = t - self._t_mean
+        self._t_mean += t_delta / self.count
+        self._t_m2 += t_delta * (t - self._t_mean)
+        self._c += t_delta * (value - self.mean)
+
+    @property
+    def variance(self) -> float:
+        """Sample variance."""
+        if self.count < 2:
+            return math.nan
+        return self.m2 / (self.count - 1)
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+    @property
+    def drift(self) -> float:
+        """Slope of least squares fit in units per second."""
+        if self.count < 2 or not self._t_m2:
+            return math.nan
+        return self._c / self._t_m2
+
+    def summary(self) -> dict:
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "std": self.std,
+            "min": self.minimum,
+            "max": self.maximum,
+            "drift": self.drift,
+        }
+
+
+class EWMA:
+    """Exponentially weighted moving average with half-life in samples."""
+
+    def __init__(self, halflife: float = 10.0) -> None:
+        self.alpha: float = 1.0 - 0.5 ** (1.0 / halflife)
+        self.value: float = math.nan
+
+    def add(self, value: float) -> None:
+        if value is None or math.isnan(value):
+            return
+        if math.isnan(self.value):
+            self.value = value
+        else:
+            self.value += self.alpha * (value - self.value)
+
+
+class WindowStatistics:
+    """Accumulates fixed time windows (e.g. hours) aligned to the start of
+    the run. Summaries of completed windows are kept up to a maximum
+    count.
+    """
+
+    MaximumWindowCount: int = 1000
+
+    def __init__(self, duration: float) -> None:
+        self.duration: float = duration
+        self.index: Optional[int] = None
+        self.current: Welford = Welford()
+        self.completed: collections.deque = collections.deque(maxlen=self.MaximumWindowCount)
+
+    def add(self, value: float, t: float) -> None:
+        index = int(t // self.duration)
+        if self.index is None:
+            self.index = index
+        elif index != self.index:
+            self._complete()
+            self.index = index
+        self.current.add(value, t)
+
+    def _complete(self) -> None:
+        if self.index is not None and self.current.count:
+            self.completed.append({
+                "start": self.index * self.duration,
+                "end": (self.index + 1) * self.duration,
+                **self.current.summary(),
+            })
+        self.current = Welford()
+
+    def windows(self) -> list[dict]:
+        """Returns summaries of completed windows and the current one."""
+        windows = list(self.completed)
+        if self.index is not None and self.current.count:
+            windows.append({
+                "start": self.index * self.duration,
+                "end": (self.index + 1) * self.duration,
+                **self.current.summary(),
+            })
+        return windows
+
+
+class QuantityStatistics:
+
+    def __init__(self, halflife: float = 10.0) -> None:
+        self.total: Welford = Welford()
+        self.ewma: EWMA = EWMA(halflife)
+        self.windows: dict[str, WindowStatistics] = {
+            name: WindowStatistics(duration) for name, duration in Windows.items()
+        }
+
+    def add(self, value: float, t: float) -> None:
+        if value is None or math.isnan(value):
+            return
+        self.total.add(value, t)
+        self.ewma.add(value)
+        for window in self.windows.values():
+            window.add(value, t)
+
+    def summary(self) -> dict:
+        """Returns overall statistics, EWMA and current window means."""
+        summary = self.total.summary()
+        summary["ewma"] = self.ewma.value
+        for name, window in self.windows.items():
+            summary[f"{name}_mean"] = window.current.mean
+        return summary
+
+
+class RunStatistics:
+    """Per sensor statistics of current and temperature of an It run.
+
+    Time is relative to the start of the It phase in seconds, drift is
+    reported per second.
+    """
+
+    def __init__(self, sensors: Iterable[Sensor], halflife: float = 10.0) -> None:
+        self.sensors: list[Sensor] = list(sensors)
+        self.channels: dict[int, dict[str, QuantityStatistics]] = {
+            sensor.index: {name: QuantityStatistics(halflife) for name in Quantities}
+            for sensor in self.sensors
+        }
+
+    def add(self, t: float, channels: dict) -> None:
+        """Add scan, `channels` maps sensor index to channel reading."""
+        for index, quantities in self.channels.items():
+            channel = channels.get(index, {})
+            for name, key in Quantities.items():
+                quantities[name].add(channel.get(key, math.nan), t)
+
+    def summary(self, index: int) -> dict:
+        """Returns live summary of a sensor by quantity."""
+        return {name: quantity.summary() for name, quantity in self.channels.get(index, {}).items()}
+
+    def report(self) -> dict:
+        """Returns complete report including all windows."""
+        sensors = []
+        for sensor in self.sensors:
+            quantities = {}
+            for name, quantity in self.channels[sensor.index].items():
+                quantities[name] = {
+                    **quantity.summary(),
+                    "windows": {key: window.windows() for key, window in quantity.windows.items()},
+                }
+            sensors.append({"index": sensor.index, "name": sensor.name, **quantities})
+        return {"sensors": sensors}
+
+    def write_summary(self, fp, **meta) -> None:
+        """Write report as JSON, NaN values are written as null."""
+        json.dump(nan_to_none({**meta, **self.report()}), fp, indent=2)
+        fp.write("\n")
+
+
+def nan_to_none(value):
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    if isinstance(value, dict):
+        return {key: nan_to_none(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [nan_to_none(item) for item in value]
+    return value
@@ -0,0 +1,170 @@
+"""Sparse sidecar time index for random access into plain It text files.
+
+The index maps the timestamp of every N-th data row to the byte offset of
+the row and is stored as JSON lines in a `.index` file next to the data.
+"""
+
+import bisect
+import csv
+import json
+import mmap
+import os
+from typing import Iterator, Optional
+
+__all__ = ["IndexSuffix", "TimeIndexWriter", "IndexedReader", "build_index", "read_index"]
+
+IndexSuffix: str = ".index"
+
+
+def index_filename(filename: str) -> str:
+    return filename + IndexSuffix
+
+
+def read_index(filename: str) -> list[tuple[float, int]]:
+    """Returns list of (timestamp, offset) entries of sidecar index of data
+    file, empty if no index exists."""
+    entries = []
+    try:
+        with open(index_filename(filename)) as fp:
+            for line in fp:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break  # truncated last entry
+                entries.append((float(entry["timestamp"]), int(entry["offset"])))
+    except FileNotFoundError:
+        pass
+    return entries
+
+
+class TimeIndexWriter:
+    """Writes sidecar index entry every `every` rows, optionally appending
+    to an existing index."""
+
+    def __init__(self, filename: str, every: int = 100, append: bool = False) -> None:
+        self.filename: str = filename
+        self.every: int = every
+        self.rows: int = 0
+        self._fp = open(index_filename(filename), "a" if append else "w")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        self.close()
+        return False
+
+    def due(self) -> bool:
+        """Returns True if next row requires an index entry."""
+        return self.rows % self.every == 0
+
+    def add(self, timestamp: float, offset: Optional[int]) -> None:
+        """Count row, write entry if due and offset is given."""
+        if offset is not None and self.due():
+            self._fp.write(json.dumps({"timestamp": timestamp, "offset": offset}))
+            self._fp.write("\n")
+            self._fp.flush()
+        self.rows += 1
+
+    def close(self) -> None:
+        self._fp.close()
+
+
+def data_offset(mm) -> int:
+    """Returns offset of first data row, following meta block and header."""
+    mm.seek(0)
+    for line in iter(mm.readline, b""):
+        if not line.strip():
+            break
+    mm.readline()  # header
+    return mm.tell()
+
+
+def row_timestamp(line: bytes) -> Optional[float]:
+    try:
+        return float(line.split(b",", 1)[0])
+    except ValueError:
+        return None
+
+
+def build_index(filename: str, every: int = 100) -> int:
+    """Build sidecar index for existing (legacy) plain text file, returns
+    number of index entries."""
+    count = 0
+    with open(filename, "rb") as fp, TimeIndexWriter(filename, every) as index:
+        if not os.fstat(fp.fileno()).st_size:
+            return 0
+        with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            offset = data_offset(mm)
+            for line in iter(mm.readline, b""):
+                timestamp = row_timestamp(line)
+                if timestamp is not None:
+                    if index.due():
+                        count += 1
+                    index.add(timestamp, offset)
+                offset = mm.tell()
+    return count
+
+
+class IndexedReader:
+    """Memory mapped reader seeking to time ranges using the sidecar index.
+
+    Works for combined run files and per sensor It files, rows are returned
+    as dictionaries keyed by header column. Without index the data is
+    scanned from the first row.
+
+    >>> with IndexedReader("it-2024-01-01T00-00-00.txt") as reader:
+    ...     for row in reader.rows(start=86400, end=2 * 86400):
+    ...         print(row["current_1 [A]"])
+    """
+
+    def __init__(self, filename: str) -> None:
+        self.filename: str = filename
+        self._fp = open(filename, "rb")
+        self._mm = mmap.mmap(self._fp.fileno(), 0, access=mmap.ACCESS_READ)
+        self.offset: int = data_offset(self._mm)
+        self._mm.seek(0)
+        self.header: list[str] = self._read_header()
+        size = len(self._mm)
+        entries = [entry for entry in read_index(filename) if entry[1] < size]
+        self.timestamps: list[float] = [timestamp for timestamp, _ in entries]
+        self.offsets: list[int] = [offset for _, offset in entries]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        self.close()
+        return False
+
+    def close(self) -> None:
+        self._mm.close()
+        self._fp.close()
+
+    def _read_header(self) -> list[str]:
+        for line in iter(self._mm.readline, b""):
+            if not line.strip():
+                break
+        return next(csv.reader([self._mm.readline().decode("utf-8")]), [])
+
+    def seek(self, start: Optional[float]) -> int:
+        """Returns offset of last indexed row at or before `start`."""
+        if start is None or not self.timestamps:
+            return self.offset
+        index = bisect.bisect_right(self.timestamps, start) - 1
+        return self.offsets[index] if index >= 0 else self.offset
+
+    def rows(self, start: Optional[float] = None, end: Optional[float] = None) -> Iterator[dict[str, str]]:
+        """Yield rows with timestamp in range [start, end)."""
+        mm = self._mm
+        mm.seek(self.seek(start))
+        for line in iter(mm.readline, b""):
+            timestamp = row_timestamp(line)
+            if timestamp is None:
+                continue
+            if start is not None and timestamp < start:
+                continue
+            if end is not None and timestamp >= end:
+                break
+            for row in csv.reader([line.decode("utf-8")]):
+                yield dict(zip(self.header, row))
@@ -0,0 +1,73 @@
+"""Command line tools for Longterm It run data."""
+
+import argparse
+import logging
+import sys
+
+from . import __version__
+from .archive import is_archive
+from .export import export_sensor_files
+from .normalize import DefaultBandGap, DefaultReferenceTemperature, normalize_file
+from .timeindex import build_index
+
+__all__ = ["main"]
+
+logger = logging.getLogger(__name__)
+
+
+def export_command(args: argparse.Namespace) -> int:
+    for filename in args.filenames:
+        for output in export_sensor_files(filename, args.output):
+            logger.info("written %s", output)
+    return 0
+
+
+def index_command(args: argparse.Namespace) -> int:
+    for filename in args.filenames:
+        if is_archive(filename):
+            logger.error("skipped %s: compressed files are indexed by chunks", filename)
+            continue
+        count = build_index(filename, args.every)
+        logger.info("indexed %s (%d entries)", filename, count)
+    return 0
+
+
+def normalize_command(args: argparse.Namespace) -> int:
+    for filename in args.filenames:
+        output = normalize_file(filename, reference=args.reference, band_gap=args.band_gap)
+        logger.info("written %s", output)
+    return 0
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="longterm-it-tools", description="Tools for Longterm It run data.")
+    parser.add_argument("--version", action="version", version=f"%(prog)s {__version__}")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = subparsers.add_parser("export", help="export per sensor It files from combined run files")
+    export_parser.add_argument("filenames", metavar="<file>", nargs="+", help="combined It run file")
+    export_parser.add_argument("-o", "--output", metavar="<dir>", help="output directory (default: next to run file)")
+    export_parser.set_defaults(func=export_command)
+
+    index_parser = subparsers.add_parser("index", help="build sidecar time index for existing It files")
+    index_parser.add_argument("filenames", metavar="<file>", nargs="+", help="plain text It file")
+    index_parser.add_argument("-n", "--every", metavar="<rows>", type=int, default=100, help="index every n-th row (default: 100)")
+    index_parser.set_defaults(func=index_command)
+
+    normalize_parser = subparsers.add_parser("normalize", help="add temperature normalized currents to IV and It files")
+    normalize_parser.add_argument("filenames", metavar="<file>", nargs="+", help="IV, It or combined It run file")
+    normalize_parser.add_argument("--reference", metavar="<degC>", type=float, default=DefaultReferenceTemperature, help=f"reference temperature (default: {DefaultReferenceTemperature} °C)")
+    normalize_parser.add_argument("--band-gap", metavar="<eV>", type=float, default=DefaultBandGap, help=f"effective band gap energy (default: {DefaultBandGap} eV)")
+    normalize_parser.set_defaults(func=normalize_command)
+
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> None:
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    sys.exit(args.func(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+import collections
+import contextlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Iterator, Optional, TextIO
+
+__all__ = ["Tracer", "tracer"]
+
+logger = logging.getLogger(__name__)
+
+
+class Tracer:
+    """Records nested timing spans on a monotonic clock and writes them in
+    Chrome trace event format, to be opened in a trace viewer (e.g.
+    chrome://tracing or https://ui.perfetto.dev).
+
+    While a trace file is started, events are streamed to it in JSON array
+    format, flushed every `FlushEventCount` events or `FlushInterval`
+    seconds. The closing bracket of the array is optional in this format, so
+    the trace of a crashed run stays readable up to the last flush. Events
+    recorded while no file is started are kept in a ring buffer of the last
+    `MaximumEventCount` events and written to the next started file.
+
+    Disabled tracers record nothing and add almost no overhead.
+    """
+
+    MaximumEventCount: int = 100_000
+    FlushEventCount: int = 1000
+    FlushInterval: float = 10.0
+
+    def __init__(self) -> None:
+        self.enabled: bool = False
+        self.dropped: int = 0
+        self._events: collections.deque = collections.deque(maxlen=self.MaximumEventCount)
+        self._threads: dict[int, str] = {}
+        self._lock = threading.Lock()
+        self._origin: float = time.perf_counter()
+        self._fp: Optional[TextIO] = None
+        self._written: int = 0
+        self._flushed: float = 0.0
+
+    def enable(self) -> None:
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def clear(self) -> None:
+        with self._lock:
+            self._events.clear()
+            self._threads.clear()
+            self.dropped = 0
+            self._origin = time.perf_counter()
+
+    def is_active(self) -> bool:
+        return self._fp is not None
+
+    def start(self, filename: str) -> None:
+        """Start streaming events to trace file, buffered events are written
+        first."""
+        with self._lock:
+            self._close()
+            self._fp = open(filename, "w")
+            self._fp.write("[")
+            self._written = 0
+            for tid, name in self._threads.items():
+                self._write(self.thread_event(tid, name))
+            self._flush()
+        logger.info("Trace written to %s", filename)
+
+    def stop(self) -> None:
+        """Flush buffered events and close trace file."""
+        with self._lock:
+            self._close()
+
+    @contextlib.contextmanager
+    def span(self, name: str, category: str = "", **args) -> Iterator[None]:
+        """Record duration of context as complete event."""
+        if not self.enabled:
+            yield
+            return
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            t1 = time.perf_counter()
+            thread = threading.current_thread()
+            event = {
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": (t0 - self._origin) * 1e6,
+                "dur": (t1 - t0) * 1e6,
+                "pid": os.getpid(),
+                "tid": thread.ident,
+            }
+            if args:
+                event["args"] = args
+            with self._lock:
+                tid = thread.ident or 0
+                if tid not in self._threads:
+                    self._threads[tid] = thread.name
+                    if self._fp is not None:
+                        self._write(self.thread_event(tid, thread.name))
+                if len(self._events) == self._events.maxlen:
+                    self.dropped += 1
+                self._events.append(event)
+                if self._fp is not None:
+                    if len(self._events) >= self.FlushEventCount or t1 - self._flushed >= self.FlushInterval:
+                        self._flush()
+
+    def events(self) -> list[dict]:
+        """Returns list of buffered events not yet written, including thread
+        name metadata."""
+        with self._lock:
+            events = [self.thread_event(tid, name) for tid, name in self._threads.items()]
+            events.extend(self._events)
+        return events
+
+    @staticmethod
+    def thread_event(tid: int, name: str) -> dict:
+        return {
+            "name": "thread_name",
+            "ph": "M",
+            "pid": os.getpid(),
+            "tid": tid,
+            "args": {"name": name},
+        }
+
+    def _write(self, event: dict) -> None:
+        self._fp.write(("," if self._written else "") + "\n" + json.dumps(event))
+        self._written += 1
+
+    def _flush(self) -> None:
+        while self._events:
+            self._write(self._events.popleft())
+        self._fp.flush()
+        self._flushed = time.perf_counter()
+
+    def _close(self) -> None:
+        if self._fp is not None:
+            self._flush()
+            self._fp.write("\n]\n")
+            self._fp.close()
+            self._fp = None
+            if self.dropped:
+                logger.warning("trace: dropped %d events exceeding buffer of %d", self.dropped, self.MaximumEventCount)
+            self.dropped = 0
+
+
+tracer = Tracer()
+"""Default application tracer, disabled by default."""
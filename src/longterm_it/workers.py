@@ -18,14 +18,85 @@ from comet.functions import LinearRange
 from comet.driver.cts.itc import ITC
 from comet.driver.keithley import K2410
 
+from .anomaly import AnomalyDetector, AnomalyMonitor, write_event
+from .archive import ArchiveWriter, next_part
+from .breakdown import BreakdownDetector
+from .clock import Clock
+from .cts import EnvironPoller, EnvironSnapshot
+from .database import DatabaseWriter
 from .driver import K2700, ShuntBox  # TODO
+from .feed import Feed
+from .journal import Journal, truncate_partial_line
+from .metrics import registry
+from .normalize import DefaultBandGap, DefaultReferenceTemperature, normalize_channels
+from .ramp import (
+    AdaptiveRamp,
+    DefaultRampDownSlewRate,
+    DefaultRampDownStep,
+    DefaultSettleInterval,
+    DefaultSettleThreshold,
+    DefaultSettleWindow,
+    RelaySafeVoltage,
+    linear_points,
+    parse_smu_readings,
+    sweep_chunks,
+    wait_settled,
+)
+from .reconnect import CircuitState, ReconnectPolicy, probe_tcp
+from .tracing import tracer
+from .sampling import AdaptiveInterval
+from .statistics import RunStatistics
+from .timeindex import TimeIndexWriter
 from .utils import make_iso
-from .writers import IVWriter, ItWriter
+from .writers import IVWriter, RunWriter
 
 __all__ = ["EnvironWorker", "MeasureWorker"]
 
 logger = logging.getLogger(__name__)
 
+scan_duration = registry.histogram(
+    "longterm_scan_duration_seconds",
+    "Duration of a complete SMU, ShuntBox and multimeter scan in seconds.",
+)
+scans_total = registry.counter(
+    "longterm_scans_total",
+    "Number of completed scans.",
+)
+esr_poll_iterations = registry.histogram(
+    "longterm_esr_poll_iterations",
+    "Number of multimeter ESR polling iterations per scan.",
+    buckets=(1, 2, 4, 8, 16, 32, 40),
+)
+settle_duration = registry.histogram(
+    "longterm_settle_duration_seconds",
+    "Time waited for the SMU current to settle after a voltage step in seconds.",
+)
+ramp_down_duration = registry.histogram(
+    "longterm_ramp_down_duration_seconds",
+    "Duration of ramping down to zero volts in seconds.",
+    buckets=(1, 2, 5, 10, 20, 30, 60, 120, 300),
+)
+breakdowns_total = registry.counter(
+    "longterm_breakdowns_total",
+    "Number of channels disabled on breakdown onset during IV ramps.",
+)
+anomaly_events_total = registry.counter(
+    "longterm_anomaly_events_total",
+    "Number of spikes and steps detected in It channel currents.",
+)
+environ_read_duration = registry.histogram(
+    "longterm_environ_read_duration_seconds",
+    "Duration of a climate chamber reading in seconds.",
+)
+environ_errors_total = registry.counter(
+    "longterm_environ_errors_total",
+    "Number of failed climate chamber connections or readings.",
+)
+environ_errors_suppressed_total = registry.counter(
+    "longterm_environ_errors_suppressed_total",
+    "Number of climate chamber errors not reported while reconnecting.",
+)
+
 driver_registry: dict[str, Callable] = {
     "smu": K2410,
     "dmm": K2700,
@@ -58,71 +129,113 @@ class EnvironWorker(QtCore.QObject):
     climate chamber running state in intervals.
     """
 
-    interval: float = 5.0
-
-    timeout: float = 5.0
+    interval: float = EnvironPoller.DefaultInterval
 
-    failedConnectionAttempts: int = 0
+    timeout: float = 2.0
+    """TCP reachability probe timeout in seconds."""
 
     failed = QtCore.pyqtSignal(Exception)
     reading = QtCore.pyqtSignal(dict)
+    circuitStateChanged = QtCore.pyqtSignal(str)
 
     def __init__(self, resources, parent: Optional[QtCore.QObject] = None) -> None:
         super().__init__(parent)
         self.resources = resources
         self.abort_requested = threading.Event()
         self.isEnabled: bool = False
+        self.feed: Optional[Feed] = None
+        self.clock: Clock = Clock()
+        self.snapshot: EnvironSnapshot = EnvironSnapshot()
+        self.circuitState: str = CircuitState.CLOSED
 
     def abort(self) -> None:
         self.abort_requested.set()
 
     def setEnabled(self, enabled: bool) -> None:
         self.isEnabled = enabled
+        if not enabled:
+            self.snapshot.clear()
 
-    def read(self, device) -> dict:
-        """Read environment data from device."""
-        temp = device.analog_channel[1][0]
-        humid = device.analog_channel[2][0]
-        running = device.status.running
-        # Read pause flag
-        o = list(device.query_bytes("O", 14))
-        if o[3] == "1":
-            status = "PAUSE"
-        else:
-            if running:
-                status = "ON"
-            else:
-                status = "OFF"
-        program = device.program
-        return {
-            "time": time.time(),
-            "temp": temp,
-            "humid": humid,
-            "status": status,
-            "program": program,
-        }
+    def setFeed(self, feed: Optional[Feed]) -> None:
+        self.feed = feed
+
+    def setClock(self, clock: Clock) -> None:
+        self.clock = clock
+
+    def setCircuitState(self, state: str) -> None:
+        if state != self.circuitState:
+            self.circuitState = state
+            self.circuitStateChanged.emit(state)
+
+    def publish(self, topic: str, data: Any) -> None:
+        """Publish data to streaming feed, if assigned. Errors are logged
+        only."""
+        if self.feed is not None:
+            try:
+                self.feed.publish(topic, data)
+            except Exception as exc:
+                logger.exception(exc)
+
+    def read(self, poller: EnvironPoller, resource) -> dict:
+        """Read environment data from resource in a single batched query."""
+        poller.poll(resource)
+        for name, message in poller.errors.items():
+            logger.warning("CTS %s: %s", name, message)
+        return poller.reading()
+
+    def wait(self, seconds: float) -> None:
+        """Sleep until timeout, abort or disable."""
+        deadline = self.clock.monotonic() + seconds
+        while not self.abort_requested.is_set() and self.isEnabled:
+            remaining = deadline - self.clock.monotonic()
+            if remaining <= 0:
+                break
+            self.clock.sleep(min(remaining, 1.0))
 
     def __call__(self) -> None:
+        policy = ReconnectPolicy()
         while not self.abort_requested.is_set():
+            if not self.isEnabled:
+                if policy.failures:
+                    policy = ReconnectPolicy()
+                self.setCircuitState(policy.state)
+                self.clock.sleep(1)
+                continue
+            policy.attempt()
+            self.setCircuitState(policy.state)
             try:
-                if self.isEnabled:
-                    # Open connection to instrument
-                    with self.resources.get("cts") as res:
-                        cts = get_driver("itc")(res)
-                        while not self.abort_requested.is_set() and self.isEnabled:
-                            reading = self.read(cts)
-                            logger.info("CTS reading: %s", reading)
-                            self.reading.emit(reading)
-                            self.failedConnectionAttempts = 0
-                            time.sleep(self.interval)
+                resource = self.resources.get("cts")
+                probe_tcp(resource.resource_name, self.timeout)
+                # Open connection to instrument
+                with resource as res:
+                    poller = EnvironPoller(self.clock, self.interval)
+                    while not self.abort_requested.is_set() and self.isEnabled:
+                        with environ_read_duration.time():
+                            reading = self.read(poller, res)
+                        logger.info("CTS reading: %s", reading)
+                        if self.isEnabled:
+                            self.snapshot.update(reading)
+                        self.reading.emit(reading)
+                        self.publish("cts", reading)
+                        if policy.failures:
+                            logger.info("CTS reconnected after %d failed attempts, %d errors suppressed", policy.failures, policy.suppressed)
+                        policy.success()
+                        self.setCircuitState(policy.state)
+                        poller.wait(lambda: self.abort_requested.is_set() or not self.isEnabled)
             except Exception as exc:
-                logger.exception(exc)
-                if not self.failedConnectionAttempts:
-                    self.failed.emit(exc)
-                self.failedConnectionAttempts += 1
-                time.sleep(self.timeout)
-            else:
-                time.sleep(1)
+                environ_errors_total.inc()
+                delay = policy.failure()
+                self.setCircuitState(policy.state)
+                if policy.report():
+                    if policy.failures == 1:
+                        logger.exception(exc)
+                        self.failed.emit(exc)
+                    else:
+                        logger.error("CTS circuit open after %d failed attempts, retrying in %.1f s: %s", policy.failures, delay, exc)
+                else:
+                    environ_errors_suppressed_total.inc()
+                    logger.debug("CTS connection failed, retrying in %.1f s: %s", delay, exc)
+                self.wait(delay)
 
 
 class MeasureWorker(QtCore.QObject):
@@ -157,12 +270,13 @@ class MeasureWorker(QtCore.QObject):
         self.resources = resources
         self.params: dict[str, Any] = {}
 
+        self.setFeed(None)
+        self.setClock(Clock())
+        self.setResumeJournal(None)
+        self.__journal: Optional[Journal] = None
         self.setUseShuntBox(True)
         self.setCurrentVoltage(0.0)
-        self.setTemperature(float("nan"))
-        self.setHumidity(float("nan"))
-        self.setStatus("N/A")
-        self.setProgram(0)
+        self.setEnvironSnapshot(EnvironSnapshot())
 
         self.params.update({
             "smu.route.terminals": "rear",
@@ -184,6 +298,45 @@ class MeasureWorker(QtCore.QObject):
     def abort(self) -> None:
         self.abort_requested.set()
 
+    def feed(self):
+        return self.__feed
+
+    def setFeed(self, value):
+        self.__feed = value
+
+    def resumeJournal(self) -> Optional[Journal]:
+        return self.__resumeJournal
+
+    def setResumeJournal(self, journal: Optional[Journal]) -> None:
+        """Resume interrupted run of journal on next start."""
+        self.__resumeJournal = journal
+
+    def clock(self) -> Clock:
+        return self.__clock
+
+    def setClock(self, clock: Clock) -> None:
+        self.__clock = clock
+
+    def publish(self, topic: str, data: Any) -> None:
+        """Publish data to streaming feed, if assigned. Errors are logged
+        only, the feed must never stop a measurement."""
+        feed = self.feed()
+        if feed is not None:
+            try:
+                feed.publish(topic, data)
+            except Exception as exc:
+                logger.exception(exc)
+
+    def publishState(self, state: str) -> None:
+        self.publish("state", {
+            "state": state,
+            "voltage": self.currentVoltage(),
+            "sensors": [
+                {"index": sensor.index, "name": sensor.name, "status": sensor.status, "hv": sensor.hv}
+                for sensor in self.sensors() if sensor.enabled
+            ],
+        })
+
     def sensors(self):
         return self.__sensors
 
@@ -263,29 +416,24 @@ class MeasureWorker(QtCore.QObject):
     def setItInterval(self, value):
         self.__itInterval = value
 
-    def temperature(self):
-        return self.__temperature
-
-    def setTemperature(self, value):
-        self.__temperature = value
-
-    def humidity(self):
-        return self.__humidity
-
-    def setHumidity(self, value):
-        self.__humidity = value
-
-    def status(self):
-        return self.__status
-
-    def setStatus(self, value):
-        self.__status = value
+    def environSnapshot(self) -> EnvironSnapshot:
+        return self.__environSnapshot
 
-    def program(self):
-        return self.__program
+    def setEnvironSnapshot(self, snapshot: EnvironSnapshot) -> None:
+        """Set CTS snapshot written by the environment worker."""
+        self.__environSnapshot = snapshot
 
-    def setProgram(self, value):
-        self.__program = value
+    def ctsValues(self) -> dict:
+        """Returns CTS row values of a single snapshot read, including the
+        age of the oldest value in seconds."""
+        reading = self.environSnapshot().read()
+        return {
+            "cts_temperature": reading.get("temp", math.nan),
+            "cts_humidity": reading.get("humid", math.nan),
+            "cts_status": reading.get("status", "N/A"),
+            "cts_program": reading.get("program", 0),
+            "cts_age": EnvironSnapshot.age(reading, self.clock().time()),
+        }
 
     def path(self):
         return self.__path
@@ -317,11 +465,15 @@ class MeasureWorker(QtCore.QObject):
         self.progressHidden.emit()
 
     def reset(self, smu, multi) -> None:
+        self.resetSmu(smu)
+        self.resetMultimeter(multi)
+
+    def resetSmu(self, smu) -> None:
         # Reset SMU
         logger.info("Reset SMU...")
         smu.resource.write("*RST")
         smu.resource.query("*OPC?")
-        time.sleep(0.500)
+        self.clock().sleep(0.500)
         smu.resource.write("*CLS")
         smu.resource.query("*OPC?")
         smu.resource.write(":SYST:BEEP:STAT OFF")
@@ -329,11 +481,13 @@ class MeasureWorker(QtCore.QObject):
         error = smu.next_error()
         if error:
             raise RuntimeError(f"{smu.resource.resource_name}: {error.code}, {error.message}")
+
+    def resetMultimeter(self, multi) -> None:
         # Reset multimeter
         logger.info("Reset Multimeter...")
         multi.resource.write("*RST")
         multi.resource.query("*OPC?")
-        time.sleep(0.500)
+        self.clock().sleep(0.500)
         multi.resource.write("*CLS")
         multi.resource.query("*OPC?")
         multi.resource.write(":SYST:BEEP:STAT OFF")
@@ -343,6 +497,22 @@ class MeasureWorker(QtCore.QObject):
             raise RuntimeError(f"{multi.resource.resource_name}: {error.code}, {error.message}")
 
     def scan(self, smu, multi) -> dict:
+        with tracer.span("scan", "measure"):
+            reading = self.scanChannels(smu, multi)
+        self.normalize(reading)
+        return reading
+
+    def referenceTemperature(self) -> float:
+        return self.params.get("normalize.reference_temperature", DefaultReferenceTemperature)
+
+    def bandGap(self) -> float:
+        return self.params.get("normalize.band_gap", DefaultBandGap)
+
+    def normalize(self, reading: dict) -> None:
+        """Add temperature normalized current `I_norm` to channels of reading."""
+        normalize_channels(reading.get("channels", {}), self.referenceTemperature(), self.bandGap())
+
+    def scanChannels(self, smu, multi) -> dict:
         """Scan selected channels and return dictionary of readings.
 
         time:  timestamp
@@ -355,6 +525,8 @@ class MeasureWorker(QtCore.QObject):
             R:  calibrated resistor value
             temp:  temperature (PT100) incl. offset
         """
+        t0 = time.perf_counter()
+
         # Check SMU compliance tripped?
         compliance_tripped = int(smu.resource.query(":SENS:CURR:PROT:TRIP?"))
         if compliance_tripped:
@@ -395,7 +567,8 @@ class MeasureWorker(QtCore.QObject):
             if 1 == int(multi.resource.query("*ESR?")) & 0x1:
                 done = True
                 break
-            time.sleep(0.250)
+            self.clock().sleep(0.250)
+        esr_poll_iterations.observe(i + 1)
         if not done:
             raise RuntimeError("failed to poll for ESR")
         logger.info("Read results buffer...")
@@ -405,6 +578,7 @@ class MeasureWorker(QtCore.QObject):
             logger.info("[%d]: %s", index, result)
 
         channels = {}
+        tripped = []
         for sensor in self.sensors():
             if sensor.enabled:
                 R = sensor.resistivity  # ohm, from calibration measurement array
@@ -413,12 +587,7 @@ class MeasureWorker(QtCore.QObject):
                 I = U / R
                 if abs(I) > self.singleCompliance():
                     sensor.status = sensor.State.COMPL_ERR
-                    # Switch HV relay off
-                    if self.useShuntBox():
-                        with self.resources.get("shunt") as res:
-                            shunt = get_driver("shuntbox")(res)
-                            shunt.set_relay(sensor.index, False)
-                            sensor.hv = False
+                    tripped.append(sensor)
                 temp = temperature.get(sensor.index, float("nan"))
                 channels[sensor.index] = {
                     "index": sensor.index,
@@ -428,22 +597,77 @@ class MeasureWorker(QtCore.QObject):
                     "temp": temp + sensor.temperature_offset,
                 }
 
+        if tripped:
+            self.disableRelays(tripped)
+            self.publishState("compliance")
+
         if len(results):
             raise RuntimeError("Too many results in buffer.")
 
+        scan_duration.observe(time.perf_counter() - t0)
+        scans_total.inc()
+
         return {
-            "time": time.time(),
+            "time": self.clock().time(),
             "channels": channels,
             "I": totalCurrent,
             "U": self.currentVoltage(),
             "shuntbox": shuntbox,
         }
 
+    def disableRelays(self, sensors: list) -> None:
+        """Switch HV relays of sensors off and verify their states, if
+        ShuntBox is used."""
+        if self.useShuntBox():
+            with self.resources.get("shunt") as res:
+                shunt = get_driver("shuntbox")(res)
+                shunt.set_relays([sensor.index for sensor in sensors], False)
+                for sensor in sensors:
+                    sensor.hv = False
+
+    def breakdownEnabled(self) -> bool:
+        return self.params.get("breakdown.enabled", False)
+
+    def breakdownStopRamp(self) -> bool:
+        return self.params.get("breakdown.stop_ramp", False)
+
+    def createBreakdownDetector(self) -> BreakdownDetector:
+        return BreakdownDetector(
+            slope=self.params.get("breakdown.slope", BreakdownDetector.DefaultSlope),
+            curvature=self.params.get("breakdown.curvature", BreakdownDetector.DefaultCurvature),
+            jump=self.params.get("breakdown.jump", BreakdownDetector.DefaultJump),
+            min_current=self.params.get("breakdown.min_current", BreakdownDetector.DefaultMinCurrent),
+            confirm=self.params.get("breakdown.confirm", BreakdownDetector.DefaultConfirm),
+        )
+
+    def detectBreakdown(self, detectors: dict, reading: dict) -> bool:
+        """Feed IV reading to per channel breakdown detectors, disable HV
+        relay of channels showing breakdown onset. Returns True if any
+        channel broke down."""
+        detected = []
+        channels = reading.get("channels", {})
+        for sensor in self.sensors():
+            detector = detectors.get(sensor.index)
+            if detector is None or sensor.hv is False or sensor.index not in channels:
+                continue
+            reason = detector.add(reading.get("U", math.nan), channels[sensor.index].get("I", math.nan))
+            if reason:
+                logger.warning("%s: breakdown onset at %.2f V (%s)", sensor.name, reading.get("U", math.nan), reason)
+                sensor.status = sensor.State.BREAKDOWN
+                breakdowns_total.inc()
+                detected.append(sensor)
+        if detected:
+            self.disableRelays(detected)
+            self.publishState("breakdown")
+        return bool(detected)
+
     def setup(self, smu, multi) -> None:
         """Setup SMU and Multimeter instruments."""
 
         self.showMessage("Clear buffers")
-        self.setStartTime(time.time())
+        self.setStartTime(self.clock().time())
+        self.__journal = Journal(self.path())
+        self.updateJournal(stage="setup", **self.journalConfig())
 
         for sensor in self.sensors():
             sensor.status = sensor.State.OK
@@ -475,6 +699,19 @@ class MeasureWorker(QtCore.QObject):
         self.showMessage("Setup multimeter")
         self.showProgress(1, 3)
 
+        self.setupMultimeter(multi)
+
+        self.showMessage("Setup source unit")
+        self.showProgress(2, 3)
+
+        self.setupSmu(smu)
+
+        self.showProgress(3, 3)
+        self.showMessage("Done")
+
+    def setupMultimeter(self, multi) -> None:
+        """Configure multimeter scan of enabled sensor channels."""
+
         n_channels = len(self.sensors())
 
         dmm_channels_slot = self.params.get("dmm.channels.slot", 1)
@@ -569,8 +806,9 @@ class MeasureWorker(QtCore.QObject):
             if float(multi.resource.query(":TRIG:DEL?").strip()) != dmm_trigger_delay:
                 raise RuntimeError("failed to configure dmm.trigger.delay")
 
-        self.showMessage("Setup source unit")
-        self.showProgress(2, 3)
+    def setupSmu(self, smu) -> None:
+        """Configure SMU, switch output ON at zero volts and enable HV
+        relays of enabled sensors."""
 
         smu_route_terminal = self.params.get("smu.route.terminals", "rear")
         logger.info("smu.route.terminal: %s", smu_route_terminal)
@@ -628,13 +866,109 @@ class MeasureWorker(QtCore.QObject):
         if self.useShuntBox():
             with self.resources.get("shunt") as res:
                 shunt = get_driver("shuntbox")(res)
+                changes = shunt.update_relays({sensor.index: sensor.enabled for sensor in self.sensors()})
+                logger.info("ShuntBox relays switched: %s", changes)
                 for sensor in self.sensors():
-                    shunt.set_relay(sensor.index, sensor.enabled)
                     sensor.hv = sensor.enabled
         else:
             for sensor in self.sensors():
                 sensor.hv = None
 
+    def journalConfig(self) -> dict:
+        """Returns run configuration recorded in the state journal."""
+        return {
+            "path": self.path(),
+            "startTime": self.startTime(),
+            "operator": self.operator(),
+            "useShuntBox": self.useShuntBox(),
+            "biasVoltage": self.biasVoltage(),
+            "totalCompliance": self.totalCompliance(),
+            "singleCompliance": self.singleCompliance(),
+            "continueInCompliance": self.continueInCompliance(),
+            "itDuration": self.itDuration(),
+            "itInterval": self.itInterval(),
+            "sensors": [
+                {
+                    "index": sensor.index,
+                    "name": sensor.name,
+                    "enabled": sensor.enabled,
+                    "resistivity": sensor.resistivity,
+                    "temperature_offset": sensor.temperature_offset,
+                    "hv": sensor.hv,
+                    "status": sensor.status,
+                }
+                for sensor in self.sensors()
+            ],
+            "params": dict(self.params),
+        }
+
+    def updateJournal(self, **values) -> None:
+        """Update run state journal, errors are logged only."""
+        journal = self.__journal
+        if journal is not None:
+            try:
+                journal.update(updated=self.clock().time(), **values)
+            except Exception as exc:
+                logger.exception(exc)
+
+    def resume(self, smu, multi, journal: Journal) -> None:
+        """Reconnect to an interrupted run, skipping the IV ramp. The SMU
+        output must still be ON at the run's bias voltage."""
+        state = journal.state
+        self.showMessage("Resuming run")
+        self.showProgress(0, 3)
+        self.setStartTime(state["startTime"])
+        self.__journal = journal
+
+        for sensor in self.sensors():
+            sensor.status = sensor.State.OK
+
+        # Check SMU output level, never touch a source in unknown state
+        output = bool(int(float(smu.resource.query(":OUTP:STAT?"))))
+        voltage = float(smu.resource.query(":SOUR:VOLT:LEV?"))
+        self.setCurrentVoltage(voltage)
+        logger.info("SMU output: %s, level: %G V", output, voltage)
+        if not output:
+            raise RuntimeError("Unable to resume run: SMU output is OFF")
+        tolerance = self.params.get("resume.voltage_tolerance", 1.0)
+        if abs(voltage - self.biasVoltage()) > tolerance:
+            raise RuntimeError(
+                f"Unable to resume run: SMU level {voltage:G} V does not match bias voltage {self.biasVoltage():G} V"
+            )
+
+        self.resetMultimeter(multi)
+        idn = multi.resource.query("*IDN?").strip()
+        logger.info("Multimeter: %s", idn)
+
+        self.showMessage("Setup multimeter")
+        self.showProgress(1, 3)
+
+        self.setupMultimeter(multi)
+
+        self.showMessage("Restore HV relays")
+        self.showProgress(2, 3)
+
+        # Restore HV relays as recorded by last scan
+        hv = {item.get("index"): item.get("hv") for item in state.get("sensors", [])}
+        status = {item.get("index"): item.get("status") for item in state.get("sensors", [])}
+        if self.useShuntBox():
+            with self.resources.get("shunt") as res:
+                shunt = get_driver("shuntbox")(res)
+                states = {
+                    sensor.index: sensor.enabled and hv.get(sensor.index) is not False
+                    for sensor in self.sensors()
+                }
+                changes = shunt.update_relays(states)
+                logger.info("ShuntBox relays switched: %s", changes)
+                for sensor in self.sensors():
+                    enabled = states[sensor.index]
+                    sensor.hv = enabled
+                    if sensor.enabled and not enabled:
+                        sensor.status = status.get(sensor.index) or sensor.State.COMPL_ERR
+        else:
+            for sensor in self.sensors():
+                sensor.hv = None
+
         self.showProgress(3, 3)
         self.showMessage("Done")
 
@@ -643,7 +977,7 @@ class MeasureWorker(QtCore.QObject):
         self.showMessage("Ramping up")
         self.showProgress(self.currentVoltage(), self.ivEndVoltage())
         self.ivStarted.emit()
-        t0 = time.time()
+        t0 = self.clock().time()
         with contextlib.ExitStack() as stack:
             writers = {}
             timestamp = make_iso(self.startTime())
@@ -653,15 +987,30 @@ class MeasureWorker(QtCore.QObject):
                     filename = os.path.join(self.path(), f"IV-{name}-{timestamp}.txt")
                     f = open(filename, "w", newline="")
                     writer = IVWriter(stack.enter_context(f))
-                    writer.write_meta(sensor, self.operator(), timestamp, self.ivEndVoltage())
+                    writer.write_meta(
+                        sensor,
+                        self.operator(),
+                        timestamp,
+                        self.ivEndVoltage(),
+                        self.referenceTemperature(),
+                        self.bandGap(),
+                    )
                     writer.write_header()
                     writers[sensor.index] = writer
-            step = (
-                -self.ivStep()
-                if self.ivEndVoltage() < self.currentVoltage()
-                else self.ivStep()
-            )
-            for value in LinearRange(self.currentVoltage(), self.ivEndVoltage(), step):
+            detectors = {}
+            if self.breakdownEnabled():
+                detectors = {sensor.index: self.createBreakdownDetector() for sensor in self.sensors() if sensor.enabled}
+            ramp = self.createAdaptiveRamp() if self.adaptiveRampEnabled() else None
+            if ramp is not None:
+                voltages = iter(ramp)
+            else:
+                step = (
+                    -self.ivStep()
+                    if self.ivEndVoltage() < self.currentVoltage()
+                    else self.ivStep()
+                )
+                voltages = LinearRange(self.currentVoltage(), self.ivEndVoltage(), step)
+            for value in voltages:
                 if self.abort_requested.is_set():
                     raise AbortRequested()
                 self.setCurrentVoltage(value)
@@ -670,31 +1019,94 @@ class MeasureWorker(QtCore.QObject):
                 smu.resource.write(f":SOUR:VOLT:LEV {value:E}")
                 smu.resource.query("*OPC?")
                 self.showProgress(self.currentVoltage(), self.ivEndVoltage())
-                time.sleep(self.ivDelay())
+                if ramp is not None:
+                    self.settle(smu, ramp.delay, ramp.min_delay)
+                else:
+                    self.settle(smu, self.ivDelay())
                 reading = self.scan(smu, multi)
                 logger.info("scan reading: %s", reading)
                 self.ivReading.emit(reading)
+                self.publish("iv", reading)
                 self.smuReading.emit({"U": self.currentVoltage(), "I": reading.get("I")})
+                cts = self.ctsValues()
                 for sensor in self.sensors():
                     if sensor.enabled:
                         # Time delta since start of IV
-                        dt = time.time() - t0
+                        dt = self.clock().time() - t0
                         writers[sensor.index].write_row(
                             timestamp=dt,
                             voltage=reading.get("U", math.nan),
                             current=reading.get("channels", {})[sensor.index].get("I", math.nan),
                             smu_current=reading.get("I", math.nan),
                             pt100=reading.get("channels", {})[sensor.index].get("temp", math.nan),
-                            cts_temperature=self.temperature(),
-                            cts_humidity=self.humidity(),
-                            cts_status=self.status(),
-                            cts_program=self.program(),
+                            **cts,
                             hv_status=sensor.hv,
+                            current_norm=reading.get("channels", {})[sensor.index].get("I_norm", math.nan),
                         )
+                if self.detectBreakdown(detectors, reading) and self.breakdownStopRamp():
+                    logger.warning("Stopping IV ramp at %.2f V on breakdown", value)
+                    break
+                if ramp is not None:
+                    channels = reading.get("channels", {})
+                    ramp.update({
+                        sensor.index: channels[sensor.index].get("I", math.nan)
+                        for sensor in self.sensors()
+                        if sensor.enabled and sensor.hv is not False and sensor.index in channels
+                    }, self.singleCompliance())
+        if ramp is not None:
+            self.reportAdaptiveRamp(ramp, self.clock().time() - t0)
         self.showProgress(self.currentVoltage(), self.ivEndVoltage())
         self.showMessage("Done")
         return True
 
+    def settleEnabled(self) -> bool:
+        return self.params.get("settle.enabled", False)
+
+    def settle(self, smu, delay: float, minimum: float = 0.0) -> None:
+        """Wait after voltage step, if settling is enabled until the SMU
+        current settled, `delay` being the upper bound."""
+        if not self.settleEnabled():
+            self.clock().sleep(delay)
+            return
+        elapsed, settled = wait_settled(
+            lambda: float(smu.resource.query(":READ?").split(",")[1]),
+            self.clock(),
+            delay,
+            minimum=minimum,
+            threshold=self.params.get("settle.threshold", DefaultSettleThreshold),
+            window=self.params.get("settle.window", DefaultSettleWindow),
+            interval=self.params.get("settle.interval", DefaultSettleInterval),
+        )
+        settle_duration.observe(elapsed)
+        if settled:
+            logger.info("Current settled after %.2f s (%.2f V)", elapsed, self.currentVoltage())
+        else:
+            logger.info("Current not settled after %.2f s (%.2f V)", elapsed, self.currentVoltage())
+
+    def adaptiveRampEnabled(self) -> bool:
+        return self.params.get("ramp.adaptive", False)
+
+    def createAdaptiveRamp(self) -> AdaptiveRamp:
+        return AdaptiveRamp(
+            self.currentVoltage(),
+            self.ivEndVoltage(),
+            self.ivStep(),
+            self.ivDelay(),
+            max_step=self.params.get("ramp.max_step", AdaptiveRamp.DefaultMaxStep),
+            max_slew_rate=self.params.get("ramp.max_slew_rate", AdaptiveRamp.DefaultMaxSlewRate),
+            tolerance=self.params.get("ramp.tolerance", AdaptiveRamp.DefaultTolerance),
+        )
+
+    def reportAdaptiveRamp(self, ramp: AdaptiveRamp, elapsed: float) -> None:
+        """Log and publish time saved compared with fixed step ramp."""
+        report = ramp.report(elapsed)
+        logger.info(
+            "Adaptive IV ramp: %d steps in %.1f s, fixed grid: %d steps in about %.1f s, saved %.1f s",
+            report["steps"], report["elapsed"], report["fixed_steps"], report["fixed_estimate"], report["saved"],
+        )
+        self.publish("ramp", report)
+        self.updateJournal(ivRamp=report)
+
     def rampBias(self, smu, multi) -> None:
         """Ramp down SMU voltage to bias voltage."""
         startVoltage = self.currentVoltage() - self.biasVoltage()
@@ -706,6 +1118,10 @@ class MeasureWorker(QtCore.QObject):
             if self.biasVoltage() < self.currentVoltage()
             else self.ivStep()
         )
+        if self.hardwareSweepEnabled():
+            self.sweepSmu(smu, self.biasVoltage(), self.ivStep(), self.ivDelay(), "Ramping to bias")
+            self.showMessage("Done")
+            return
         for value in LinearRange(self.currentVoltage(), self.biasVoltage(), step):
             if self.abort_requested.is_set():
                 raise AbortRequested()
@@ -716,107 +1132,404 @@ class MeasureWorker(QtCore.QObject):
             smu.resource.query("*OPC?")
             deltaVoltage = startVoltage - self.currentVoltage()
             self.showProgress(deltaVoltage, startVoltage)
-            time.sleep(self.ivDelay())
+            self.settle(smu, self.ivDelay())
             totalCurrent = float(smu.resource.query(":READ?").split(",")[1])
             self.smuReading.emit({"U": self.currentVoltage(), "I": totalCurrent})
         self.showMessage("Done")
 
+    def hardwareSweepEnabled(self) -> bool:
+        return self.params.get("ramp.hardware_sweep", False)
+
+    def sweepSmu(self, smu, end: float, step: float, delay: float, message: str, abortable: bool = True) -> None:
+        """Ramp SMU voltage to `end` using K2410 list sweeps with source
+        delay, buffered readings are fetched after each sweep.
+
+        In list mode the source level is the bias level present before and
+        after each sweep, it is kept at the voltage already reached and only
+        moved to the last point of a sweep once the sweep completed, so the
+        output never runs ahead of the list.
+        """
+        startVoltage = self.currentVoltage()
+        chunks = sweep_chunks(startVoltage, end, step)
+        try:
+            smu.resource.write(f":SOUR:VOLT:LEV {startVoltage:E}")
+            smu.resource.write(":SOUR:VOLT:MODE LIST")
+            smu.resource.query("*OPC?")
+            smu.resource.write(f":SOUR:DEL {delay:E}")
+            smu.resource.query("*OPC?")
+            for chunk in chunks:
+                if abortable and self.abort_requested.is_set():
+                    raise AbortRequested()
+                self.showMessage(f"{message} ({chunk[0]:.2f} V to {chunk[-1]:.2f} V)")
+                smu.resource.write(f":SOUR:LIST:VOLT {','.join(format(value, 'E') for value in chunk)}")
+                smu.resource.write(f":TRIG:COUN {len(chunk):d}")
+                smu.resource.query("*OPC?")
+                smu.resource.write("*CLS")
+                smu.resource.write(":INIT")
+                smu.resource.write("*OPC")
+                timeout = self.clock().monotonic() + len(chunk) * (delay + 1.0) + 10.0
+                while not int(smu.resource.query("*ESR?")) & 0x1:
+                    if self.clock().monotonic() > timeout:
+                        raise RuntimeError("SMU sweep timed out")
+                    self.clock().sleep(0.25)
+                readings = parse_smu_readings(smu.resource.query(":FETC?"))
+                for voltage, current in readings:
+                    self.smuReading.emit({"U": voltage, "I": current})
+                smu.resource.write(f":SOUR:VOLT:LEV {chunk[-1]:E}")
+                self.setCurrentVoltage(chunk[-1])
+                self.showProgress(abs(startVoltage - chunk[-1]), abs(startVoltage - end))
+                logger.info("SMU sweep to %.2f V, %d readings", chunk[-1], len(readings))
+        finally:
+            # Keep the output at the last point reached, also if a sweep
+            # failed or was aborted
+            smu.resource.write(f":SOUR:VOLT:LEV {self.currentVoltage():E}")
+            smu.resource.write(":SOUR:VOLT:MODE FIX")
+            smu.resource.write(":TRIG:COUN 1")
+            smu.resource.write(":SOUR:DEL:AUTO ON")
+            smu.resource.query("*OPC?")
+
     def longterm(self, smu, multi) -> None:
         """Run long term measurement."""
         self.showMessage("Measuring...")
         self.itStarted.emit()
-        timeBegin = time.time()
+        resume = self.resumeJournal()
+        timeBegin = resume.state["itStarted"] if resume else self.clock().time()
         timeEnd = timeBegin + self.itDuration()
         if self.itDuration():
             self.showProgress(0, timeEnd - timeBegin)
         else:
             self.showProgress(0, 0)  # progress unknown, infinite run
-        t0 = time.time()
+        t0 = timeBegin
         with contextlib.ExitStack() as stack:
-            writers = {}
-            for sensor in self.sensors():
-                if sensor.enabled:
-                    name = sensor.name
-                    timestamp = make_iso(self.startTime())
-                    filename = os.path.join(self.path(), f"it-{name}-{timestamp}.txt")
-                    f = open(filename, "w", newline="")
-                    writer = ItWriter(stack.enter_context(f))
-                    writer.write_meta(sensor, self.operator(), timestamp, self.biasVoltage())
-                    writer.write_header()
-                    writers[sensor.index] = writer
+            # Single combined file for all enabled sensors, per sensor files
+            # can be exported using `longterm-it-tools export`.
+            sensors = [sensor for sensor in self.sensors() if sensor.enabled]
+            timestamp = make_iso(self.startTime())
+            filename = os.path.join(self.path(), f"it-{timestamp}.txt")
+            f = self.openRunFile(filename, append=resume is not None)
+            writer = RunWriter(stack.enter_context(f), sensors)
+            if resume is None or isinstance(f, ArchiveWriter):
+                writer.write_meta(
+                    self.operator(),
+                    timestamp,
+                    self.biasVoltage(),
+                    self.referenceTemperature(),
+                    self.bandGap(),
+                )
+                writer.write_header()
+            if isinstance(f, ArchiveWriter):
+                f.mark_header()
+            else:
+                # Sparse time index for random access (plain files only)
+                writer.index = stack.enter_context(TimeIndexWriter(filename, append=resume is not None))
+            # Statistics start empty after a resume, every segment of the
+            # run gets its own summary file
+            segment = len(resume.state.get("gaps", [])) + 1 if resume else 0
+            statistics = RunStatistics(sensors)
+            stack.callback(self.writeStatistics, statistics, timestamp, timeBegin, self.clock().time(), segment)
+            anomalies = self.createAnomalyMonitor(sensors) if self.anomalyEnabled() else None
+            events = None
+            if anomalies is not None:
+                events = stack.enter_context(open(os.path.join(self.path(), f"events-{timestamp}.jsonl"), "a"))
+            runId = resume.state.get("databaseRunId") if resume else None
+            database = self.openDatabase(timeBegin, filename, sensors, runId)
+            if database is not None:
+                stack.callback(self.closeDatabase, database)
+            if resume is not None:
+                # Continuity marker recording the gap
+                resumed = self.clock().time()
+                last = resume.state.get("lastTime", resumed)
+                logger.warning("Resumed run after gap of %.0f s", resumed - last)
+                writer.write_gap(resumed - t0)
+                gaps = resume.state.get("gaps", []) + [{"last": last, "resumed": resumed, "duration": resumed - last}]
+                self.updateJournal(gaps=gaps)
+            sampling = self.createAdaptiveInterval() if self.adaptiveIntervalEnabled() else None
+            self.updateJournal(
+                stage="longterm",
+                itStarted=timeBegin,
+                itFilename=filename,
+                databaseRunId=database.run_id if database is not None else None,
+            )
             while not self.abort_requested.is_set():
                 self.showMessage("Measuring...")
-                currentTime = time.time()
+                currentTime = self.clock().time()
                 if self.itDuration():
                     self.showProgress(currentTime - timeBegin, timeEnd - timeBegin)
                     if currentTime >= timeEnd:
                         break
                 reading = self.scan(smu, multi)
                 logger.info("scan reading: %s", reading)
+                channels = {}
+                for sensor in sensors:
+                    channel = reading.get("channels", {}).get(sensor.index, {})
+                    channels[sensor.index] = {
+                        "I": channel.get("I", math.nan),
+                        "U": channel.get("U", math.nan),
+                        "temp": channel.get("temp", math.nan),
+                        "hv": sensor.hv,
+                        "I_norm": channel.get("I_norm", math.nan),
+                    }
+                statistics.add(currentTime - t0, reading.get("channels", {}))
+                reading["statistics"] = {sensor.index: statistics.summary(sensor.index) for sensor in sensors}
+                if anomalies is not None:
+                    reading["events"] = anomalies.add(reading.get("time", currentTime), channels)
+                    self.writeEvents(events, reading["events"])
                 self.itReading.emit(reading)
+                self.publish("it", reading)
                 self.smuReading.emit({"U": self.currentVoltage(), "I": reading.get("I")})
-                for sensor in self.sensors():
-                    if sensor.enabled:
-                        # Time delta since start of IV
-                        dt = time.time() - t0
-                        writers[sensor.index].write_row(
-                            timestamp=dt,
+                # Time delta since start of It
+                cts = self.ctsValues()
+                writer.write_row(
+                    timestamp=self.clock().time() - t0,
+                    voltage=reading.get("U", math.nan),
+                    smu_current=reading.get("I", math.nan),
+                    **cts,
+                    channels=channels,
+                )
+                if database is not None:
+                    try:
+                        database.write_sample(
+                            timestamp=currentTime,
                             voltage=reading.get("U", math.nan),
-                            current=reading.get("channels", {})[sensor.index].get("I", math.nan),
                             smu_current=reading.get("I", math.nan),
-                            pt100=reading.get("channels", {})[sensor.index].get("temp", math.nan),
-                            cts_temperature=self.temperature(),
-                            cts_humidity=self.humidity(),
-                            cts_status=self.status(),
-                            cts_program=self.program(),
-                            hv_status=sensor.hv,
+                            cts_temperature=cts["cts_temperature"],
+                            cts_humidity=cts["cts_humidity"],
+                            channels=channels,
                         )
+                    except Exception as exc:
+                        # Database is optional, keep measuring
+                        logger.exception(exc)
+                        logger.error("Run database disabled: %s", exc)
+                        self.closeDatabase(database)
+                        database = None
+                self.updateJournal(
+                    lastTime=currentTime,
+                    sensors=self.journalConfig()["sensors"],
+                )
                 # Wait...
                 interval = self.itInterval()
+                if sampling is not None:
+                    previous = sampling.interval
+                    interval = sampling.update(channels, self.environ())
+                    if interval != previous:
+                        logger.info("It interval: %.0f s (%s)", interval, sampling.reason or "stable")
+                    if self.itDuration():
+                        interval = min(interval, max(self.itInterval(), timeEnd - self.clock().time()))
                 interval_step = 0.25
                 while interval > 0:
                     if self.abort_requested.is_set():
                         raise AbortRequested()
-                    time.sleep(interval_step)
+                    self.clock().sleep(interval_step)
                     self.showMessage(f"Next measurement in {interval:.0f} s")
                     interval -= interval_step
+                    if sampling is not None and sampling.interval > self.itInterval():
+                        reason = sampling.environ_changed(self.environ())
+                        if reason:
+                            logger.info("It interval: measuring now (%s)", reason)
+                            break
         self.showProgress(1, 1)
         self.showMessage("Done")
 
+    def anomalyEnabled(self) -> bool:
+        return self.params.get("anomaly.enabled", True)
+
+    def createAnomalyMonitor(self, sensors: list) -> AnomalyMonitor:
+        return AnomalyMonitor(
+            sensors,
+            window=self.params.get("anomaly.window", AnomalyDetector.DefaultWindow),
+            spike_threshold=self.params.get("anomaly.spike_threshold", AnomalyDetector.DefaultSpikeThreshold),
+            step_threshold=self.params.get("anomaly.step_threshold", AnomalyDetector.DefaultStepThreshold),
+        )
+
+    def writeEvents(self, fp, events: list) -> None:
+        """Log anomaly events and write them to the events file."""
+        for event in events:
+            logger.warning(
+                "%s: current %s at %s, %.3G A (median %.3G A, score %+.1f)",
+                event["name"], event["kind"], make_iso(event["time"]), event["value"], event["median"], event["score"],
+            )
+            anomaly_events_total.inc()
+            try:
+                write_event(fp, event)
+            except Exception as exc:
+                logger.exception(exc)
+
+    def environ(self) -> dict:
+        """Returns latest climate chamber state."""
+        reading = self.environSnapshot().read()
+        return {
+            "temperature": reading.get("temp", math.nan),
+            "humidity": reading.get("humid", math.nan),
+            "status": reading.get("status", "N/A"),
+            "program": reading.get("program", 0),
+        }
+
+    def adaptiveIntervalEnabled(self) -> bool:
+        return self.params.get("it.adaptive", False)
+
+    def createAdaptiveInterval(self) -> AdaptiveInterval:
+        return AdaptiveInterval(
+            self.itInterval(),
+            max_interval=self.params.get("it.max_interval", AdaptiveInterval.DefaultMaxInterval),
+            tolerance=self.params.get("it.tolerance", AdaptiveInterval.DefaultTolerance),
+            temperature_tolerance=self.params.get("it.temperature_tolerance", AdaptiveInterval.DefaultTemperatureTolerance),
+        )
+
+    def openRunFile(self, filename: str, append: bool = False):
+        """Returns plain text file or compressed archive for It run data.
+        When appending, compressed runs continue with a new rotation part."""
+        compression = self.params.get("output.compression", "")
+        if not compression:
+            if append:
+                removed = truncate_partial_line(filename)
+                if removed:
+                    logger.warning("Removed incomplete line (%d bytes) from %s", removed, filename)
+                return open(filename, "a", newline="")
+            return open(filename, "w", newline="")
+        logger.info("output.compression: %s", compression)
+        return ArchiveWriter(
+            filename,
+            compression,
+            chunk_interval=self.params.get("output.chunk_interval", ArchiveWriter.DefaultChunkInterval),
+            rotate_size=self.params.get("output.rotate_size", 0),
+            rotate_interval=self.params.get("output.rotate_interval", 0.0),
+            clock=self.clock().monotonic,
+            part=next_part(filename, compression) if append else 0,
+        )
+
+    def writeStatistics(self, statistics: RunStatistics, timestamp: str, runStarted: float, started: float, segment: int) -> None:
+        """Write It statistics summary file of run segment, segments after
+        resuming an interrupted run are numbered from 1."""
+        suffix = f"-{segment:d}" if segment else ""
+        filename = os.path.join(self.path(), f"stats-{timestamp}{suffix}.json")
+        try:
+            with open(filename, "w") as fp:
+                statistics.write_summary(
+                    fp,
+                    operator=self.operator(),
+                    datetime=timestamp,
+                    voltage=self.biasVoltage(),
+                    segment=segment,
+                    run_started=runStarted,
+                    started=started,
+                    finished=self.clock().time(),
+                )
+            logger.info("Written statistics to %s", filename)
+        except Exception as exc:
+            logger.exception(exc)
+
+    def openDatabase(self, started: float, filename: str, sensors: list, runId: Optional[int] = None) -> Optional[DatabaseWriter]:
+        """Returns run database writer if enabled, None if disabled or on
+        error."""
+        databaseFilename = self.params.get("output.database", "")
+        if not databaseFilename:
+            return None
+        logger.info("output.database: %s", databaseFilename)
+        try:
+            database = DatabaseWriter(databaseFilename, clock=self.clock().monotonic)
+            if runId is not None:
+                database.resume_run(runId)
+            else:
+                database.begin_run(started, self.operator(), self.biasVoltage(), filename, sensors)
+        except Exception as exc:
+            logger.exception(exc)
+            logger.error("Run database disabled: %s", exc)
+            return None
+        return database
+
+    def closeDatabase(self, database: DatabaseWriter) -> None:
+        try:
+            database.end_run(self.clock().time())
+        except Exception as exc:
+            logger.exception(exc)
+        try:
+            database.close()
+        except Exception as exc:
+            logger.exception(exc)
+
+    def rampDownStep(self) -> float:
+        return self.params.get("ramp.down_step", DefaultRampDownStep)
+
+    def rampDownSlewRate(self) -> float:
+        return self.params.get("ramp.down_slew_rate", DefaultRampDownSlewRate)
+
+    def disableAllRelays(self) -> None:
+        """Switch off HV relays of all ShuntBox channels."""
+        with self.resources.get("shunt") as res:
+            shunt = get_driver("shuntbox")(res)
+            shunt.set_relays(range(1, shunt.CHANNELS + 1), False)
+            for sensor in self.sensors():
+                sensor.hv = False
+
     def rampDown(self, smu, multi) -> None:
-        """Ramp down SMU voltage to zero."""
-        minimumStep = 5.0  # quick ramp down minimum step
+        """Ramp down SMU voltage to zero.
+
+        Voltages are written without waiting for completion of each step,
+        limited by the ramp down dV/dt. HV relays are switched off in
+        parallel to the rest of the ramp once the voltage is below
+        `RelaySafeVoltage`, never under full bias.
+        """
+        t0 = self.clock().monotonic()
         zeroVoltage = 0.0
         startVoltage = self.currentVoltage()
-        deltaVoltage = startVoltage - self.currentVoltage()
         self.showMessage("Ramping down")
-        self.showProgress(deltaVoltage, startVoltage)
-        ivStep = max(minimumStep, self.ivStep())
-        step = -ivStep if zeroVoltage < self.currentVoltage() else ivStep
-        for value in LinearRange(self.currentVoltage(), zeroVoltage, step):
-            # Ramp down at any cost to save lives!
-            self.setCurrentVoltage(value)
-            self.showMessage(f"Ramping to zero ({value:.2f} V)")
-            # Set voltage
-            smu.resource.write(f":SOUR:VOLT:LEV {value:E}")
+        self.showProgress(0, abs(startVoltage))
+        step = self.rampDownStep()
+        delay = step / self.rampDownSlewRate()
+
+        errors: list = []
+
+        def disableRelays():
+            try:
+                self.disableAllRelays()
+            except Exception as exc:
+                errors.append(exc)
+
+        relays: Optional[threading.Thread] = None
+
+        def startRelays():
+            nonlocal relays
+            if relays is None and self.useShuntBox() and abs(self.currentVoltage()) <= RelaySafeVoltage:
+                relays = threading.Thread(target=disableRelays)
+                relays.start()
+
+        try:
+            startRelays()
+            if self.hardwareSweepEnabled():
+                try:
+                    self.sweepSmu(smu, zeroVoltage, step, delay, "Ramping to zero", abortable=False)
+                except Exception as exc:
+                    # Continue ramping down step by step
+                    logger.exception(exc)
+                startRelays()
+            for value in linear_points(self.currentVoltage(), zeroVoltage, step):
+                # Ramp down at any cost to save lives!
+                self.setCurrentVoltage(value)
+                self.showMessage(f"Ramping to zero ({value:.2f} V)")
+                smu.resource.write(f":SOUR:VOLT:LEV {value:E}")
+                self.showProgress(abs(startVoltage - value), abs(startVoltage))
+                self.clock().sleep(delay)
+                self.smuReading.emit({"U": self.currentVoltage(), "I": None})
+                startRelays()
             smu.resource.query("*OPC?")
-            deltaVoltage = startVoltage - self.currentVoltage()
-            self.showProgress(deltaVoltage, startVoltage)
-            time.sleep(0.25)  # value from labview
-            self.smuReading.emit({"U": self.currentVoltage(), "I": None})
+            startRelays()
+        finally:
+            if relays is not None:
+                relays.join()
 
-        # Diable all shunt box channels
-        if self.useShuntBox():
-            with self.resources.get("shunt") as res:
-                shunt = get_driver("shuntbox")(res)
-                shunt.set_all_relays(False)
-                for sensor in self.sensors():
-                    sensor.hv = False
+        # Retry disabling all shunt box channels
+        for exc in errors:
+            logger.exception(exc)
+        if errors:
+            self.disableAllRelays()
 
         # switch output OFF
         smu.resource.write(":OUTP:STAT OFF")
 
-        self.showMessage("Done")
+        duration = self.clock().monotonic() - t0
+        ramp_down_duration.observe(duration)
+        logger.info("Ramped down from %.2f V in %.1f s", startVoltage, duration)
+        self.showMessage(f"Ramped down in {duration:.1f} s")
 
     def __call__(self) -> None:
         try:
@@ -825,19 +1538,46 @@ class MeasureWorker(QtCore.QObject):
                 smu = get_driver("smu")(stack.enter_context(self.resources.get("smu")))
                 multi = get_driver("dmm")(stack.enter_context(self.resources.get("multi")))
                 try:
-                    self.setup(smu, multi)
-                    self.rampUp(smu, multi)
-                    self.rampBias(smu, multi)
-                    self.longterm(smu, multi)
+                    resume = self.resumeJournal()
+                    if resume is not None:
+                        self.publishState("resume")
+                        with tracer.span("resume", "stage"):
+                            self.resume(smu, multi, resume)
+                    else:
+                        self.publishState("setup")
+                        with tracer.span("setup", "stage"):
+                            self.setup(smu, multi)
+                        self.publishState("rampUp")
+                        with tracer.span("rampUp", "stage"):
+                            self.rampUp(smu, multi)
+                        self.publishState("rampBias")
+                        with tracer.span("rampBias", "stage"):
+                            self.rampBias(smu, multi)
+                    self.publishState("longterm")
+                    with tracer.span("longterm", "stage"):
+                        self.longterm(smu, multi)
                 except AbortRequested:
                     ...
                 finally:
-                    self.rampDown(smu, multi)
+                    # Ramp down before anything else, HV must never stay on.
+                    # A run failing to ramp down must not be offered for
+                    # resume, which would apply HV again.
+                    stage = "failed"
+                    try:
+                        with tracer.span("rampDown", "stage"):
+                            self.rampDown(smu, multi)
+                        stage = "stopped"
+                    finally:
+                        self.updateJournal(stage=stage)
+                    self.publishState("stopped")
                     self.showMessage("Stopped")
                     self.hideProgress()
         except Exception as exc:
             logger.exception(exc)
             self.failed.emit(exc)
         finally:
+            self.setResumeJournal(None)
+            self.__journal = None
             self.finished.emit()
             self.abort_requested = threading.Event()
+
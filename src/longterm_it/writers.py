@@ -1,18 +1,59 @@
 import csv
+import math
+from typing import Iterable, Optional
 
 from . import __version__
+from .metrics import registry
+from .normalize import DefaultBandGap, DefaultReferenceTemperature
 from .sensor import Sensor
+from .timeindex import TimeIndexWriter
 from .utils import make_iso
 
+__all__ = ["Writer", "IVWriter", "ItWriter", "RunWriter"]
+
+HVStatus: dict = {False: "OFF", True: "ON"}
 
-class Writer:
-    """CSV file writer for IV and It measurements."""
+
+class BaseWriter:
+    """CSV file writer base class."""
 
     def __init__(self, fp) -> None:
         self.fp = fp
         self.writer = csv.writer(fp)
+        self.index: Optional[TimeIndexWriter] = None
+        self.flush_duration = registry.histogram(
+            "longterm_writer_flush_duration_seconds",
+            "Output file flush duration in seconds.",
+            {"writer": type(self).__name__},
+        )
+        self.rows_written = registry.counter(
+            "longterm_writer_rows_total",
+            "Number of data rows written to output files.",
+            {"writer": type(self).__name__},
+        )
+
+    def flush(self) -> None:
+        with self.flush_duration.time():
+            self.fp.flush()
 
-    def write_meta(self, sensor: Sensor, operator: str, timestamp: str, voltage: float) -> None:
+    def index_row(self, timestamp: float) -> None:
+        """Record byte offset of next row in sidecar index, if assigned."""
+        if self.index is not None:
+            self.index.add(timestamp, self.fp.tell() if self.index.due() else None)
+
+
+class Writer(BaseWriter):
+    """CSV file writer for IV and It measurements."""
+
+    def write_meta(
+        self,
+        sensor: Sensor,
+        operator: str,
+        timestamp: str,
+        voltage: float,
+        reference_temperature: float = DefaultReferenceTemperature,
+        band_gap: float = DefaultBandGap,
+    ) -> None:
         self.writer.writerows([
             [f"HEPHY Vienna longtime It measurement version {__version__}"],
             [f"sensor name: {sensor.name}"],
@@ -21,9 +62,11 @@ class Writer:
             [f"datetime: {timestamp}"],
             [f"calibration [Ohm]: {sensor.resistivity}"],
             [f"Voltage [V]: {voltage}"],
+            [f"reference temperature [°C]: {reference_temperature}"],
+            [f"band gap [eV]: {band_gap}"],
             [],
         ])
-        self.fp.flush()
+        self.flush()
 
     def write_header(self) -> None:
         self.writer.writerow([
@@ -37,8 +80,10 @@ class Writer:
             "cts_status",
             "cts_program",
             "hv_status",
+            "current_norm [A]",
+            "cts_age [s]",
         ])
-        self.fp.flush()
+        self.flush()
 
     def write_row(
         self,
@@ -53,7 +98,10 @@ class Writer:
         cts_status: int,
         cts_program: int,
         hv_status: bool,
+        current_norm: float = math.nan,
+        cts_age: float = math.nan,
     ) -> None:
+        self.index_row(timestamp)
         self.writer.writerow([
             format(timestamp, ".3f"),
             format(voltage, "E"),
@@ -64,9 +112,12 @@ class Writer:
             format(cts_humidity, ".2f"),
             format(cts_status),
             format(cts_program),
-            {False: "OFF", True: "ON"}.get(hv_status, "N/A"),
+            HVStatus.get(hv_status, "N/A"),
+            format(current_norm, "E"),
+            format(cts_age, ".1f"),
         ])
-        self.fp.flush()
+        self.rows_written.inc()
+        self.flush()
 
 
 class IVWriter(Writer):
@@ -77,3 +128,114 @@ class IVWriter(Writer):
 class ItWriter(Writer):
 
     ...
+
+
+class RunWriter(BaseWriter):
+    """Combined CSV file writer for It measurements of all enabled sensors,
+    writing one row per scan. Shared values are written once, followed by
+    current, shunt voltage, PT100 temperature and HV status per channel.
+    """
+
+    def __init__(self, fp, sensors: Iterable[Sensor]) -> None:
+        super().__init__(fp)
+        self.sensors: list[Sensor] = list(sensors)
+
+    def write_meta(
+        self,
+        operator: str,
+        timestamp: str,
+        voltage: float,
+        reference_temperature: float = DefaultReferenceTemperature,
+        band_gap: float = DefaultBandGap,
+    ) -> None:
+        rows = [
+            [f"HEPHY Vienna longtime It measurement version {__version__}"],
+            [f"operator: {operator}"],
+            [f"datetime: {timestamp}"],
+            [f"Voltage [V]: {voltage}"],
+            [f"reference temperature [°C]: {reference_temperature}"],
+            [f"band gap [eV]: {band_gap}"],
+        ]
+        for sensor in self.sensors:
+            rows.extend([
+                [f"sensor channel: {sensor.index}"],
+                [f"sensor name: {sensor.name}"],
+                [f"calibration [Ohm]: {sensor.resistivity}"],
+            ])
+        rows.append([])
+        self.writer.writerows(rows)
+        self.flush()
+
+    def write_header(self) -> None:
+        header = [
+            "timestamp [s]",
+            "voltage [V]",
+            "smu_current [A]",
+            "cts_temperature [°C]",
+            "cts_humidity [%rH]",
+            "cts_status",
+            "cts_program",
+            "cts_age [s]",
+        ]
+        for sensor in self.sensors:
+            header.extend([
+                f"current_{sensor.index} [A]",
+                f"voltage_{sensor.index} [V]",
+                f"pt100_{sensor.index} [°C]",
+                f"hv_status_{sensor.index}",
+                f"current_norm_{sensor.index} [A]",
+            ])
+        self.writer.writerow(header)
+        self.flush()
+
+    def write_row(
+        self,
+        *,
+        timestamp: float,
+        voltage: float,
+        smu_current: float,
+        cts_temperature: float,
+        cts_humidity: float,
+        cts_status: int,
+        cts_program: int,
+        channels: dict,
+        cts_age: float = math.nan,
+    ) -> None:
+        """Write row, `channels` maps sensor index to dictionary containing
+        current `I`, shunt voltage `U`, PT100 temperature `temp`, HV status
+        `hv` and normalized current `I_norm`."""
+        row = [
+            format(timestamp, ".3f"),
+            format(voltage, "E"),
+            format(smu_current, "E"),
+            format(cts_temperature, ".2f"),
+            format(cts_humidity, ".2f"),
+            format(cts_status),
+            format(cts_program),
+            format(cts_age, ".1f"),
+        ]
+        for sensor in self.sensors:
+            channel = channels.get(sensor.index, {})
+            row.extend([
+                format(channel.get("I", math.nan), "E"),
+                format(channel.get("U", math.nan), "E"),
+                format(channel.get("temp", math.nan), ".2f"),
+                HVStatus.get(channel.get("hv"), "N/A"),
+                format(channel.get("I_norm", math.nan), "E"),
+            ])
+        self.index_row(timestamp)
+        self.writer.writerow(row)
+        self.rows_written.inc()
+        self.flush()
+
+    def write_gap(self, timestamp: float) -> None:
+        """Write continuity marker row (no values) where a resumed run
+        continues after an interruption."""
+        row = [format(timestamp, ".3f")]
+        row.extend([format(math.nan, "E")] * 4)
+        row.extend(["N/A", "N/A", format(math.nan, ".1f")])
+        for _ in self.sensors:
+            row.extend([format(math.nan, "E"), format(math.nan, "E"), format(math.nan, ".2f"), "N/A", format(math.nan, "E")])
+        self.index_row(timestamp)
+        self.writer.writerow(row)
+        self.flush()
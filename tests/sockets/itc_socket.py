@@ -14,6 +14,11 @@ def fake_analog_channel(channel, minimum, maximum):
     return "{} {:05.1f} {:05.1f}".format(channel, actual, target)
 
 
+def split_commands(data):
+    """Returns commands contained in received data."""
+    return re.findall(r"t\d{12}|T|A.|a\d\s+-?\d+\.\d|S|O|P\d{3}|P", data)
+
+
 class ClimateHandler(socketserver.BaseRequestHandler):
 
     temp = 24.0
@@ -35,90 +40,96 @@ class ClimateHandler(socketserver.BaseRequestHandler):
         while True:
             time.sleep(0.100)  # throttle
             data = self.recv(1024)
-
-            if re.match(r"T", data):
-                dt = datetime.datetime.now().strftime("T%d%m%y%H%M%S")
-                self.send(dt)
-
-            elif re.match(r"t\d{12}", data):
-                t = datetime.datetime.strptime(data, "t%d%m%y%H%M%S")
-                dt = t.strftime("T%d%m%y%H%M%S")
-                self.send(dt)
-
-            elif re.match(r"A0", data):
-                self.temp += random.uniform(-0.25, +0.25)
-                self.temp = min(60.0, max(20.0, self.temp))
-                self.send("{} {:05.1f} {:05.1f}".format(data, self.temp, 24.0))
-
-            elif re.match(r"A[34]", data):
-                result = fake_analog_channel(data, -45.0, +185.0)
-                self.send(result)
-
-            elif re.match(r"A1", data):
-                self.humid += random.uniform(-0.25, +0.25)
-                self.humid = min(95.0, max(15.0, self.humid))
-                self.send("{} {:05.1f} {:05.1f}".format(data, self.humid, 55.0))
-
-            elif re.match(r"A2", data):
-                result = fake_analog_channel(data, +0.0, +15.0)
-                self.send(result)
-
-            elif re.match(r"A[56]", data):
-                result = fake_analog_channel(data, +5.0, +98.0)
-                self.send(result)
-
-            elif re.match(r"A7", data):
-                result = fake_analog_channel(data, -50.0, +150.0)
-                self.send(result)
-
-            elif re.match(r"A8", data):
-                result = fake_analog_channel(data, -80.0, +190.0)
-                self.send(result)
-
-            elif re.match(r"A9", data):
-                result = fake_analog_channel(data, -0.0, +25.0)
-                self.send(result)
-
-            elif re.match(r"A\:", data):
-                result = fake_analog_channel(data, -50.0, +100.0)
-                self.send(result)
-
-            elif re.match(r"A\;", data):
-                result = fake_analog_channel(data, -0.0, +25.0)
-                self.send(result)
-
-            elif re.match(r"A\<", data):
-                result = fake_analog_channel(data, +2.0, +5.0)
-                self.send(result)
-
-            elif re.match(r"A[\=\>]", data):
-                result = fake_analog_channel(data, -100.0, +200.0)
-                self.send(result)
-
-            elif re.match(r"A\?", data):
-                result = fake_analog_channel(data, -80.0, +200.0)
-                self.send(result)
-
-            elif re.match(r"a[1-7]\s(-?\d+.\d)", data):
-                self.send("a")
-
-            elif re.match(r"S", data):
-                result = "S11110100\x06"
-                self.send(result)
-
-            elif re.match(r"O", data):
-                result = "O1100000000000"
-                self.send(result)
-
-            elif re.match(r"P", data):
-                result = "P000"
-                self.send(result)
-
-            elif re.match(r"P\d{3}", data):
-                self.send(data)
-
-            elif re.match(r"a[0-6]\s+\d+\.\d+", data):
-                self.send("a")
+            if not data:
+                break
+            # Commands written back to back arrive in a single chunk
+            for command in split_commands(data):
+                self.reply(command)
+
+    def reply(self, data):
+        if re.match(r"T", data):
+            dt = datetime.datetime.now().strftime("T%d%m%y%H%M%S")
+            self.send(dt)
+
+        elif re.match(r"t\d{12}", data):
+            t = datetime.datetime.strptime(data, "t%d%m%y%H%M%S")
+            dt = t.strftime("T%d%m%y%H%M%S")
+            self.send(dt)
+
+        elif re.match(r"A0", data):
+            self.temp += random.uniform(-0.25, +0.25)
+            self.temp = min(60.0, max(20.0, self.temp))
+            self.send("{} {:05.1f} {:05.1f}".format(data, self.temp, 24.0))
+
+        elif re.match(r"A[34]", data):
+            result = fake_analog_channel(data, -45.0, +185.0)
+            self.send(result)
+
+        elif re.match(r"A1", data):
+            self.humid += random.uniform(-0.25, +0.25)
+            self.humid = min(95.0, max(15.0, self.humid))
+            self.send("{} {:05.1f} {:05.1f}".format(data, self.humid, 55.0))
+
+        elif re.match(r"A2", data):
+            result = fake_analog_channel(data, +0.0, +15.0)
+            self.send(result)
+
+        elif re.match(r"A[56]", data):
+            result = fake_analog_channel(data, +5.0, +98.0)
+            self.send(result)
+
+        elif re.match(r"A7", data):
+            result = fake_analog_channel(data, -50.0, +150.0)
+            self.send(result)
+
+        elif re.match(r"A8", data):
+            result = fake_analog_channel(data, -80.0, +190.0)
+            self.send(result)
+
+        elif re.match(r"A9", data):
+            result = fake_analog_channel(data, -0.0, +25.0)
+            self.send(result)
+
+        elif re.match(r"A\:", data):
+            result = fake_analog_channel(data, -50.0, +100.0)
+            self.send(result)
+
+        elif re.match(r"A\;", data):
+            result = fake_analog_channel(data, -0.0, +25.0)
+            self.send(result)
+
+        elif re.match(r"A\<", data):
+            result = fake_analog_channel(data, +2.0, +5.0)
+            self.send(result)
+
+        elif re.match(r"A[\=\>]", data):
+            result = fake_analog_channel(data, -100.0, +200.0)
+            self.send(result)
+
+        elif re.match(r"A\?", data):
+            result = fake_analog_channel(data, -80.0, +200.0)
+            self.send(result)
+
+        elif re.match(r"a[1-7]\s(-?\d+.\d)", data):
+            self.send("a")
+
+        elif re.match(r"S", data):
+            result = "S11110100\x06"
+            self.send(result)
+
+        elif re.match(r"O", data):
+            result = "O1100000000000"
+            self.send(result)
+
+        elif re.match(r"P\d{3}", data):
+            self.send(data)
+
+        elif re.match(r"P", data):
+            result = "P000"
+            self.send(result)
+
+        elif re.match(r"a[0-6]\s+\d+\.\d+", data):
+            self.send("a")
 
 
 class TCPServer(socketserver.ThreadingTCPServer):
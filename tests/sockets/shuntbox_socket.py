@@ -19,6 +19,8 @@ class ShuntBoxHandler(socketserver.BaseRequestHandler):
 
     channels = 10
 
+    relays = [False] * channels
+
     def recv(self, n):
         data = self.request.recv(1024)
         if data:
@@ -56,14 +58,28 @@ class ShuntBoxHandler(socketserver.BaseRequestHandler):
                 elif re.match(r"GET:TEMP \d+", data):
                     self.send(format(random.uniform(22.0, 26.0), ".1f"))
 
-                elif re.match(r"SET:REL_(ON|OFF) (\d+|ALL)", data):
+                elif re.match(r"SET:REL_(ON|OFF) ALL$", data):
+                    enabled = data.startswith("SET:REL_ON")
+                    self.relays[:] = [enabled] * self.channels
                     self.send("OK")
 
-                elif re.match(r"GET:REL (\d+)", data):
-                    self.send("0")
+                elif re.match(r"SET:REL_(ON|OFF) (\d+)$", data):
+                    index = int(data.split()[-1])
+                    if 0 < index <= self.channels:
+                        self.relays[index - 1] = data.startswith("SET:REL_ON")
+                        self.send("OK")
+                    else:
+                        self.send("ERR")
+
+                elif re.match(r"SET:REL_", data):
+                    self.send("ERR")
+
+                elif re.match(r"GET:REL (\d+)$", data):
+                    index = int(data.split()[-1])
+                    self.send(format(int(self.relays[index - 1])) if 0 < index <= self.channels else "ERR")
 
                 elif re.match(r"GET:REL ALL", data):
-                    self.send(",".join(["0"] * self.channels + 4))
+                    self.send(",".join(format(int(value)) for value in self.relays) + ",")
 
 
 def main():
@@ -0,0 +1,72 @@
+import io
+import json
+
+import numpy as np
+
+from longterm_it.anomaly import AnomalyDetector, AnomalyMonitor, RollingMedian, write_event
+from longterm_it.sensor import Sensor
+
+
+def run(detector, currents):
+    events = []
+    for t, current in enumerate(currents):
+        event = detector.add(float(t), float(current))
+        if event:
+            events.append(event)
+    return events
+
+
+def noise(count, seed=42):
+    rng = np.random.default_rng(seed)
+    return 1e-7 * (1 + rng.normal(0, 0.01, count))
+
+
+def test_rolling_median():
+    rng = np.random.default_rng(42)
+    values = rng.normal(0, 1, 200)
+    window = RollingMedian(31)
+    for index, value in enumerate(values):
+        window.add(value)
+        last = values[max(0, index - 30):index + 1]
+        assert len(window) == len(last)
+        assert window.median() == np.median(last)
+        assert np.isclose(window.mad(), np.median(np.abs(last - np.median(last))))
+
+
+def test_noise():
+    assert run(AnomalyDetector(), noise(2000)) == []
+
+
+def test_spike():
+    currents = noise(200)
+    currents[120] *= 2
+    events = run(AnomalyDetector(), currents)
+    assert [(event["kind"], event["time"]) for event in events] == [("spike", 120.0)]
+    assert events[0]["score"] > 8
+
+
+def test_step():
+    currents = noise(300)
+    currents[150:] *= 1.05
+    events = run(AnomalyDetector(), currents)
+    assert [event["kind"] for event in events] == ["step"]
+    assert 150 <= events[0]["time"] < 160
+
+
+def test_monitor():
+    sensors = [Sensor(1), Sensor(2)]
+    monitor = AnomalyMonitor(sensors)
+    for t, current in enumerate(noise(50)):
+        channels = {1: {"I": current, "hv": True}, 2: {"I": current, "hv": False}}
+        assert monitor.add(float(t), channels) == []
+    events = monitor.add(50.0, {1: {"I": 1e-6, "hv": True}, 2: {"I": 1e-6, "hv": False}})
+    assert [(event["index"], event["kind"]) for event in events] == [(1, "spike")]
+    assert len(monitor.detectors[2].window) == 0
+
+
+def test_write_event():
+    fp = io.StringIO()
+    write_event(fp, {"index": 1, "kind": "spike", "time": 1.0})
+    write_event(fp, {"index": 2, "kind": "step", "time": 2.0})
+    lines = fp.getvalue().splitlines()
+    assert [json.loads(line)["kind"] for line in lines] == ["spike", "step"]
@@ -0,0 +1,77 @@
+import gzip
+import os
+
+import pytest
+
+from longterm_it.archive import ArchiveReader, ArchiveWriter, archive_filename, open_text
+
+
+class Clock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_archive_filename():
+    assert archive_filename("it.txt", "gzip") == "it.txt.gz"
+    assert archive_filename("it.txt", "zstd", 1) == "it-001.txt.zst"
+
+
+@pytest.mark.parametrize("compression", ["gzip", "zstd"])
+def test_archive_writer(tmp_path, compression):
+    if compression == "zstd":
+        pytest.importorskip("zstandard")
+    clock = Clock()
+    filename = os.path.join(tmp_path, "it.txt")
+    with ArchiveWriter(filename, compression, chunk_interval=60.0, clock=clock) as archive:
+        archive.write("header\r\n")
+        archive.mark_header()
+        for index in range(10):
+            clock.now += 30.0
+            archive.write(f"{index}\r\n")
+            archive.flush()
+    filename = archive.filenames()[0]
+    reader = ArchiveReader(filename)
+    chunks = reader.chunks()
+    assert [chunk["line"] for chunk in chunks] == [0, 1, 3, 5, 7, 9]
+    assert reader.read_chunk(2) == "2\r\n3\r\n"
+    with open_text(filename) as fp:
+        assert fp.read() == "header\r\n" + "".join(f"{index}\r\n" for index in range(10))
+    # Chunk boundaries without sidecar file
+    os.remove(filename + ".chunks")
+    assert ArchiveReader(filename).chunks() == chunks
+
+
+def test_archive_truncated(tmp_path):
+    filename = os.path.join(tmp_path, "it.txt")
+    with ArchiveWriter(filename, chunk_size=1) as archive:
+        for index in range(3):
+            archive.write(f"{index}\n")
+            archive.flush()
+    filename = archive.filenames()[0]
+    with open(filename, "rb") as fp:
+        data = fp.read()
+    with open(filename, "wb") as fp:
+        fp.write(data[:-4])  # simulate crash while writing last chunk
+    os.remove(filename + ".chunks")
+    assert list(ArchiveReader(filename)) == ["0\n", "1\n"]
+
+
+def test_archive_rotation(tmp_path):
+    clock = Clock()
+    filename = os.path.join(tmp_path, "it.txt")
+    with ArchiveWriter(filename, chunk_size=1, rotate_interval=3600.0, clock=clock) as archive:
+        archive.write("header\n")
+        archive.mark_header()
+        for index in range(4):
+            archive.write(f"{index}\n")
+            archive.flush()
+            clock.now += 1800.0
+    assert [os.path.basename(name) for name in archive.filenames()] == ["it.txt.gz", "it-001.txt.gz"]
+    with gzip.open(archive.filenames()[0], "rt") as fp:
+        assert fp.read() == "header\n0\n1\n"
+    with gzip.open(archive.filenames()[1], "rt") as fp:
+        assert fp.read() == "header\n2\n3\n"
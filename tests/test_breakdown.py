@@ -0,0 +1,52 @@
+import math
+
+import numpy as np
+
+from longterm_it.breakdown import BreakdownDetector
+
+
+def ramp(detector, voltages, currents):
+    for voltage, current in zip(voltages, currents):
+        reason = detector.add(voltage, current)
+        if reason:
+            return voltage, reason
+    return None
+
+
+def test_bulk_current():
+    voltages = -np.arange(0, 1001, 10.0)
+    currents = -1e-7 * np.sqrt(np.abs(voltages) / 100)
+    rng = np.random.default_rng(42)
+    currents *= 1 + rng.normal(0, 0.02, len(currents))
+    assert ramp(BreakdownDetector(), voltages, currents) is None
+
+
+def test_avalanche():
+    voltages = np.arange(0, 1001, 10.0)
+    # Bulk current with avalanche multiplication above 600 V
+    currents = 1e-7 * np.sqrt(voltages / 100) * np.exp(np.clip(voltages - 600, 0, None) / 15)
+    voltage, reason = ramp(BreakdownDetector(jump=100.0), voltages, currents)
+    assert 600 < voltage <= 700
+    assert reason.startswith("slope")
+
+
+def test_jump():
+    voltages = [100.0, 110.0, 120.0, 130.0]
+    currents = [1e-7, 1.1e-7, 1.2e-7, 5e-7]
+    voltage, reason = ramp(BreakdownDetector(), voltages, currents)
+    assert voltage == 130.0
+    assert reason.startswith("current jump")
+
+
+def test_min_current():
+    detector = BreakdownDetector(min_current=1e-9)
+    assert ramp(detector, [10.0, 20.0, 30.0], [1e-12, 1e-10, 5e-10]) is None
+    assert math.isnan(detector.slope)
+
+
+def test_triggered_once():
+    detector = BreakdownDetector()
+    assert detector.add(100.0, 1e-7) is None
+    assert detector.add(110.0, 1e-6)
+    assert detector.triggered
+    assert detector.add(120.0, 1e-5) is None
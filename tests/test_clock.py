@@ -0,0 +1,49 @@
+import threading
+import time
+
+from longterm_it.clock import Clock, VirtualClock
+
+
+def test_clock():
+    clock = Clock()
+    assert abs(clock.time() - time.time()) < 1.0
+    t0 = clock.monotonic()
+    clock.sleep(0.01)
+    assert clock.monotonic() > t0
+
+
+def test_virtual_clock():
+    clock = VirtualClock(start=1e9)
+    assert clock.time() == 1e9
+    clock.sleep(3600)
+    assert clock.elapsed() == 3600
+    assert clock.time() == 1e9 + 3600
+    clock.advance(60)
+    assert clock.monotonic() == 3660
+
+
+def test_virtual_clock_threads():
+    clock = VirtualClock(start=0)
+    samples: dict = {"fast": [], "slow": []}
+
+    def worker(name, interval, count):
+        for _ in range(count):
+            clock.sleep(interval)
+            samples[name].append(clock.monotonic())
+
+    threads = [
+        threading.Thread(target=worker, args=("fast", 0.25, 4 * 3600)),
+        threading.Thread(target=worker, args=("slow", 5.0, 720)),
+    ]
+    for thread in threads:
+        clock.attach(thread)
+    t0 = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert time.monotonic() - t0 < 30.0
+    # Both threads observed virtual time in step with their own sleeps
+    assert samples["fast"][-1] == 3600.0
+    assert samples["slow"][-1] == 3600.0
+    assert samples["slow"][:3] == [5.0, 10.0, 15.0]
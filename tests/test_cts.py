@@ -0,0 +1,161 @@
+import math
+
+import pytest
+
+from longterm_it.clock import VirtualClock
+from longterm_it.cts import EnvironPoller, EnvironSnapshot, parse_field, query_batch, status_text
+from longterm_it.simulators import SimulatedSetup, create_resources
+
+
+class CountingResource:
+
+    def __init__(self, resource):
+        self.resource = resource
+        self.writes = 0
+        self.reads = 0
+        self.clears = 0
+
+    def write(self, message):
+        self.writes += 1
+        return self.resource.write(message)
+
+    def read_bytes(self, count):
+        self.reads += 1
+        return self.resource.read_bytes(count)
+
+    def clear(self):
+        self.clears += 1
+        self.resource.clear()
+
+
+def test_query_batch():
+    setup = SimulatedSetup(seed=42)
+    setup.itc.program = 7
+    resource = CountingResource(create_resources(setup)["cts"])
+    replies = query_batch(resource)
+    assert resource.writes == 5
+    assert resource.reads == 1
+    assert sorted(replies) == ["humid", "pause", "program", "running", "temp"]
+    assert abs(parse_field("temp", replies["temp"]) - 20.0) < 0.1
+    assert parse_field("running", replies["running"]) is True
+    assert parse_field("pause", replies["pause"]) is False
+    assert parse_field("program", replies["program"]) == 7
+
+
+class UnbatchedResource(CountingResource):
+    """Controller answering only a single pending command, batched reads
+    time out."""
+
+    def __init__(self, resource):
+        super().__init__(resource)
+        self.pending = []
+
+    def write(self, message):
+        self.writes += 1
+        self.pending.append(message)
+
+    def read_bytes(self, count):
+        self.reads += 1
+        pending, self.pending = self.pending, []
+        if len(pending) != 1:
+            raise TimeoutError("read timed out")
+        self.resource.write(pending[0])
+        return self.resource.read_bytes(count)
+
+
+def test_query_batch_fallback():
+    setup = SimulatedSetup(seed=42)
+    setup.itc.program = 7
+    resource = UnbatchedResource(create_resources(setup)["cts"])
+    with pytest.raises(TimeoutError):
+        query_batch(resource)
+    assert resource.clears == 1
+    poller = EnvironPoller(VirtualClock())
+    poller.poll(resource)
+    assert poller.errors == {}
+    assert poller.values["program"] == 7
+    assert not poller.batch
+    assert (resource.writes, resource.reads) == (15, 7)
+    poller.poll(resource)
+    assert (resource.writes, resource.reads) == (20, 12)
+    assert resource.clears == 2
+
+
+class ShortResource(CountingResource):
+    """Controller dropping the temperature reply of batched reads."""
+
+    def read_bytes(self, count):
+        data = super().read_bytes(count)
+        return data[14:] if count > 14 else data
+
+
+def test_query_batch_short():
+    setup = SimulatedSetup(seed=42)
+    setup.humidity = 45.0
+    resource = ShortResource(create_resources(setup)["cts"])
+    assert "temp" not in query_batch(resource)
+    resource.clear()
+    poller = EnvironPoller(VirtualClock())
+    poller.poll(resource)
+    assert poller.batch
+    assert poller.errors == {}
+    assert abs(poller.values["temp"] - 20.0) < 0.1
+    assert abs(poller.values["humid"] - 45.0) < 0.3
+
+
+def test_status_text():
+    assert status_text(True, False) == "ON"
+    assert status_text(False, False) == "OFF"
+    assert status_text(True, True) == "PAUSE"
+    assert status_text(None, None) == "N/A"
+
+
+def test_stale_field():
+    setup = SimulatedSetup(seed=42)
+    clock = VirtualClock(start=0)
+    resource = create_resources(setup)["cts"]
+    poller = EnvironPoller(clock, interval=5.0)
+    poller.poll(resource)
+    reading = poller.reading()
+    assert reading["status"] == "ON"
+    assert reading["age"] == {"temp": 0, "humid": 0, "running": 0, "pause": 0, "program": 0}
+    clock.advance(5.0)
+    setup.itc.program = 3
+    setup.humidity = math.nan  # malformed reply
+    poller.poll(resource)
+    reading = poller.reading()
+    assert reading["program"] == 3
+    assert abs(reading["humid"] - 30.0) < 0.5  # last valid value
+    assert reading["age"]["humid"] == 5.0
+    assert reading["age"]["temp"] == 0
+    assert "humid" in poller.errors
+
+
+def test_fixed_rate():
+    clock = VirtualClock(start=0)
+    poller = EnvironPoller(clock, interval=5.0)
+    poller.deadline = clock.monotonic()  # first poll
+    times = []
+    for duration in (1.0, 2.0, 0.5, 12.0, 1.0):
+        times.append(clock.monotonic())
+        clock.advance(duration)  # query duration
+        poller.wait()
+    assert times == [0.0, 5.0, 10.0, 15.0, 30.0]
+
+
+def test_snapshot():
+    setup = SimulatedSetup(seed=42)
+    clock = VirtualClock(start=0)
+    poller = EnvironPoller(clock, interval=5.0)
+    snapshot = EnvironSnapshot()
+    assert snapshot.read() == {}
+    assert math.isnan(snapshot.age(snapshot.read(), clock.time()))
+    poller.poll(create_resources(setup)["cts"])
+    snapshot.update(poller.reading())
+    reading = snapshot.read()
+    clock.advance(2.0)
+    snapshot.update({"time": clock.time()})
+    assert reading["status"] == "ON"  # previous reading unchanged
+    assert snapshot.age(reading, clock.time()) == 2.0
+    snapshot.clear()
+    assert snapshot.read() == {}
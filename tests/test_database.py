@@ -0,0 +1,98 @@
+import numpy as np
+
+from longterm_it.database import DatabaseWriter, RunDatabase
+from longterm_it.sensor import Sensor
+
+
+def create_sensors():
+    sensors = []
+    for index, name in ((1, "Spam"), (3, "Eggs")):
+        sensor = Sensor(index)
+        sensor.name = name
+        sensor.resistivity = 470e3
+        sensors.append(sensor)
+    return sensors
+
+
+def write_run(filename, started, operator, voltage, count=10, batch_size=1000):
+    with DatabaseWriter(filename, batch_size=batch_size) as writer:
+        run_id = writer.begin_run(started, operator, voltage, "it.txt", create_sensors())
+        for index in range(count):
+            writer.write_sample(
+                timestamp=started + index * 60.0,
+                voltage=voltage,
+                smu_current=1e-6,
+                cts_temperature=20.0,
+                cts_humidity=30.0,
+                channels={
+                    1: {"I": index * 1e-9, "temp": 21.5, "hv": True},
+                    3: {"I": 6e-8, "temp": 21.6, "hv": None},
+                    5: {"I": 7e-8, "temp": 21.7, "hv": False},  # unknown sensor
+                },
+            )
+        writer.end_run(started + count * 60.0)
+    return run_id
+
+
+def test_database_writer_batches(tmp_path):
+    filename = str(tmp_path / "longterm.sqlite")
+    with DatabaseWriter(filename, batch_size=4) as writer:
+        writer.begin_run(1e9, "Monty", -600.0, "it.txt", create_sensors())
+        channels = {1: {"I": 1e-9, "temp": 21.5, "hv": True}, 3: {"I": 1e-9, "temp": 21.5, "hv": True}}
+        writer.write_sample(timestamp=1e9, voltage=-600.0, smu_current=0, cts_temperature=0, cts_humidity=0, channels=channels)
+        with RunDatabase(filename) as db:
+            assert len(db.samples("Spam")["time"]) == 0
+        writer.write_sample(timestamp=1e9 + 60, voltage=-600.0, smu_current=0, cts_temperature=0, cts_humidity=0, channels=channels)
+        with RunDatabase(filename) as db:
+            assert len(db.samples("Spam")["time"]) == 2
+
+
+def test_run_database(tmp_path):
+    filename = str(tmp_path / "longterm.sqlite")
+    first = write_run(filename, 1e9, "Monty", -600.0)
+    second = write_run(filename, 2e9, "Eric", -800.0, batch_size=3)
+    with RunDatabase(filename) as db:
+        assert [run["id"] for run in db.runs()] == [first, second]
+        assert [run["id"] for run in db.runs(sensor="Spam", operator="Eric")] == [second]
+        assert [run["id"] for run in db.runs(since=1.5e9)] == [second]
+        assert [run["id"] for run in db.runs(voltage=-600.0)] == [first]
+        assert db.runs(sensor="Bacon") == []
+        run = db.runs(until=1.5e9)[0]
+        assert run["finished"] == 1e9 + 600.0
+        sensors = db.sensors(first)
+        assert [sensor["name"] for sensor in sensors] == ["Spam", "Eggs"]
+        assert sensors[0]["resistivity"] == 470e3
+
+        data = db.samples("Spam", start=1e9 + 120, end=1e9 + 300)
+        assert isinstance(data["time"], np.ndarray)
+        assert data["time"].tolist() == [1e9 + 120, 1e9 + 180, 1e9 + 240]
+        assert np.allclose(data["current"], [2e-9, 3e-9, 4e-9])
+        assert data["hv"].tolist() == [1.0, 1.0, 1.0]
+
+        data = db.samples("Eggs")
+        assert len(data["time"]) == 20
+        assert np.all(np.diff(data["time"]) > 0)
+        assert np.all(np.isnan(data["hv"]))
+
+        data = db.samples("Eggs", run_id=second, end=2e9 + 60)
+        assert data["voltage"].tolist() == [-800.0]
+
+        assert len(db.samples("Bacon")["time"]) == 0
+
+
+def test_resume_run(tmp_path):
+    filename = str(tmp_path / "longterm.sqlite")
+    run_id = write_run(filename, 1e9, "Monty", -600.0, count=2)
+    with DatabaseWriter(filename) as writer:
+        writer.resume_run(run_id)
+        writer.write_sample(
+            timestamp=1e9 + 3600,
+            voltage=-600.0,
+            smu_current=1e-6,
+            cts_temperature=20.0,
+            cts_humidity=30.0,
+            channels={1: {"I": 1e-9, "temp": 21.5, "hv": True}},
+        )
+    with RunDatabase(filename) as db:
+        assert db.runs()[0]["finished"] is None
+        assert db.samples("Spam")["time"].tolist() == [1e9, 1e9 + 60, 1e9 + 3600]
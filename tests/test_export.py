@@ -0,0 +1,104 @@
+import csv
+import os
+
+from longterm_it.archive import ArchiveWriter
+from longterm_it.export import RunReader, export_sensor_files
+from longterm_it.sensor import Sensor
+from longterm_it.writers import RunWriter
+
+
+def create_sensors():
+    sensors = []
+    for index, name in ((1, "Spam"), (3, "Eggs")):
+        sensor = Sensor(index)
+        sensor.name = name
+        sensor.resistivity = 470e3
+        sensors.append(sensor)
+    return sensors
+
+
+def write_run(filename, fp=None):
+    with fp or open(filename, "w", newline="") as fp:
+        writer = RunWriter(fp, create_sensors())
+        writer.write_meta("Monty", "2024-01-01T00-00-00", -600.0)
+        writer.write_header()
+        for index in range(3):
+            writer.write_row(
+                timestamp=index * 60.0,
+                voltage=-600.0,
+                smu_current=1e-6,
+                cts_temperature=20.0,
+                cts_humidity=30.0,
+                cts_status="ON",
+                cts_program=1,
+                cts_age=2.5,
+                channels={
+                    1: {"I": 5e-8, "U": 0.0235, "temp": 21.5, "hv": True},
+                    3: {"I": 6e-8, "U": 0.0282, "temp": 21.6, "hv": False, "I_norm": 6.5e-8},
+                },
+            )
+
+
+def test_run_writer(tmp_path):
+    filename = os.path.join(tmp_path, "it-2024-01-01T00-00-00.txt")
+    write_run(filename)
+    with open(filename, newline="") as fp:
+        reader = RunReader(fp)
+        assert reader.operator() == "Monty"
+        assert reader.voltage() == -600.0
+        assert [(sensor.index, sensor.name, sensor.resistivity) for sensor in reader.sensors] == [(1, "Spam", 470e3), (3, "Eggs", 470e3)]
+        assert reader.header[:3] == ["timestamp [s]", "voltage [V]", "smu_current [A]"]
+        assert reader.header[7] == "cts_age [s]"
+        assert reader.header[8:12] == ["current_1 [A]", "voltage_1 [V]", "pt100_1 [°C]", "hv_status_1"]
+        rows = list(reader)
+    assert len(rows) == 3
+    assert rows[1]["timestamp [s]"] == "60.000"
+    assert float(rows[1]["current_3 [A]"]) == 6e-8
+    assert rows[1]["hv_status_3"] == "OFF"
+
+
+def test_export_sensor_files(tmp_path):
+    filename = os.path.join(tmp_path, "it-2024-01-01T00-00-00.txt")
+    write_run(filename)
+    filenames = export_sensor_files(filename)
+    assert [os.path.basename(name) for name in filenames] == [
+        "it-Spam-2024-01-01T00-00-00.txt",
+        "it-Eggs-2024-01-01T00-00-00.txt",
+    ]
+    with open(filenames[1], newline="") as fp:
+        rows = list(csv.reader(fp))
+    assert rows[1] == ["sensor name: Eggs"]
+    assert rows[2] == ["sensor channel: 3"]
+    assert rows[6] == ["Voltage [V]: -600.0"]
+    assert rows[7] == ["reference temperature [°C]: 20.0"]
+    assert rows[10][2] == "current [A]"
+    assert len(rows) == 11 + 3
+    assert rows[11] == ["0.000", "-6.000000E+02", "6.000000E-08", "1.000000E-06", "21.60", "20.00", "30.00", "ON", "1", "OFF", "6.500000E-08", "2.5"]
+
+
+def test_export_compressed(tmp_path):
+    filename = os.path.join(tmp_path, "it-2024-01-01T00-00-00.txt")
+    archive = ArchiveWriter(filename, "gzip")
+    write_run(filename, archive)
+    filenames = export_sensor_files(archive.filenames()[0])
+    assert [os.path.basename(name) for name in filenames] == [
+        "it-Spam-2024-01-01T00-00-00.txt",
+        "it-Eggs-2024-01-01T00-00-00.txt",
+    ]
+    with open(filenames[0], newline="") as fp:
+        assert len(list(csv.reader(fp))) == 11 + 3
+
+
+def test_resumed_run(tmp_path):
+    filename = str(tmp_path / "it-2024-01-01T00-00-00.txt")
+    write_run(filename)
+    with open(filename, "a", newline="") as fp:
+        writer = RunWriter(fp, create_sensors())
+        writer.write_gap(3600.0)
+    with open(filename, newline="") as fp:
+        rows = list(RunReader(fp))
+    assert len(rows) == 4
+    assert rows[-1]["timestamp [s]"] == "3600.000"
+    assert rows[-1]["current_1 [A]"] == "NAN"
+    filenames = export_sensor_files(filename)
+    assert len(filenames) == 2
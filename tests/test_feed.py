@@ -0,0 +1,68 @@
+import socket
+
+import pytest
+
+from longterm_it import feed as feed_module
+from longterm_it.feed import Feed, FrameHeader, decode_frame, encode_frame, parse_address
+
+
+def read_frame(connection):
+    def read_exactly(size):
+        data = b""
+        while len(data) < size:
+            chunk = connection.recv(size - len(data))
+            assert chunk
+            data += chunk
+        return data
+    size, = FrameHeader.unpack(read_exactly(FrameHeader.size))
+    return decode_frame(read_exactly(size))
+
+
+def test_parse_address():
+    assert parse_address("localhost:10010") == (socket.AF_INET, ("localhost", 10010))
+    assert parse_address(":10010") == (socket.AF_INET, ("localhost", 10010))
+
+
+def test_encode_frame():
+    frame = encode_frame({"topic": "it", "data": {"I": 1.0}})
+    size, = FrameHeader.unpack(frame[:FrameHeader.size])
+    assert size == len(frame) - FrameHeader.size
+    assert decode_frame(frame[FrameHeader.size:]) == {"topic": "it", "data": {"I": 1.0}}
+
+
+def test_encode_frame_nan():
+    frame = encode_frame({"topic": "it", "data": {"I": float("nan"), "channels": {1: {"temp": float("nan")}}}})
+    assert b"NaN" not in frame
+    assert decode_frame(frame[FrameHeader.size:]) == {"topic": "it", "data": {"I": None, "channels": {"1": {"temp": None}}}}
+
+
+def test_encode_frame_msgpack():
+    pytest.importorskip("msgpack")
+    message = {"topic": "it", "data": {"channels": {1: {"I": 1e-9}}}}
+    frame = encode_frame(message, "msgpack")
+    assert decode_frame(frame[FrameHeader.size:], "msgpack") == message
+
+
+def test_feed():
+    feed = Feed("localhost:0", replay=2)
+    feed.start()
+    try:
+        feed.publish("state", {"state": "longterm"})
+        for value in range(3):
+            feed.publish("it", {"I": value})
+        with socket.create_connection(feed.bound_address(), timeout=5) as connection:
+            assert read_frame(connection)["data"] == {"state": "longterm"}
+            assert read_frame(connection)["data"] == {"I": 1}
+            assert read_frame(connection)["data"] == {"I": 2}
+            feed.publish("it", {"I": 3})
+            message = read_frame(connection)
+            assert message["topic"] == "it"
+            assert message["data"] == {"I": 3}
+    finally:
+        feed.stop()
+
+
+def test_msgpack_missing(monkeypatch):
+    monkeypatch.setattr(feed_module, "msgpack", None)
+    with pytest.raises(RuntimeError):
+        Feed("localhost:0", format="msgpack")
@@ -0,0 +1,42 @@
+import os
+
+from longterm_it.journal import Journal, find_resumable, truncate_partial_line
+
+
+def test_journal(tmp_path):
+    journal = Journal(str(tmp_path))
+    journal.update(stage="setup", biasVoltage=-600.0)
+    assert not journal.is_resumable()
+    journal.update(stage="longterm", updated=1e9)
+    loaded = Journal.load(str(tmp_path))
+    assert loaded.state["biasVoltage"] == -600.0
+    assert loaded.state["version"]
+    assert loaded.is_resumable()
+    assert not os.path.exists(journal.filename + ".tmp")
+
+
+def test_find_resumable(tmp_path):
+    for name, stage, updated in (
+        ("2024-01-01T00-00-00", "longterm", 1e9),
+        ("2024-01-02T00-00-00", "longterm", 2e9),
+        ("2024-01-03T00-00-00", "stopped", 3e9),
+        ("2024-01-04T00-00-00", "failed", 4e9),  # ramp down failed
+    ):
+        os.makedirs(tmp_path / name)
+        Journal(str(tmp_path / name)).update(stage=stage, updated=updated)
+    os.makedirs(tmp_path / "empty")
+    journal = find_resumable(str(tmp_path))
+    assert journal is not None
+    assert os.path.basename(journal.path) == "2024-01-02T00-00-00"
+    assert find_resumable(str(tmp_path / "empty")) is None
+    assert find_resumable(str(tmp_path / "missing")) is None
+
+
+def test_truncate_partial_line(tmp_path):
+    filename = str(tmp_path / "it.txt")
+    with open(filename, "wb") as fp:
+        fp.write(b"a,b\r\n1,2\r\n3,")
+    assert truncate_partial_line(filename) == 2
+    with open(filename, "rb") as fp:
+        assert fp.read() == b"a,b\r\n1,2\r\n"
+    assert truncate_partial_line(filename) == 0
@@ -0,0 +1,36 @@
+import json
+import os
+
+from longterm_it.memprofile import MemoryProfiler, module_name
+
+
+def test_module_name():
+    import longterm_it.utils
+    assert module_name(longterm_it.utils.__file__) == "longterm_it.utils"
+    assert module_name(os.path.join(os.path.dirname(longterm_it.utils.__file__), "__init__.py")) == "longterm_it"
+
+
+def test_memory_profiler(tmp_path):
+    filename = os.path.join(tmp_path, "memory.jsonl")
+    profiler = MemoryProfiler(top=5)
+    leak = []
+    profiler.add_counter("leak", lambda: len(leak))
+    profiler.start(filename)
+    try:
+        leak.extend({"index": index, "I": 1e-9 * index} for index in range(10000))
+        sample = profiler.sample()
+    finally:
+        profiler.stop()
+    assert not profiler.is_active()
+    assert profiler.sample() is None
+    assert sample is not None
+    assert sample["counters"] == {"leak": 10000}
+    assert sample["growth"]
+    module, size, count = sample["growth"][0]
+    assert module.endswith("test_memprofile")
+    assert size > 0 and count > 0
+    with open(filename) as fp:
+        lines = [json.loads(line) for line in fp]
+    assert len(lines) == 2
+    assert lines[0]["growth"] == []
+    assert lines[1]["counters"] == {"leak": 10000}
@@ -0,0 +1,47 @@
+import urllib.request
+
+from longterm_it.metrics import MetricsServer, Registry, format_labels
+
+
+def test_format_labels():
+    assert format_labels({}) == ""
+    assert format_labels({"resource": "smu", "operation": "query"}) == '{operation="query",resource="smu"}'
+    assert format_labels({"name": 'a"b'}) == '{name="a\\"b"}'
+
+
+def test_registry():
+    registry = Registry()
+    counter = registry.counter("spam_total", "Spam counter.")
+    counter.inc()
+    counter.inc(2)
+    assert registry.counter("spam_total") is counter
+    gauge = registry.gauge("eggs", "Eggs gauge.", {"pan": "1"})
+    gauge.set(4.2)
+    histogram = registry.histogram("ham_seconds", "Ham histogram.", buckets=(1.0, 2.0))
+    histogram.observe(0.5)
+    histogram.observe(1.0)
+    histogram.observe(3.0)
+    assert histogram.count() == 3
+    assert histogram.sum() == 4.5
+    text = registry.expose()
+    assert "# TYPE spam_total counter" in text
+    assert "spam_total 3.0" in text
+    assert 'eggs{pan="1"} 4.2' in text
+    assert 'ham_seconds_bucket{le="1.0"} 2' in text
+    assert 'ham_seconds_bucket{le="2.0"} 2' in text
+    assert 'ham_seconds_bucket{le="+Inf"} 3' in text
+    assert "ham_seconds_count 3" in text
+
+
+def test_metrics_server():
+    registry = Registry()
+    registry.counter("spam_total", "Spam counter.").inc()
+    server = MetricsServer(0, registry=registry)
+    server.start()
+    try:
+        host, port = server.server_address()[:2]
+        with urllib.request.urlopen(f"http://{host}:{port}/metrics", timeout=5) as response:
+            assert response.status == 200
+            assert "spam_total 1.0" in response.read().decode()
+    finally:
+        server.stop()
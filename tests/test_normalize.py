@@ -0,0 +1,63 @@
+import csv
+import math
+
+from longterm_it.normalize import ZeroCelsius, normalize_channels, normalize_current, normalize_file, normalized_filename
+from longterm_it.sensor import Sensor
+from longterm_it.writers import ItWriter
+
+
+def test_normalize_current():
+    assert normalize_current(1e-9, 20.0) == 1e-9
+    # Leakage current roughly doubles every 8 K
+    assert math.isclose(normalize_current(2e-9, 28.0), 1e-9, rel_tol=0.05)
+    assert normalize_current(1e-9, -20.0, band_gap=1.12) > 1e-9
+    assert math.isnan(normalize_current(1e-9, math.nan))
+    assert math.isnan(normalize_current(1e-9, -ZeroCelsius))
+    values = normalize_current([1e-9, 1e-9], [20.0, 30.0], reference=30.0)
+    assert values[0] > values[1] == 1e-9
+
+
+def test_normalize_channels():
+    channels = {1: {"I": 1e-9, "temp": 20.0}, 2: {"I": 1e-9}}
+    normalize_channels(channels, reference=20.0)
+    assert channels[1]["I_norm"] == 1e-9
+    assert math.isnan(channels[2]["I_norm"])
+
+
+def test_normalized_filename():
+    assert normalized_filename("it-Spam.txt") == "it-Spam-norm.txt"
+    assert normalized_filename("it-2024.txt.zst") == "it-2024-norm.txt"
+
+
+def test_normalize_file(tmp_path):
+    filename = str(tmp_path / "it-Spam.txt")
+    with open(filename, "w", newline="") as fp:
+        writer = ItWriter(fp)
+        writer.write_meta(Sensor(1), "Monty", "2024-01-01T00-00-00", -600.0)
+        writer.write_header()
+        for index in range(25):
+            writer.write_row(
+                timestamp=index * 60.0,
+                voltage=-600.0,
+                current=1e-9,
+                smu_current=1e-6,
+                pt100=20.0 + index,
+                cts_temperature=20.0,
+                cts_humidity=30.0,
+                cts_status="ON",
+                cts_program=1,
+                hv_status=True,
+            )
+    output = normalize_file(filename, reference=25.0, band_gap=1.12, block_size=10)
+    with open(output, newline="") as fp:
+        rows = list(csv.reader(fp))
+    assert ["reference temperature [°C]: 25.0"] in rows[:11]
+    assert ["band gap [eV]: 1.12"] in rows[:11]
+    assert ["reference temperature [°C]: 20.0"] not in rows[:11]
+    header = rows[10]
+    assert header.count("current_norm [A]") == 1
+    assert header[-1] == "current_norm [A]"
+    data = rows[11:]
+    assert len(data) == 25
+    assert float(data[5][-1]) == 1e-9
+    assert float(data[0][-1]) > 1e-9 > float(data[6][-1])
@@ -0,0 +1,142 @@
+import math
+
+import numpy as np
+
+from longterm_it.clock import VirtualClock
+from longterm_it.ramp import AdaptiveRamp, linear_points, parse_smu_readings, sweep_chunks, wait_settled
+from longterm_it.simulators import SimulatedSetup, create_resources
+
+
+def run(ramp, current):
+    voltages = []
+    for voltage in ramp:
+        voltages.append(voltage)
+        ramp.update({1: current(voltage)}, compliance=1e-5)
+    return voltages
+
+
+def test_fixed_grid():
+    ramp = AdaptiveRamp(0, -100, 5, delay=1.0, max_step=5)
+    voltages = run(ramp, lambda u: 1e-7 * math.sqrt(abs(u) / 100))
+    assert voltages == list(np.arange(0, -101, -5.0))
+    assert ramp.fixed_steps() == ramp.steps == 21
+
+
+def test_smooth_curve():
+    ramp = AdaptiveRamp(0, -800, 5, delay=1.0, max_step=50, max_slew_rate=0)
+    voltages = run(ramp, lambda u: -1e-7 * math.sqrt(abs(u) / 100))
+    assert voltages[0] == 0
+    assert voltages[-1] == -800
+    assert max(np.abs(np.diff(voltages))) == 50
+    assert min(np.abs(np.diff(voltages))) >= 5
+    assert ramp.steps < ramp.fixed_steps() / 3
+    report = ramp.report(elapsed=ramp.total_delay)
+    assert report["saved"] == (ramp.fixed_steps() - ramp.steps) * 1.0
+
+
+def test_rapid_change():
+    # Steep rise above 400 V narrows the step back to base step
+    current = lambda u: 1e-7 * math.sqrt(u / 100) * math.exp(max(u - 400, 0) / 10)
+    ramp = AdaptiveRamp(0, 500, 5, delay=1.0, max_step=50)
+    voltages = run(ramp, current)
+    steps = np.diff(voltages)
+    assert max(steps) > 5
+    assert all(steps[np.array(voltages[1:]) > 430] <= 5)
+
+
+def test_near_compliance():
+    ramp = AdaptiveRamp(0, 200, 5, delay=1.0, max_step=50)
+    voltages = run(ramp, lambda u: 1e-5 * u / 200)
+    steps = np.diff(voltages)
+    assert all(steps[np.array(voltages[:-1]) > 100] <= 5)
+
+
+def test_slew_rate():
+    ramp = AdaptiveRamp(0, 400, 5, delay=1.0, max_step=50, max_slew_rate=10)
+    for voltage in ramp:
+        ramp.update({1: 1e-7 * voltage}, compliance=1e-3)
+    assert ramp.delay >= 1.0
+    assert ramp.total_delay >= 400 / 10
+
+
+def test_wait_settled():
+    clock = VirtualClock(start=0)
+    # Current decaying with time constant of 0.5 s
+    read = lambda: 1e-7 * (1 + 10 * math.exp(-clock.monotonic() / 0.5))
+    elapsed, settled = wait_settled(read, clock, timeout=10.0)
+    assert settled
+    assert 2.0 < elapsed < 4.0
+
+
+def test_wait_settled_timeout():
+    clock = VirtualClock(start=0)
+    read = lambda: 1e-7 * (1 + clock.monotonic())
+    assert wait_settled(read, clock, timeout=2.0) == (2.0, False)
+
+
+def test_wait_settled_minimum():
+    clock = VirtualClock(start=0)
+    elapsed, settled = wait_settled(lambda: 1e-7, clock, timeout=5.0, minimum=1.0)
+    assert settled
+    assert 1.0 <= elapsed < 1.2
+
+
+def test_linear_points():
+    assert linear_points(1000, 0, 5)[:2] == [995.0, 990.0]
+    assert len(linear_points(1000, 0, 5)) == 200
+    assert linear_points(-7, 0, 5) == [-2.0, 0.0]
+    assert linear_points(0, 0, 5) == []
+
+
+def test_sweep_chunks():
+    assert sweep_chunks(0, -12, 5) == [[-5.0, -10.0, -12.0]]
+    assert sweep_chunks(10, 10, 5) == []
+    chunks = sweep_chunks(800, 0, 5, size=100)
+    assert [len(chunk) for chunk in chunks] == [100, 60]
+    assert chunks[0][0] == 795.0
+    assert chunks[-1][-1] == 0.0
+
+
+def test_simulated_sweep():
+    setup = SimulatedSetup(seed=42)
+    setup.relays[1] = True
+    smu = create_resources(setup)["smu"]
+    smu.write(":OUTP:STAT ON")
+    smu.write(":SOUR:VOLT:LEV 2.000000E+02")
+    smu.write(":SOUR:VOLT:MODE LIST")
+    chunk = sweep_chunks(200, 0, 50)[0]
+    smu.write(f":SOUR:LIST:VOLT {','.join(format(value, 'E') for value in chunk)}")
+    assert float(smu.query(":READ?").split(",")[0]) == 200.0  # bias level only
+    smu.write(f":TRIG:COUN {len(chunk)}")
+    smu.write("*CLS")
+    smu.write(":INIT")
+    smu.write("*OPC")
+    assert smu.query("*ESR?") == "1"
+    readings = parse_smu_readings(smu.query(":FETC?"))
+    assert [voltage for voltage, _ in readings] == [150.0, 100.0, 50.0, 0.0]
+    assert readings[0][1] > readings[1][1] > 0
+    assert float(smu.query(":READ?").split(",")[0]) == 200.0  # back at bias level
+    smu.write(f":SOUR:VOLT:LEV {chunk[-1]:E}")
+    smu.write(":SOUR:VOLT:MODE FIX")
+    assert float(smu.query(":READ?").split(",")[0]) == 0.0
+
+
+def test_simulated_sweep_bias():
+    """Output must never run ahead of the points already swept."""
+    setup = SimulatedSetup(seed=42)
+    smu = create_resources(setup)["smu"]
+    simulator = setup.smu
+    smu.write(":SOUR:VOLT:LEV 5.000000E+02")
+    smu.write(":OUTP:STAT ON")
+    smu.write(":SOUR:VOLT:MODE LIST")
+    for chunk in sweep_chunks(500, 0, 5, size=20):
+        smu.write(f":SOUR:LIST:VOLT {','.join(format(value, 'E') for value in chunk)}")
+        smu.write(f":TRIG:COUN {len(chunk)}")
+        smu.write(":INIT")
+        smu.write(f":SOUR:VOLT:LEV {chunk[-1]:E}")
+    smu.write(":SOUR:VOLT:MODE FIX")
+    reached = 500.0
+    for voltage in simulator.trace:
+        assert voltage >= reached - 5.0
+        reached = min(reached, voltage)
+    assert simulator.voltage == 0.0
@@ -0,0 +1,57 @@
+import random
+import socket
+
+import pytest
+
+from longterm_it.reconnect import CircuitState, ReconnectPolicy, parse_tcp_address, probe_tcp
+
+
+def test_backoff():
+    policy = ReconnectPolicy(initial_delay=1.0, max_delay=10.0, jitter=0.0, threshold=3)
+    delays = [policy.failure() for _ in range(6)]
+    assert delays == [1.0, 2.0, 4.0, 8.0, 10.0, 10.0]
+
+
+def test_jitter():
+    policy = ReconnectPolicy(initial_delay=1.0, jitter=0.2, rng=random.Random(42))
+    delays = []
+    for _ in range(100):
+        delays.append(policy.failure())
+        policy.success()
+    assert all(0.8 <= delay <= 1.2 for delay in delays)
+    assert len(set(delays)) > 1
+
+
+def test_circuit():
+    policy = ReconnectPolicy(threshold=3)
+    reported = []
+    for _ in range(5):
+        policy.attempt()
+        policy.failure()
+        reported.append(policy.report())
+    assert reported == [True, False, True, False, False]
+    assert policy.state == CircuitState.OPEN
+    assert policy.suppressed == 3
+    policy.attempt()
+    assert policy.state == CircuitState.HALF_OPEN
+    policy.success()
+    assert policy.state == CircuitState.CLOSED
+    assert policy.failures == policy.suppressed == 0
+    assert policy.delay() == 0.0
+
+
+def test_parse_tcp_address():
+    assert parse_tcp_address("TCPIP::localhost::1080::SOCKET") == ("localhost", 1080)
+    assert parse_tcp_address("TCPIP0::192.168.0.2::5025::SOCKET") == ("192.168.0.2", 5025)
+    assert parse_tcp_address("GPIB::16::INSTR") is None
+
+
+def test_probe_tcp():
+    with socket.socket() as server:
+        server.bind(("127.0.0.1", 0))
+        server.listen()
+        port = server.getsockname()[1]
+        probe_tcp(f"TCPIP::127.0.0.1::{port}::SOCKET", timeout=1.0)
+    with pytest.raises(ConnectionError):
+        probe_tcp(f"TCPIP::127.0.0.1::{port}::SOCKET", timeout=1.0)
+    probe_tcp("SIM::ITC", timeout=1.0)  # not probed
@@ -0,0 +1,97 @@
+import re
+
+import pytest
+
+from longterm_it.relays import RelaysMixin
+
+
+class RecordingResource:
+    """Fake ShuntBox resource recording all commands, relays listed in
+    `stuck` ignore switch commands but answer OK."""
+
+    def __init__(self, stuck=()) -> None:
+        self.relays: dict[int, bool] = {index: False for index in range(1, RelaysMixin.CHANNELS + 1)}
+        self.stuck: set[int] = set(stuck)
+        self.commands: list[str] = []
+
+    def query(self, message: str) -> str:
+        self.commands.append(message)
+        if message == "GET:REL ALL":
+            return ",".join(format(int(self.relays[index])) for index in sorted(self.relays)) + ","
+        m = re.match(r"SET:REL_(ON|OFF) (\d+|ALL)$", message)
+        if m:
+            indices = list(self.relays) if m.group(2) == "ALL" else [int(m.group(2))]
+            for index in indices:
+                if index not in self.stuck:
+                    self.relays[index] = m.group(1) == "ON"
+            return "OK"
+        return "ERR"
+
+
+class Relays(RelaysMixin):
+
+    def __init__(self, resource) -> None:
+        self.resource = resource
+
+
+def enabled_relays(resource):
+    return [index for index, value in resource.relays.items() if value]
+
+
+def test_set_relays_all():
+    resource = RecordingResource()
+    Relays(resource).set_relays(range(1, RelaysMixin.CHANNELS + 1), True)
+    assert resource.commands == ["SET:REL_ON ALL", "GET:REL ALL"]
+    assert all(resource.relays.values())
+
+
+def test_set_relays():
+    resource = RecordingResource()
+    relays = Relays(resource)
+    relays.set_relays([3, 1, 3], True)
+    assert resource.commands == ["SET:REL_ON 1", "SET:REL_ON 3", "GET:REL ALL"]
+    assert enabled_relays(resource) == [1, 3]
+    relays.set_relays([], False)
+    assert len(resource.commands) == 3
+    with pytest.raises(ValueError):
+        relays.set_relays([0, 1], True)
+
+
+def test_set_relays_verify():
+    resource = RecordingResource(stuck=[4])
+    resource.relays[4] = True
+    with pytest.raises(RuntimeError, match="failed to switch relays: 4"):
+        Relays(resource).set_relays([2, 4], False)
+    assert resource.commands == ["SET:REL_OFF 2", "SET:REL_OFF 4", "GET:REL ALL", "SET:REL_OFF 4", "GET:REL ALL"]
+
+
+def test_update_relays():
+    resource = RecordingResource()
+    resource.relays.update({1: True, 2: True, 5: True})
+    changes = Relays(resource).update_relays({1: True, 2: False, 3: True, 4: True, 5: False})
+    assert changes == {2: False, 3: True, 4: True, 5: False}
+    assert resource.commands == [
+        "GET:REL ALL",
+        "SET:REL_OFF 2",
+        "SET:REL_ON 3",
+        "SET:REL_ON 4",
+        "SET:REL_OFF 5",
+        "GET:REL ALL",
+    ]
+    assert enabled_relays(resource) == [1, 3, 4]
+
+
+def test_update_relays_all():
+    resource = RecordingResource()
+    resource.relays.update({1: True, 2: True})
+    changes = Relays(resource).update_relays({1: False, 2: False})
+    assert changes == {1: False, 2: False}
+    assert resource.commands == ["GET:REL ALL", "SET:REL_OFF ALL", "GET:REL ALL"]
+    assert enabled_relays(resource) == []
+
+
+def test_update_relays_unchanged():
+    resource = RecordingResource()
+    resource.relays[1] = True
+    assert Relays(resource).update_relays({1: True, 2: False}) == {}
+    assert resource.commands == ["GET:REL ALL"]
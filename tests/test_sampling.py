@@ -0,0 +1,52 @@
+import math
+
+from longterm_it.sampling import AdaptiveInterval
+
+Environ = {"temperature": 20.0, "humidity": 30.0, "status": "Running", "program": 1}
+
+
+def channels(current=1e-7, temp=20.0, hv=True):
+    return {1: {"I": current, "temp": temp, "hv": hv}, 2: {"I": 2e-7, "temp": 20.0, "hv": True}}
+
+
+def test_stretch():
+    policy = AdaptiveInterval(10, max_interval=100)
+    assert policy.update(channels(), Environ) == 10
+    assert policy.reason == "first scan"
+    assert policy.update(channels(), Environ) == 20
+    assert policy.update(channels(current=1.005e-7), Environ) == 40
+    assert policy.update(channels(), Environ) == 80
+    assert policy.update(channels(), Environ) == 100
+    assert policy.reason is None
+
+
+def test_channel_changes():
+    policy = AdaptiveInterval(10, max_interval=100)
+    policy.update(channels(), Environ)
+    assert policy.update(channels(), Environ) == 20
+    assert policy.update(channels(current=1.1e-7), Environ) == 10
+    assert policy.reason == "channel 1 current changed"
+    policy.update(channels(current=1.1e-7), Environ)
+    assert policy.update(channels(current=1.1e-7, temp=21.0), Environ) == 10
+    assert policy.reason == "channel 1 temperature changed"
+    policy.update(channels(current=1.1e-7, temp=21.0), Environ)
+    assert policy.update(channels(current=0.0, temp=21.0, hv=False), Environ) == 10
+    assert policy.reason == "channel 1 HV changed"
+
+
+def test_environ_changes():
+    policy = AdaptiveInterval(10, max_interval=100)
+    policy.update(channels(), Environ)
+    assert policy.environ_changed(Environ) is None
+    assert policy.environ_changed({**Environ, "status": "Stopped"}) == "CTS status changed"
+    assert policy.environ_changed({**Environ, "program": 2}) == "CTS program changed"
+    assert policy.environ_changed({**Environ, "temperature": 20.2}) is None
+    assert policy.environ_changed({**Environ, "temperature": 25.0}) == "CTS temperature changed"
+    assert policy.update(channels(), {**Environ, "program": 2}) == 10
+
+
+def test_nan_values():
+    policy = AdaptiveInterval(10, max_interval=100)
+    environ = {**Environ, "temperature": math.nan}
+    policy.update(channels(temp=math.nan), environ)
+    assert policy.update(channels(temp=math.nan), environ) == 20
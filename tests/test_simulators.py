@@ -0,0 +1,77 @@
+from longterm_it.simulators import LatencyModel, SimulatedSetup, create_resources, parse_channel_list
+
+
+def test_latency_model():
+    assert LatencyModel.zero().sample() == 0
+    assert LatencyModel.fixed(0.1).sample() == 0.1
+    a = LatencyModel.realistic(0.005, seed=42)
+    b = LatencyModel.realistic(0.005, seed=42)
+    samples = [a.sample() for _ in range(100)]
+    assert samples == [b.sample() for _ in range(100)]
+    assert all(value > 0 for value in samples)
+
+
+def test_simulated_scan():
+    resources = create_resources(SimulatedSetup(seed=42))
+    with resources["smu"] as smu, resources["multi"] as multi, resources["shunt"] as shunt:
+        assert shunt.query("SET:REL_ON 1") == "OK"
+        assert shunt.query("SET:REL_ON 2") == "OK"
+        assert shunt.query("GET:REL ALL") == "1,1,0,0,0,0,0,0,0,0"
+        assert len(shunt.query("GET:TEMP ALL").split(",")) == 11  # trailing comma
+        smu.write(":OUTP:STAT ON")
+        smu.write(":SOUR:VOLT:LEV 1.000000E+02")
+        assert float(smu.query(":SOUR:VOLT:LEV?")) == 100.0
+        assert smu.query(":SENS:CURR:PROT:TRIP?") == "0"
+        voltage, current = [float(value) for value in smu.query(":READ?").split(",")[:2]]
+        assert voltage == 100.0
+        assert 90e-9 < current < 110e-9
+        multi.write(":SENS:VOLT:AVER:COUN 10")
+        assert multi.query(":SENS:VOLT:AVER:COUN?") == "10"
+        multi.write("ROUTE:SCAN (@101,102)")
+        multi.write("*CLS")
+        multi.write("*OPC")
+        multi.write(":INIT")
+        assert multi.query("*ESR?") == "1"
+        readings = multi.query(":FETC?").split("#,")
+        assert len(readings) == 2
+        assert readings[0].endswith("VDC,+0.000SECS,+0.0000RDNG")
+
+
+def test_parse_channel_list():
+    assert parse_channel_list("(@101:103,110)") == [101, 102, 103, 110]
+    assert parse_channel_list("(@101:110)") == list(range(101, 111))
+    assert parse_channel_list("(@)") == []
+
+
+def test_simulated_itc():
+    resources = create_resources(SimulatedSetup(seed=42))
+    with resources["cts"] as cts:
+        cts.write("O")
+        assert len(cts.read_bytes(14)) == 14
+        cts.write("A1")
+        assert cts.read_bytes(14).decode().startswith("A1 0")
+        assert cts.query("P") == "P000"
+
+
+def test_simulated_reproducible():
+    def currents(seed):
+        resources = create_resources(SimulatedSetup(seed=seed))
+        with resources["smu"] as smu, resources["shunt"] as shunt:
+            shunt.query("SET:REL_ON ALL")
+            smu.write(":OUTP ON")
+            smu.write(":SOUR:VOLT:LEV -600")
+            return [smu.query(":READ?") for _ in range(10)]
+    assert currents(1) == currents(1)
+    assert currents(1) != currents(2)
+
+
+def test_simulated_relays():
+    setup = SimulatedSetup(seed=42)
+    with create_resources(setup)["shunt"] as shunt:
+        assert shunt.query("SET:REL_ON 1") == "OK"
+        assert shunt.query("SET:REL_ON 10") == "OK"
+        assert shunt.query("GET:REL ALL") == "1,0,0,0,0,0,0,0,0,1"
+        assert shunt.query("SET:REL_ON 2,3") == "ERR"  # no list commands
+        assert setup.relays[2] is False
+        assert shunt.query("SET:REL_OFF ALL") == "OK"
+        assert shunt.query("GET:REL ALL") == "0,0,0,0,0,0,0,0,0,0"
@@ -0,0 +1,80 @@
+import io
+import json
+import math
+import random
+import statistics as stats
+
+import numpy as np
+
+from longterm_it.sensor import Sensor
+from longterm_it.statistics import EWMA, RunStatistics, Welford, WindowStatistics
+
+
+def test_welford():
+    rng = random.Random(0)
+    values = [rng.gauss(1e-9, 1e-11) + t * 1e-15 for t in range(1000)]
+    welford = Welford()
+    for t, value in enumerate(values):
+        welford.add(value, float(t))
+    welford.add(math.nan, 1000.0)
+    assert welford.count == 1000
+    assert math.isclose(welford.mean, stats.mean(values), rel_tol=1e-9)
+    assert math.isclose(welford.std, stats.stdev(values), rel_tol=1e-6)
+    assert welford.minimum == min(values)
+    assert welford.maximum == max(values)
+    slope = np.polyfit(np.arange(1000.0), np.array(values), 1)[0]
+    assert math.isclose(welford.drift, slope, rel_tol=1e-6)
+
+
+def test_welford_empty():
+    welford = Welford()
+    assert math.isnan(welford.mean)
+    assert math.isnan(welford.std)
+    assert math.isnan(welford.drift)
+    welford.add(4.0, 0.0)
+    assert welford.mean == 4.0
+    assert math.isnan(welford.std)
+
+
+def test_ewma():
+    ewma = EWMA(halflife=1)
+    ewma.add(0.0)
+    ewma.add(2.0)
+    assert ewma.value == 1.0
+    ewma.add(math.nan)
+    assert ewma.value == 1.0
+
+
+def test_window_statistics():
+    window = WindowStatistics(3600)
+    for t in range(0, 3 * 3600, 60):
+        window.add(float(t // 3600), float(t))
+    assert len(window.completed) == 2
+    windows = window.windows()
+    assert [item["start"] for item in windows] == [0, 3600, 7200]
+    assert [item["mean"] for item in windows] == [0.0, 1.0, 2.0]
+    assert windows[0]["count"] == 60
+
+
+def test_run_statistics():
+    sensors = [Sensor(1), Sensor(2)]
+    sensors[0].name = "Spam"
+    statistics = RunStatistics(sensors)
+    for t in range(0, 2 * 86400, 600):
+        statistics.add(float(t), {
+            1: {"I": 1e-9, "temp": 20.0},
+            2: {"I": math.nan, "temp": math.nan},
+        })
+    summary = statistics.summary(1)
+    assert summary["current"]["mean"] == 1e-9
+    assert summary["temperature"]["day_mean"] == 20.0
+    assert summary["current"]["count"] == 288
+    assert statistics.summary(2)["current"]["count"] == 0
+    fp = io.StringIO()
+    statistics.write_summary(fp, operator="Monty")
+    report = json.loads(fp.getvalue())
+    assert report["operator"] == "Monty"
+    assert report["sensors"][0]["name"] == "Spam"
+    assert len(report["sensors"][0]["current"]["windows"]["hour"]) == 48
+    assert len(report["sensors"][0]["current"]["windows"]["day"]) == 2
+    assert report["sensors"][1]["current"]["mean"] is None
@@ -0,0 +1,86 @@
+import os
+
+from longterm_it.sensor import Sensor
+from longterm_it.timeindex import IndexedReader, TimeIndexWriter, build_index, read_index
+from longterm_it.writers import ItWriter, RunWriter
+
+
+def write_run(filename, count, every=None):
+    sensor = Sensor(1)
+    sensor.name = "Spam"
+    with open(filename, "w", newline="") as fp:
+        writer = RunWriter(fp, [sensor])
+        if every:
+            writer.index = TimeIndexWriter(filename, every)
+        writer.write_meta("Monty", "2024-01-01T00-00-00", -600.0)
+        writer.write_header()
+        for index in range(count):
+            writer.write_row(
+                timestamp=index * 60.0,
+                voltage=-600.0,
+                smu_current=1e-6,
+                cts_temperature=20.0,
+                cts_humidity=30.0,
+                cts_status="ON",
+                cts_program=1,
+                channels={1: {"I": index * 1e-9, "U": 0.0, "temp": 21.5, "hv": True}},
+            )
+        if writer.index:
+            writer.index.close()
+
+
+def timestamps(reader, start=None, end=None):
+    return [float(row["timestamp [s]"]) for row in reader.rows(start, end)]
+
+
+def test_indexed_reader(tmp_path):
+    filename = str(tmp_path / "it.txt")
+    write_run(filename, 1000, every=100)
+    entries = read_index(filename)
+    assert len(entries) == 10
+    assert entries[1][0] == 6000.0
+    with IndexedReader(filename) as reader:
+        assert reader.header[0] == "timestamp [s]"
+        assert reader.seek(6100.0) == entries[1][1]
+        assert timestamps(reader, 6030.0, 6300.0) == [6060.0, 6120.0, 6180.0, 6240.0]
+        assert len(timestamps(reader)) == 1000
+        assert timestamps(reader, 59900.0) == [59940.0]
+        rows = list(reader.rows(60.0, 120.0))
+        assert rows[0]["current_1 [A]"] == format(1e-9, "E")
+
+
+def test_build_index(tmp_path):
+    filename = str(tmp_path / "it.txt")
+    write_run(filename, 250, every=50)
+    expected = read_index(filename)
+    os.remove(filename + ".index")
+    with IndexedReader(filename) as reader:
+        assert not reader.timestamps
+        assert len(timestamps(reader, 600.0, 1200.0)) == 10
+    assert build_index(filename, 50) == 5
+    assert read_index(filename) == expected
+
+
+def test_build_index_legacy(tmp_path):
+    filename = str(tmp_path / "it-Spam.txt")
+    with open(filename, "w", newline="") as fp:
+        writer = ItWriter(fp)
+        writer.write_meta(Sensor(1), "Monty", "2024-01-01T00-00-00", -600.0)
+        writer.write_header()
+        for index in range(30):
+            writer.write_row(
+                timestamp=index * 10.0,
+                voltage=-600.0,
+                current=1e-9,
+                smu_current=1e-6,
+                pt100=21.5,
+                cts_temperature=20.0,
+                cts_humidity=30.0,
+                cts_status="ON",
+                cts_program=1,
+                hv_status=True,
+            )
+    assert build_index(filename, 10) == 3
+    with IndexedReader(filename) as reader:
+        assert reader.header[2] == "current [A]"
+        assert timestamps(reader, 195.0, 230.0) == [200.0, 210.0, 220.0]
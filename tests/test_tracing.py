@@ -0,0 +1,68 @@
+import json
+
+from longterm_it.tracing import Tracer
+
+
+def test_tracer_disabled():
+    tracer = Tracer()
+    with tracer.span("spam"):
+        ...
+    assert tracer.events() == []
+
+
+def test_tracer(tmp_path):
+    tracer = Tracer()
+    tracer.enable()
+    with tracer.span("stage", "measure"):
+        with tracer.span("*OPC?", "scpi", resource="smu"):
+            ...
+    events = [event for event in tracer.events() if event["ph"] == "X"]
+    assert [event["name"] for event in events] == ["*OPC?", "stage"]
+    inner, outer = events
+    assert inner["args"] == {"resource": "smu"}
+    assert outer["ts"] <= inner["ts"]
+    assert inner["ts"] + inner["dur"] <= outer["ts"] + outer["dur"]
+    filename = tmp_path / "trace.json"
+    tracer.start(filename)
+    assert tracer.events()[1:] == []  # written
+    tracer.stop()
+    with open(filename) as fp:
+        data = json.load(fp)
+    assert len(data) == 3  # including thread name
+    tracer.clear()
+    assert tracer.events() == []
+
+
+def test_tracer_stream(tmp_path):
+    tracer = Tracer()
+    tracer.FlushEventCount = 10
+    tracer.enable()
+    filename = tmp_path / "trace.json"
+    tracer.start(filename)
+    for index in range(25):
+        with tracer.span(f"scan-{index}"):
+            ...
+    assert tracer.is_active()
+    # Trace of a crashed run misses the closing bracket
+    with open(filename) as fp:
+        data = json.loads(fp.read() + "]")
+    assert [event["name"] for event in data[1:]] == [f"scan-{index}" for index in range(20)]
+    tracer.stop()
+    assert not tracer.is_active()
+    with open(filename) as fp:
+        data = json.load(fp)
+    assert len(data) == 1 + 25
+
+
+class SmallTracer(Tracer):
+    MaximumEventCount = 5
+
+
+def test_tracer_ring_buffer():
+    tracer = SmallTracer()
+    tracer.enable()
+    for index in range(8):
+        with tracer.span(f"scan-{index}"):
+            ...
+    assert tracer.dropped == 3
+    assert [event["name"] for event in tracer.events()[1:]] == [f"scan-{index}" for index in range(3, 8)]
@@ -39,6 +39,12 @@ def test_writer():
     assert next(r) == ["datetime: 1970-05-02"]
     assert next(r) == ["calibration [Ohm]: 42"]
     assert next(r) == ["Voltage [V]: 600.0"]
+    assert next(r) == ["reference temperature [°C]: 20.0"]
+    assert next(r) == ["band gap [eV]: 1.21"]
     assert next(r) == []
-    assert next(r)[:3] == ["timestamp [s]", "voltage [V]", "current [A]"]
-    assert next(r)[:3] == ["1.000", "2.000000E+00", "3.000000E+00"]
+    header = next(r)
+    assert header[:3] == ["timestamp [s]", "voltage [V]", "current [A]"]
+    assert header[-2:] == ["current_norm [A]", "cts_age [s]"]
+    row = next(r)
+    assert row[:3] == ["1.000", "2.000000E+00", "3.000000E+00"]
+    assert row[-2:] == ["NAN", "nan"]